@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from .models import CustomUser
+from farms.fields import SparseFieldsetMixin
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -51,7 +52,7 @@ class UserLoginSerializer(serializers.Serializer):
         
         return attrs
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     is_superuser = serializers.BooleanField(read_only=True)
     
     class Meta:
@@ -6,6 +6,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from .models import CustomUser
 from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserSerializer
+from farms.fields import selected_fields, selected_keys
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -50,7 +51,13 @@ def get_farm_users(request):
             created_by=request.user
         )
     
-    serializer = UserSerializer(farm_users, many=True)
+    try:
+        selected = selected_fields(request, UserSerializer)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    farm_users = UserSerializer.restrict_queryset(farm_users, selected)
+    serializer = UserSerializer(farm_users, many=True, selected_fields=selected)
     return Response(serializer.data)
 
 @api_view(['GET', 'PUT'])
@@ -175,6 +182,11 @@ def reset_user_password(request, user_id):
     except CustomUser.DoesNotExist:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
 
+ALL_USERS_KEYS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'user_type', 'is_active', 'date_joined',
+    'last_login', 'created_by',
+)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_all_users(request):
@@ -182,8 +194,13 @@ def get_all_users(request):
     if not request.user.is_superuser:
         return Response({'error': 'Only superusers can view all users'}, status=status.HTTP_403_FORBIDDEN)
     
+    try:
+        keys = selected_keys(request, ALL_USERS_KEYS)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
     # Get all users except other superusers
-    users = CustomUser.objects.filter(is_superuser=False).order_by('-date_joined')
+    users = CustomUser.objects.filter(is_superuser=False).select_related('created_by').order_by('-date_joined')
     
     user_data = []
     for user in users:
@@ -199,10 +216,14 @@ def get_all_users(request):
             'last_login': user.last_login,
             'created_by': user.created_by.username if user.created_by else None,
         }
-        user_data.append(user_info)
+        user_data.append({key: user_info[key] for key in keys})
     
     return Response(user_data)
 
+AGRONOMIST_KEYS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'is_active', 'date_joined', 'last_login', 'created_by',
+)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_agronomists(request):
@@ -210,6 +231,11 @@ def get_agronomists(request):
     if not request.user.is_superuser:
         return Response({'error': 'Only superusers can view agronomist users'}, status=status.HTTP_403_FORBIDDEN)
     
+    try:
+        keys = selected_keys(request, AGRONOMIST_KEYS)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
     agronomists = CustomUser.objects.filter(user_type='agronomist', is_superuser=False).order_by('-date_joined')
     
     agronomist_data = []
@@ -225,7 +251,7 @@ def get_agronomists(request):
             'last_login': agronomist.last_login,
             'created_by': agronomist.created_by.username if agronomist.created_by else None,
         }
-        agronomist_data.append(agronomist_info)
+        agronomist_data.append({key: agronomist_info[key] for key in keys})
     
     return Response(agronomist_data)
 
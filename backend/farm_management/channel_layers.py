@@ -0,0 +1,287 @@
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteChannelLayer(BaseChannelLayer):
+    """
+    Channel layer shared by every process on the host through one SQLite
+    database in WAL mode, so group_send from a Celery worker or another
+    daphne process reaches sockets held elsewhere without Redis.
+
+    Messages are JSON encoded. Receivers poll their channel with an adaptive
+    backoff capped at `poll_interval`, which bounds the extra latency of a
+    message sent from another process and sets how often an idle receiver
+    queries; sends made from the same process wake local receivers
+    immediately.
+    """
+
+    extensions = ["groups", "flush"]
+
+    def __init__(
+        self,
+        path="channels.sqlite3",
+        expiry=60,
+        group_expiry=86400,
+        capacity=100,
+        channel_capacity=None,
+        poll_interval=0.1,
+        cleanup_interval=30,
+        **kwargs
+    ):
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity, **kwargs)
+        self.path = str(path)
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        self.cleanup_interval = cleanup_interval
+        self.channel_capacity = self.compile_capacities(self.channel_capacity)
+        # All SQLite access happens on one thread that owns the connection
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-channel-layer")
+        self._connection = None
+        self._last_cleanup = 0
+        # channel -> list of (loop, event) for receivers waiting in this process
+        self._waiters = {}
+        self._waiters_lock = threading.Lock()
+
+    # Storage helpers (run on the executor thread)
+
+    def _db(self):
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS channel_messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel TEXT NOT NULL,
+                    expires REAL NOT NULL,
+                    body TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS channel_messages_channel_idx ON channel_messages (channel, id);
+                CREATE INDEX IF NOT EXISTS channel_messages_expires_idx ON channel_messages (expires);
+                CREATE TABLE IF NOT EXISTS channel_groups (
+                    group_name TEXT NOT NULL,
+                    channel TEXT NOT NULL,
+                    joined REAL NOT NULL,
+                    PRIMARY KEY (group_name, channel)
+                );
+                CREATE INDEX IF NOT EXISTS channel_groups_channel_idx ON channel_groups (channel);
+                """
+            )
+            self._connection = connection
+        return self._connection
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _pending_counts(self, db, channels, now):
+        placeholders = ",".join("?" * len(channels))
+        rows = db.execute(
+            f"SELECT channel, COUNT(*) FROM channel_messages "
+            f"WHERE channel IN ({placeholders}) AND expires >= ? GROUP BY channel",
+            (*channels, now),
+        ).fetchall()
+        return dict(rows)
+
+    def _insert(self, channels, body, raise_when_full):
+        """Insert one message body for each channel that still has capacity."""
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            self._clean_expired(db, now)
+            counts = self._pending_counts(db, channels, now) if channels else {}
+            targets = []
+            for channel in channels:
+                if counts.get(channel, 0) >= self.get_capacity(channel):
+                    if raise_when_full:
+                        raise ChannelFull(channel)
+                    logger.debug(f"Channel {channel} is full, dropping message")
+                    continue
+                targets.append((channel, now + self.expiry, body))
+            db.executemany("INSERT INTO channel_messages (channel, expires, body) VALUES (?, ?, ?)", targets)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return [channel for channel, _, _ in targets]
+
+    def _pop(self, channel):
+        db = self._db()
+        now = time.time()
+        # Cheap read first; WAL readers do not block writers
+        row = db.execute(
+            "SELECT id FROM channel_messages WHERE channel = ? AND expires >= ? ORDER BY id LIMIT 1",
+            (channel, now),
+        ).fetchone()
+        if row is None:
+            return None
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT id, body FROM channel_messages WHERE channel = ? AND expires >= ? ORDER BY id LIMIT 1",
+                (channel, now),
+            ).fetchone()
+            if row is not None:
+                db.execute("DELETE FROM channel_messages WHERE id = ?", (row[0],))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return json.loads(row[1]) if row else None
+
+    def _group_channels(self, group):
+        db = self._db()
+        rows = db.execute(
+            "SELECT channel FROM channel_groups WHERE group_name = ? AND joined >= ?",
+            (group, time.time() - self.group_expiry),
+        ).fetchall()
+        return [channel for (channel,) in rows]
+
+    def _group_add(self, group, channel):
+        self._db().execute(
+            "INSERT OR REPLACE INTO channel_groups (group_name, channel, joined) VALUES (?, ?, ?)",
+            (group, channel, time.time()),
+        )
+
+    def _group_discard(self, group, channel):
+        self._db().execute(
+            "DELETE FROM channel_groups WHERE group_name = ? AND channel = ?", (group, channel)
+        )
+
+    def _clean_expired(self, db, now):
+        """
+        Remove expired messages and group memberships. A channel with an
+        expired message is considered gone and is removed from all groups,
+        matching the in-memory layer.
+        """
+        if now - self._last_cleanup < self.cleanup_interval:
+            return
+        self._last_cleanup = now
+        db.execute(
+            "DELETE FROM channel_groups WHERE joined < ? OR channel IN "
+            "(SELECT DISTINCT channel FROM channel_messages WHERE expires < ?)",
+            (now - self.group_expiry, now),
+        )
+        db.execute("DELETE FROM channel_messages WHERE expires < ?", (now,))
+
+    def _flush(self):
+        db = self._db()
+        db.execute("DELETE FROM channel_messages")
+        db.execute("DELETE FROM channel_groups")
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    # Local wakeups
+
+    def _wake(self, channels):
+        with self._waiters_lock:
+            waiters = [waiter for channel in channels for waiter in self._waiters.get(channel, ())]
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Receiver's loop already closed
+                pass
+
+    async def _wait(self, channel, timeout):
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        with self._waiters_lock:
+            self._waiters.setdefault(channel, []).append(waiter)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._waiters_lock:
+                waiters = self._waiters.get(channel, [])
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if not waiters:
+                    self._waiters.pop(channel, None)
+
+    # Channel layer API
+
+    async def send(self, channel, message):
+        """
+        Send a message onto a (general or specific) channel.
+        """
+        assert isinstance(message, dict), "message is not a dict"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+        assert "__asgi_channel__" not in message
+
+        delivered = await self._run(self._insert, [channel], json.dumps(message), True)
+        self._wake(delivered)
+
+    async def receive(self, channel):
+        """
+        Receive the first message that arrives on the channel.
+        """
+        assert self.valid_channel_name(channel)
+        delay = 0.001
+        while True:
+            message = await self._run(self._pop, channel)
+            if message is not None:
+                return message
+            await self._wait(channel, delay)
+            delay = min(delay * 2, self.poll_interval)
+
+    async def new_channel(self, prefix="specific."):
+        """
+        Returns a new channel name that can be used by something in our
+        process as a specific channel.
+        """
+        return "%s.sqlite!%s" % (
+            prefix,
+            "".join(random.choice(string.ascii_letters) for i in range(12)),
+        )
+
+    # Flush extension
+
+    async def flush(self):
+        await self._run(self._flush)
+
+    async def close(self):
+        await self._run(self._close)
+
+    # Groups extension
+
+    async def group_add(self, group, channel):
+        """
+        Adds the channel name to a group.
+        """
+        assert self.valid_group_name(group), "Group name not valid"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+        await self._run(self._group_add, group, channel)
+
+    async def group_discard(self, group, channel):
+        assert self.valid_channel_name(channel), "Invalid channel name"
+        assert self.valid_group_name(group), "Invalid group name"
+        await self._run(self._group_discard, group, channel)
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), "Message is not a dict"
+        assert self.valid_group_name(group), "Invalid group name"
+        channels = await self._run(self._group_channels, group)
+        if not channels:
+            return
+        # Full channels are skipped, like the in-memory layer
+        delivered = await self._run(self._insert, channels, json.dumps(message), False)
+        self._wake(delivered)
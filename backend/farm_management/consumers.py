@@ -1,22 +1,83 @@
+import asyncio
 import json
+import time
+import weakref
+from collections import Counter, deque
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from urllib.parse import parse_qs
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from datetime import datetime
 import logging
+from .wire_formats import negotiate_encoder
 
 logger = logging.getLogger(__name__)
 
+# Defaults for settings.WEBSOCKET_OUTBOUND
+OUTBOUND_DEFAULTS = {
+    'QUEUE_SIZE': 100,            # events buffered per connection
+    'BATCH_MAX_EVENTS': 20,       # flush once this many events are queued
+    'BATCH_INTERVAL_MS': 50,      # ...or after this long
+    'OVERFLOW_POLICY': 'drop_low_priority',  # or 'refresh'
+    'IDLE_TIMEOUT': 120,          # seconds without a client frame, 0 disables
+}
+
+IDLE_CLOSE_CODE = 4008
+
+# Process-wide counters, see outbound_metrics()
+OUTBOUND_METRICS = Counter()
+_open_consumers = weakref.WeakSet()
+
+
+def outbound_settings():
+    return {**OUTBOUND_DEFAULTS, **getattr(settings, 'WEBSOCKET_OUTBOUND', {})}
+
+
+def outbound_metrics():
+    """
+    Snapshot of outbound WebSocket counters for this process plus the
+    current state of each open connection.
+    """
+    now = time.monotonic()
+    connections = [
+        {
+            'user_id': consumer.user.id,
+            'queued': len(consumer.outbound),
+            'refresh_pending': consumer.refresh_pending,
+            'idle_seconds': round(now - consumer.last_client_activity, 1),
+            **consumer.metrics,
+        }
+        for consumer in list(_open_consumers)
+    ]
+    return {
+        'open_connections': len(connections),
+        'queued_events': sum(connection['queued'] for connection in connections),
+        'totals': dict(OUTBOUND_METRICS),
+        'connections': connections,
+    }
+
+
 class NotificationConsumer(AsyncWebsocketConsumer):
-    
+    """
+    Outbound events go through a bounded per-connection queue and are
+    flushed in batches, so a burst cannot grow memory for a slow client.
+    Several events in one flush are sent as a single `notification_batch`
+    frame. On overflow, low priority events are dropped first; if that is
+    not enough (or OVERFLOW_POLICY is 'refresh') the queue collapses into
+    one `refresh` frame telling the client to refetch.
+
+    Clients may offer the `farm.msgpack.v1` subprotocol to receive compact
+    binary frames (see wire_formats); JSON text frames are the default.
+    """
+
     @database_sync_to_async
     def get_user_from_jwt(self, token):
         try:
             from rest_framework_simplejwt.tokens import UntypedToken
             from rest_framework_simplejwt.authentication import JWTAuthentication
             from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-            
+
             # Validate token
             UntypedToken(token)
             # Get user from token
@@ -35,19 +96,21 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         # Get token from query params
         query_params = parse_qs(self.scope["query_string"].decode())
         token = query_params.get("token", [None])[0]
-        
+
         if token:
             self.user = await self.get_user_from_jwt(token)
         else:
             self.user = AnonymousUser()
-        
+
         if self.user.is_anonymous:
             await self.close(code=4001)
             return
-            
+
         # Accept connection first
-        await self.accept()
-        
+        self.encoder = negotiate_encoder(self.scope.get('subprotocols', []))
+        await self.accept(subprotocol=self.encoder.subprotocol)
+        self.start_outbound()
+
         # Join agronomist notification group if user is admin or superuser
         if hasattr(self.user, 'user_type') and self.user.user_type in ['agronomist', 'superuser']:
             self.group_name = 'agronomist_notifications'
@@ -55,31 +118,151 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 self.group_name,
                 self.channel_name
             )
-            
+
             # Also join specific agronomist group for targeted notifications
             self.specific_agronomist_group = f'agronomist_{self.user.id}_notifications'
             await self.channel_layer.group_add(
                 self.specific_agronomist_group,
                 self.channel_name
             )
-            
+
             # Send confirmation message
-            await self.send(text_data=json.dumps({
+            await self.send_frame({
                 'type': 'connection_established',
                 'message': f'Successfully connected to agronomist notifications as {self.user.username}',
                 'user_type': self.user.user_type,
                 'agronomist_id': self.user.id,
                 'groups': [self.group_name, self.specific_agronomist_group]
-            }))
+            })
         else:
             # Non-agronomist users can connect but don't join notification group
-            await self.send(text_data=json.dumps({
+            await self.send_frame({
                 'type': 'connection_established',
                 'message': f'Successfully connected as {self.user.username}',
                 'user_type': self.user.user_type
-            }))
+            })
+
+    def start_outbound(self):
+        self.outbound_config = outbound_settings()
+        self.outbound = deque()
+        self.outbound_ready = asyncio.Event()
+        self.refresh_pending = False
+        self.refresh_dropped = 0
+        self.last_client_activity = time.monotonic()
+        self.metrics = Counter()
+        self.flush_task = asyncio.ensure_future(self.flush_outbound())
+        self.idle_task = asyncio.ensure_future(self.watch_idle())
+        _open_consumers.add(self)
+        OUTBOUND_METRICS['connections_opened'] += 1
+
+    async def send_frame(self, frame):
+        payload = self.encoder.encode(frame)
+        if self.encoder.binary:
+            await self.send(bytes_data=payload)
+        else:
+            await self.send(text_data=payload)
+        self.count('frames_sent')
+        self.count('bytes_sent', len(payload))
+
+    def count(self, name, amount=1):
+        self.metrics[name] += amount
+        OUTBOUND_METRICS[name] += amount
+
+    def queue_event(self, payload, priority='medium'):
+        """Add an outbound event, applying the overflow policy when full."""
+        if self.refresh_pending:
+            # Client will refetch everything anyway
+            self.refresh_dropped += 1
+            self.count('events_dropped')
+            return
+
+        notification_id = payload.get('notification_id')
+        if notification_id is not None and any(
+            queued.get('notification_id') == notification_id for _, queued in self.outbound
+        ):
+            # Same notification pushed to the specific and the general group
+            self.count('events_deduplicated')
+            return
+
+        if len(self.outbound) >= self.outbound_config['QUEUE_SIZE']:
+            self.count('queue_overflows')
+            if self.outbound_config['OVERFLOW_POLICY'] == 'drop_low_priority':
+                if priority == 'low':
+                    self.count('events_dropped')
+                    return
+                for index, (queued_priority, _) in enumerate(self.outbound):
+                    if queued_priority == 'low':
+                        del self.outbound[index]
+                        self.count('events_dropped')
+                        break
+            if len(self.outbound) >= self.outbound_config['QUEUE_SIZE']:
+                self.refresh_pending = True
+                self.refresh_dropped = len(self.outbound) + 1
+                self.count('events_dropped', self.refresh_dropped)
+                self.count('refresh_collapses')
+                self.outbound.clear()
+                self.outbound_ready.set()
+                return
+
+        self.outbound.append((priority, payload))
+        self.count('events_queued')
+        self.outbound_ready.set()
+
+    async def flush_outbound(self):
+        max_events = self.outbound_config['BATCH_MAX_EVENTS']
+        interval = self.outbound_config['BATCH_INTERVAL_MS'] / 1000
+        try:
+            while True:
+                await self.outbound_ready.wait()
+                # Give a burst a moment to accumulate into one frame
+                if len(self.outbound) < max_events and not self.refresh_pending:
+                    await asyncio.sleep(interval)
+                self.outbound_ready.clear()
+
+                if self.refresh_pending:
+                    frame = {'type': 'refresh', 'reason': 'overflow', 'dropped': self.refresh_dropped}
+                    self.refresh_pending = False
+                    self.refresh_dropped = 0
+                    await self.send_frame(frame)
+                    continue
+
+                batch = [self.outbound.popleft()[1] for _ in range(min(max_events, len(self.outbound)))]
+                if not batch:
+                    continue
+                if len(batch) == 1:
+                    frame = batch[0]
+                else:
+                    frame = {'type': 'notification_batch', 'notifications': batch}
+                await self.send_frame(frame)
+                self.count('events_sent', len(batch))
+                if self.outbound:
+                    self.outbound_ready.set()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Outbound flush failed for user {self.user.id}: {e}")
+
+    async def watch_idle(self):
+        timeout = self.outbound_config['IDLE_TIMEOUT']
+        if not timeout:
+            return
+        try:
+            while True:
+                remaining = self.last_client_activity + timeout - time.monotonic()
+                if remaining <= 0:
+                    self.count('idle_timeouts')
+                    await self.close(code=IDLE_CLOSE_CODE)
+                    return
+                await asyncio.sleep(remaining)
+        except asyncio.CancelledError:
+            pass
 
     async def disconnect(self, close_code):
+        if hasattr(self, 'flush_task'):
+            self.flush_task.cancel()
+            self.idle_task.cancel()
+            _open_consumers.discard(self)
+            OUTBOUND_METRICS['connections_closed'] += 1
         if hasattr(self, 'group_name'):
             await self.channel_layer.group_discard(
                 self.group_name,
@@ -91,31 +274,39 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 self.channel_name
             )
 
-    async def receive(self, text_data):
-        pass
+    async def receive(self, text_data=None, bytes_data=None):
+        self.last_client_activity = time.monotonic()
+        try:
+            data = json.loads(text_data)
+        except (TypeError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('type') == 'ping':
+            await self.send_frame({'type': 'pong'})
 
     @database_sync_to_async
     def save_notification_to_db(self, title, message, notification_type='general', farm_id=None, user_id=None):
-        from farms.models import Notification, Farm
+        from farms.models import Farm
+        from farms.notifications import create_notification
         from django.contrib.auth import get_user_model
-        
+
         User = get_user_model()
         farm = None
         user = None
-        
+
         if farm_id:
             try:
                 farm = Farm.objects.get(id=farm_id)
             except Farm.DoesNotExist:
                 pass
-                
+
         if user_id:
             try:
                 user = User.objects.get(id=user_id)
             except User.DoesNotExist:
                 pass
-        
-        notification = Notification.objects.create(
+
+        notification = create_notification(
+            [user],
             title=title,
             message=message,
             notification_type=notification_type,
@@ -125,7 +316,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         return notification
 
     async def notification_message(self, event):
-        # Send notification to WebSocket client
+        # Queue notification for the WebSocket client
         try:
             notification_data = {
                 'type': 'notification',
@@ -139,16 +330,16 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 'user_name': event.get('user_name'),
                 'timestamp': event.get('timestamp', datetime.now().isoformat())
             }
-            
-            await self.send(text_data=json.dumps(notification_data))
-            
+
+            self.queue_event(notification_data, event.get('priority', 'medium'))
+
         except Exception as e:
-            logger.error(f"Failed to send WebSocket message: {e}")
+            logger.error(f"Failed to queue WebSocket message: {e}")
 
     @classmethod
     async def send_notification_to_agronomists(cls, title, message, notification_type='general', farm=None, user=None):
         from channels.layers import get_channel_layer
-        
+
         channel_layer = get_channel_layer()
         if channel_layer:
             await channel_layer.group_send(
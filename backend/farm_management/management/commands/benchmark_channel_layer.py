@@ -0,0 +1,137 @@
+import asyncio
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+from channels.layers import InMemoryChannelLayer
+from farm_management.channel_layers import SQLiteChannelLayer
+
+
+def _percentile(samples, percent):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _remote_sender(path, channel, count, interval):
+    """Runs in a child process and sends timestamped messages to `channel`."""
+    async def send_all():
+        layer = SQLiteChannelLayer(path=path, capacity=count + 1)
+        for i in range(count):
+            await layer.send(channel, {'type': 'bench.message', 'sent_at': time.time(), 'seq': i})
+            await asyncio.sleep(interval)
+        await layer.close()
+    asyncio.run(send_all())
+
+
+class Command(BaseCommand):
+    help = 'Compare delivery latency of the in-memory and SQLite channel layers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--messages',
+            type=int,
+            default=500,
+            help='Messages per scenario (default: 500)',
+        )
+        parser.add_argument(
+            '--group-size',
+            type=int,
+            default=20,
+            help='Channels in the group_send fan-out scenario (default: 20)',
+        )
+        parser.add_argument(
+            '--skip-cross-process',
+            action='store_true',
+            help='Skip the SQLite cross-process scenario',
+        )
+
+    def handle(self, *args, **options):
+        messages = options['messages']
+        group_size = options['group_size']
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.sqlite3')
+            layers = [
+                ('in-memory', lambda: InMemoryChannelLayer(capacity=messages + 1)),
+                ('sqlite', lambda: SQLiteChannelLayer(path=path, capacity=messages + 1)),
+            ]
+
+            self.stdout.write(f'{"layer":<12}{"scenario":<22}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"msg/s":>12}')
+            for name, factory in layers:
+                results = asyncio.run(self.run_in_process(factory, messages, group_size))
+                for scenario, samples, elapsed in results:
+                    self.report(name, scenario, samples, elapsed)
+
+            if not options['skip_cross_process']:
+                samples, elapsed = self.run_cross_process(path, messages)
+                self.report('sqlite', 'cross-process send', samples, elapsed)
+
+    async def run_in_process(self, factory, messages, group_size):
+        layer = factory()
+        results = []
+
+        # Point-to-point: one message in flight at a time
+        channel = await layer.new_channel()
+        samples = []
+        started = time.perf_counter()
+        for i in range(messages):
+            sent = time.perf_counter()
+            await layer.send(channel, {'type': 'bench.message', 'seq': i})
+            await layer.receive(channel)
+            samples.append(time.perf_counter() - sent)
+        results.append(('send/receive', samples, time.perf_counter() - started))
+
+        # Fan-out: time until every group member has the message
+        group = 'bench_group'
+        channels = [await layer.new_channel() for _ in range(group_size)]
+        for member in channels:
+            await layer.group_add(group, member)
+        rounds = max(1, messages // group_size)
+        samples = []
+        started = time.perf_counter()
+        for i in range(rounds):
+            receivers = [asyncio.ensure_future(layer.receive(member)) for member in channels]
+            sent = time.perf_counter()
+            await layer.group_send(group, {'type': 'bench.message', 'seq': i})
+            await asyncio.gather(*receivers)
+            samples.append(time.perf_counter() - sent)
+        results.append((f'group_send x{group_size}', samples, time.perf_counter() - started))
+
+        await layer.flush()
+        await layer.close()
+        return results
+
+    def run_cross_process(self, path, messages):
+        layer = SQLiteChannelLayer(path=path, capacity=messages + 1)
+        channel = 'bench.cross_process'
+        sender = multiprocessing.get_context('spawn').Process(
+            target=_remote_sender, args=(path, channel, messages, 0.002)
+        )
+
+        async def receive_all():
+            samples = []
+            for _ in range(messages):
+                message = await layer.receive(channel)
+                samples.append(time.time() - message['sent_at'])
+            await layer.close()
+            return samples
+
+        started = time.perf_counter()
+        sender.start()
+        samples = asyncio.run(receive_all())
+        elapsed = time.perf_counter() - started
+        sender.join()
+        return samples, elapsed
+
+    def report(self, layer, scenario, samples, elapsed):
+        to_ms = 1000
+        self.stdout.write(
+            f'{layer:<12}{scenario:<22}'
+            f'{statistics.median(samples) * to_ms:>10.3f}'
+            f'{_percentile(samples, 95) * to_ms:>10.3f}'
+            f'{_percentile(samples, 99) * to_ms:>10.3f}'
+            f'{len(samples) / elapsed:>12.0f}'
+        )
@@ -0,0 +1,32 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson handles str/int/float/bool/None, dicts, lists, dates, datetimes and UUIDs
+# itself; everything else (Decimal, timedelta, lazy strings...) goes through DRF's
+# encoder so the output matches JSONRenderer
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson, which serializes dicts, lists, dates and
+    datetimes in C. Falls back to DRF's JSONRenderer when orjson is not
+    installed, when the client asks for indentation and for the
+    COMPACT_JSON=False / UNICODE_JSON=False settings.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or not self.compact or self.ensure_ascii or self.get_indent(
+            accepted_media_type or '', renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Times in UTC end in "Z" rather than "+00:00", as in DRF's DateTimeField
+        options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(data, default=_default, option=options)
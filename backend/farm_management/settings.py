@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     'corsheaders',
     'rest_framework_simplejwt',
     'django_celery_beat',
+    'farm_management',
     'accounts',
     'farms',
 ]
@@ -104,6 +105,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'farm_management.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
@@ -131,6 +136,8 @@ CORS_ALLOWED_ORIGINS = config(
 
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = config('CORS_ALLOW_ALL_ORIGINS', default=DEBUG, cast=bool)
+# Let the frontend read the next-page cursor of paginated lists
+CORS_EXPOSE_HEADERS = ['Link', 'X-Next-Cursor']
 
 # Additional CORS settings for development
 if DEBUG:
@@ -145,10 +152,43 @@ AUTH_USER_MODEL = 'accounts.CustomUser'
 # Channels
 ASGI_APPLICATION = 'farm_management.asgi.application'
 
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
-    },
+# 'sqlite' shares messages between daphne, Celery workers and management
+# commands on the same host; 'memory' only reaches sockets in this process.
+# The SQLite layer has no cross-process wakeup: a receiver polls its channel,
+# backing off from 1 ms to CHANNEL_LAYER_POLL_INTERVAL seconds while it is
+# empty. A message sent from another process can therefore wait up to that
+# interval (100 ms by default), and each idle socket runs one indexed
+# SELECT per interval. Sends within the same process are delivered at once.
+# Raise the interval to trade latency for fewer idle queries.
+CHANNEL_LAYER_BACKEND = config('CHANNEL_LAYER_BACKEND', default='sqlite')
+
+if CHANNEL_LAYER_BACKEND == 'memory':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'farm_management.channel_layers.SQLiteChannelLayer',
+            'CONFIG': {
+                'path': config('CHANNEL_LAYER_PATH', default=str(BASE_DIR / 'channels.sqlite3')),
+                'expiry': config('CHANNEL_LAYER_EXPIRY', default=60, cast=int),
+                'group_expiry': config('CHANNEL_LAYER_GROUP_EXPIRY', default=86400, cast=int),
+                'capacity': config('CHANNEL_LAYER_CAPACITY', default=100, cast=int),
+                'poll_interval': config('CHANNEL_LAYER_POLL_INTERVAL', default=0.1, cast=float),
+            },
+        },
+    }
+
+# Per-connection outbound queue for NotificationConsumer
+WEBSOCKET_OUTBOUND = {
+    'QUEUE_SIZE': config('WS_OUTBOUND_QUEUE_SIZE', default=100, cast=int),
+    'BATCH_MAX_EVENTS': config('WS_BATCH_MAX_EVENTS', default=20, cast=int),
+    'BATCH_INTERVAL_MS': config('WS_BATCH_INTERVAL_MS', default=50, cast=int),
+    'OVERFLOW_POLICY': config('WS_OVERFLOW_POLICY', default='drop_low_priority'),
+    'IDLE_TIMEOUT': config('WS_IDLE_TIMEOUT', default=120, cast=int),
 }
 
 
@@ -224,11 +264,23 @@ CSRF_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SAMESITE = 'Lax'
 CSRF_COOKIE_SAMESITE = 'Lax'
 
-# Caching - Use local memory cache
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'farm-management-cache',
-        'TIMEOUT': 300,  # 5 minutes default
+# Caching - Redis when REDIS_URL is set (needs the redis package), so that
+# cache invalidation reaches every server process and the Celery workers;
+# otherwise a per-process local memory cache
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'TIMEOUT': 300,  # 5 minutes default
+        }
     }
-}
\ No newline at end of file
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'farm-management-cache',
+            'TIMEOUT': 300,  # 5 minutes default
+        }
+    }
\ No newline at end of file
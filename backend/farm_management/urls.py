@@ -3,15 +3,22 @@ from django.urls import path, include
 from django.http import JsonResponse
 from django.conf import settings
 from django.conf.urls.static import static
+from django.contrib.admin.views.decorators import staff_member_required
+from .consumers import outbound_metrics
 
 def health_check(request):
     return JsonResponse({'status': 'healthy', 'message': 'Farm Management API is running'})
 
+@staff_member_required
+def websocket_metrics(request):
+    return JsonResponse(outbound_metrics())
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('accounts.urls')),
     path('api/farms/', include('farms.urls')),
     path('health/', health_check, name='health_check'),
+    path('metrics/websocket/', websocket_metrics, name='websocket_metrics'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,99 @@
+import json
+from datetime import datetime
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_SUBPROTOCOL = 'farm.msgpack.v1'
+
+# Long field name -> short code used in compact frames
+FIELD_CODES = {
+    'type': 't',
+    'title': 'h',
+    'message': 'm',
+    'notification_type': 'k',
+    'notification_id': 'i',
+    'farm_id': 'f',
+    'farm_name': 'F',
+    'user_id': 'u',
+    'user_name': 'U',
+    'timestamp': 'ts',
+    'priority': 'p',
+    'notifications': 'n',
+}
+
+# Values of these fields repeat across frames, so they are sent once and
+# referenced by index afterwards
+INTERNED_FIELDS = {'type', 'notification_type', 'farm_name', 'user_name', 'priority'}
+
+MAX_INTERNED_STRINGS = 4096
+
+
+class JSONFrameEncoder:
+    subprotocol = None
+    binary = False
+
+    def encode(self, frame):
+        return json.dumps(frame)
+
+
+class MsgpackFrameEncoder:
+    """
+    Encodes frames for the `farm.msgpack.v1` subprotocol:
+
+    * keys are replaced by the codes in FIELD_CODES (others pass through);
+    * values of INTERNED_FIELDS become integer indexes into a per-connection
+      string table. Strings seen for the first time are appended to the
+      frame's `S` list, in index order, before they are referenced;
+    * `timestamp` is sent as epoch milliseconds;
+    * null fields are omitted.
+
+    Once the table is full, new strings are sent inline.
+    """
+    subprotocol = MSGPACK_SUBPROTOCOL
+    binary = True
+
+    def __init__(self):
+        self.strings = {}
+
+    def encode(self, frame):
+        new_strings = []
+        compact = self._compact(frame, new_strings)
+        if new_strings:
+            compact['S'] = new_strings
+        return msgpack.packb(compact, use_bin_type=True)
+
+    def _intern(self, value, new_strings):
+        index = self.strings.get(value)
+        if index is None:
+            if len(self.strings) >= MAX_INTERNED_STRINGS:
+                return value
+            index = self.strings[value] = len(self.strings)
+            new_strings.append(value)
+        return index
+
+    def _compact(self, frame, new_strings):
+        compact = {}
+        for key, value in frame.items():
+            if value is None:
+                continue
+            if key in INTERNED_FIELDS and isinstance(value, str):
+                value = self._intern(value, new_strings)
+            elif key == 'timestamp' and isinstance(value, str):
+                try:
+                    value = int(datetime.fromisoformat(value).timestamp() * 1000)
+                except ValueError:
+                    pass
+            elif key == 'notifications':
+                value = [self._compact(item, new_strings) for item in value]
+            compact[FIELD_CODES.get(key, key)] = value
+        return compact
+
+
+def negotiate_encoder(subprotocols):
+    """Pick the frame encoder for the subprotocols offered by the client."""
+    if msgpack is not None and MSGPACK_SUBPROTOCOL in subprotocols:
+        return MsgpackFrameEncoder()
+    return JSONFrameEncoder()
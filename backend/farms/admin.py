@@ -1,8 +1,10 @@
 from django.contrib import admin
 from .models import (Farm, DailyTask, Notification, SprayIrrigationLog, CropStage, Fertigation,
-                     AgronomistNotification, PlantDiseasePrediction, SpraySchedule, Worker,
+                     NotificationRecipient, PlantDiseasePrediction, SpraySchedule, Worker,
                      WorkerTask, IssueReport, Expenditure, Sale, FarmTask)
 from accounts.models import CustomUser
+from .facts import reconcile_monthly_facts
+from .kpis import bump_kpi_version
 
 @admin.register(Farm)
 class FarmAdmin(admin.ModelAdmin):
@@ -49,10 +51,16 @@ class DailyTaskAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('-created_at',)
 
+class NotificationRecipientInline(admin.TabularInline):
+    model = NotificationRecipient
+    extra = 0
+    fields = ('recipient', 'is_read', 'delivered_at')
+    raw_id_fields = ('recipient',)
+
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ('title', 'notification_type', 'farm_name', 'user_name', 'is_read', 'created_at')
-    list_filter = ('notification_type', 'is_read', 'created_at', 'farm')
+    list_display = ('display_title', 'notification_type', 'farm_name', 'user_name', 'created_at')
+    list_filter = ('notification_type', 'is_farm_wide', 'created_at', 'farm')
     search_fields = ('title', 'message', 'farm__name', 'user__username', 'user__first_name', 'user__last_name')
     readonly_fields = ('created_at',)
     ordering = ('-created_at',)
@@ -63,15 +71,20 @@ class NotificationAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('Notification Details', {
-            'fields': ('title', 'message', 'notification_type')
+            'fields': ('title', 'message', 'template', 'params', 'notification_type')
         }),
         ('Related Objects', {
-            'fields': ('farm', 'user')
+            'fields': ('farm', 'user', 'created_by', 'is_farm_wide', 'related_object_id', 'related_model_name')
         }),
         ('Status', {
-            'fields': ('is_read', 'created_at')
+            'fields': ('created_at',)
         }),
     )
+    inlines = [NotificationRecipientInline]
+    
+    def display_title(self, obj):
+        return obj.rendered_title
+    display_title.short_description = 'Title'
     
     def farm_name(self, obj):
         return obj.farm.name if obj.farm else '-'
@@ -87,13 +100,13 @@ class NotificationAdmin(admin.ModelAdmin):
     user_name.admin_order_field = 'user__username'
     
     def mark_as_read(self, request, queryset):
-        updated = queryset.update(is_read=True)
-        self.message_user(request, f'{updated} notifications marked as read.')
+        updated = NotificationRecipient.objects.filter(notification__in=queryset).update(is_read=True)
+        self.message_user(request, f'{updated} notification receipts marked as read.')
     mark_as_read.short_description = 'Mark selected notifications as read'
     
     def mark_as_unread(self, request, queryset):
-        updated = queryset.update(is_read=False)
-        self.message_user(request, f'{updated} notifications marked as unread.')
+        updated = NotificationRecipient.objects.filter(notification__in=queryset).update(is_read=False)
+        self.message_user(request, f'{updated} notification receipts marked as unread.')
     mark_as_unread.short_description = 'Mark selected notifications as unread'
     
     def delete_selected_notifications(self, request, queryset):
@@ -200,50 +213,28 @@ class SprayIrrigationLogAdmin(admin.ModelAdmin):
         queryset = super().get_queryset(request)
         return queryset.select_related('farm', 'user')
 
-@admin.register(AgronomistNotification)
-class AgronomistNotificationAdmin(admin.ModelAdmin):
-    list_display = ("title", "notification_type", "agronomist_user_name", "source_user_name", "source_farm_name", "is_read", "created_at")
-    list_filter = ("notification_type", "is_read", "created_at")
-    search_fields = ("title", "message", "agronomist_user__username", "source_user__username", "source_farm__name")
-    readonly_fields = ("created_at",)
-    ordering = ("-created_at",)
+@admin.register(NotificationRecipient)
+class NotificationRecipientAdmin(admin.ModelAdmin):
+    list_display = ("notification_title", "recipient_name", "is_read", "delivered_at")
+    list_filter = ("is_read", "notification__notification_type")
+    search_fields = ("notification__title", "recipient__username")
+    raw_id_fields = ("notification", "recipient")
+    ordering = ("-notification",)
     list_per_page = 50
-    date_hierarchy = "created_at"
-    
-    fieldsets = (
-        ("Notification Details", {
-            "fields": ("title", "message", "notification_type")
-        }),
-        ("Agronomist and Source", {
-            "fields": ("agronomist_user", "source_user", "source_farm")
-        }),
-        ("Related Object", {
-            "fields": ("related_object_id", "related_model_name"),
-            "classes": ("collapse",)
-        }),
-        ("Status", {
-            "fields": ("is_read", "created_at")
-        }),
-    )
-    
-    def agronomist_user_name(self, obj):
-        return obj.agronomist_user.username if obj.agronomist_user else "-"
-    agronomist_user_name.short_description = "Agronomist"
-    agronomist_user_name.admin_order_field = "agronomist_user__username"
     
-    def source_user_name(self, obj):
-        return obj.source_user.username if obj.source_user else "-"
-    source_user_name.short_description = "Source User"
-    source_user_name.admin_order_field = "source_user__username"
+    def notification_title(self, obj):
+        return obj.notification.rendered_title
+    notification_title.short_description = "Notification"
+    notification_title.admin_order_field = "notification__title"
     
-    def source_farm_name(self, obj):
-        return obj.source_farm.name if obj.source_farm else "-"
-    source_farm_name.short_description = "Source Farm"
-    source_farm_name.admin_order_field = "source_farm__name"
+    def recipient_name(self, obj):
+        return obj.recipient.username
+    recipient_name.short_description = "Recipient"
+    recipient_name.admin_order_field = "recipient__username"
     
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.select_related("agronomist_user", "source_user", "source_farm")
+        return queryset.select_related("notification", "notification__farm", "recipient")
 
 @admin.register(PlantDiseasePrediction)
 class PlantDiseasePredictionAdmin(admin.ModelAdmin):
@@ -659,19 +650,28 @@ class FarmTaskAdmin(admin.ModelAdmin):
     user_name.short_description = 'User'
     user_name.admin_order_field = 'user__username'
 
+    def _bulk_update(self, queryset, **fields):
+        # queryset.update() skips post_save, so refresh the KPI snapshots and monthly facts here
+        farm_ids = set(queryset.values_list('farm_id', flat=True))
+        updated = queryset.update(**fields)
+        for farm_id in farm_ids:
+            bump_kpi_version(farm_id)
+        reconcile_monthly_facts(farm_ids)
+        return updated
+
     def mark_as_completed(self, request, queryset):
         from django.utils import timezone
-        updated = queryset.update(status='completed', completed_at=timezone.now())
+        updated = self._bulk_update(queryset, status='completed', completed_at=timezone.now())
         self.message_user(request, f'{updated} tasks marked as completed.')
     mark_as_completed.short_description = 'Mark selected tasks as completed'
 
     def mark_as_in_progress(self, request, queryset):
-        updated = queryset.update(status='in_progress')
+        updated = self._bulk_update(queryset, status='in_progress')
         self.message_user(request, f'{updated} tasks marked as in progress.')
     mark_as_in_progress.short_description = 'Mark selected tasks as in progress'
 
     def mark_as_pending(self, request, queryset):
-        updated = queryset.update(status='pending', completed_at=None)
+        updated = self._bulk_update(queryset, status='pending', completed_at=None)
         self.message_user(request, f'{updated} tasks marked as pending.')
     mark_as_pending.short_description = 'Mark selected tasks as pending'
 
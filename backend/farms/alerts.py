@@ -0,0 +1,136 @@
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+from .models import CropAlert, CropStage
+
+# Keys of a progress summary, in the order the API renders them
+SUMMARY_FIELDS = ('timeline_status', 'health_alert', 'stage_progress', 'yield_status', 'next_action', 'alerts')
+
+# Crop stage columns a summary is computed from
+SUMMARY_SOURCES = (
+    'current_stage', 'health_status', 'expected_harvest_date', 'actual_harvest_date',
+    'stage_start_date', 'stage_end_date', 'expected_yield', 'actual_yield',
+)
+
+STAGE_ACTIONS = {
+    'germination': 'Monitor moisture and temperature',
+    'seedling': 'Ensure adequate light and ventilation',
+    'vegetative': 'Apply nitrogen fertilizer and prune',
+    'flowering': 'Monitor for pests and diseases',
+    'fruiting': 'Support branches and maintain watering',
+    'harvest': 'Plan harvest schedule',
+}
+
+
+def progress_summary(crop_stage, today):
+    """Timeline, health, stage progress and yield status of a crop stage as of `today`"""
+    summary = {
+        'timeline_status': 'on_track',
+        'health_alert': False,
+        'stage_progress': 0,
+        'yield_status': 'unknown',
+        'next_action': None,
+        'alerts': []
+    }
+
+    # Timeline status
+    if crop_stage.expected_harvest_date:
+        days_to_harvest = (crop_stage.expected_harvest_date - today).days
+        if days_to_harvest < 0 and not crop_stage.actual_harvest_date:
+            summary['timeline_status'] = 'overdue'
+            summary['alerts'].append('Harvest is overdue')
+        elif days_to_harvest <= 3:
+            summary['timeline_status'] = 'due_soon'
+            summary['alerts'].append(f'Harvest due in {days_to_harvest} days')
+
+    # Health alerts
+    if crop_stage.health_status == 'needs_attention':
+        summary['health_alert'] = True
+        summary['alerts'].append('Crop needs immediate attention')
+    elif crop_stage.health_status == 'moderate':
+        summary['alerts'].append('Monitor crop health closely')
+
+    # Stage progress calculation
+    if crop_stage.stage_start_date and crop_stage.stage_end_date:
+        total_stage_days = (crop_stage.stage_end_date - crop_stage.stage_start_date).days
+        days_passed = (today - crop_stage.stage_start_date).days
+        if total_stage_days > 0:
+            summary['stage_progress'] = min(100, max(0, int((days_passed / total_stage_days) * 100)))
+
+    # Yield status
+    if crop_stage.expected_yield:
+        if crop_stage.actual_yield:
+            efficiency = crop_stage.yield_efficiency
+            if efficiency >= 90:
+                summary['yield_status'] = 'excellent'
+            elif efficiency >= 75:
+                summary['yield_status'] = 'good'
+            elif efficiency >= 60:
+                summary['yield_status'] = 'fair'
+            else:
+                summary['yield_status'] = 'poor'
+        else:
+            summary['yield_status'] = 'pending'
+
+    summary['next_action'] = STAGE_ACTIONS.get(crop_stage.current_stage, 'Continue monitoring')
+    return summary
+
+
+def stored_summary(alert, today):
+    """The summary held by a CropAlert, or None when it is missing or from an earlier day"""
+    if alert is None or alert.computed_on != today:
+        return None
+    return {name: getattr(alert, name) for name in SUMMARY_FIELDS}
+
+
+def _store(crop_stages, today):
+    alerts = []
+    for crop_stage in crop_stages:
+        summary = progress_summary(crop_stage, today)
+        alerts.append(CropAlert(
+            crop_stage_id=crop_stage.id, farm_id=crop_stage.farm_id, user_id=crop_stage.user_id,
+            alert_count=len(summary['alerts']), computed_on=today, updated_at=timezone.now(), **summary
+        ))
+    CropAlert.objects.bulk_create(
+        alerts,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['crop_stage'],
+        update_fields=['farm', 'user', *SUMMARY_FIELDS, 'alert_count', 'computed_on', 'updated_at'],
+    )
+    return len(alerts)
+
+
+def refresh_crop_alerts(crop_stages, today=None):
+    """
+    Recompute the CropAlert rows of a CropStage queryset with one read and
+    bulk upserts. Returns the number of rows written.
+    """
+    crop_stages = crop_stages.only('id', 'farm_id', 'user_id', *SUMMARY_SOURCES).order_by()
+    return _store(crop_stages, today or timezone.localdate())
+
+
+def refresh_stale_crop_alerts(crop_stages=None, today=None):
+    """
+    Bring the alerts of `crop_stages` (all crop stages by default) up to
+    `today`: stages without a row or with one computed on an earlier day.
+    Edits are picked up on save; this catches the date-driven transitions
+    (due soon, overdue, stage progress) of a new day.
+    """
+    today = today or timezone.localdate()
+    if crop_stages is None:
+        crop_stages = CropStage.objects.all()
+    stale = crop_stages.filter(Q(alert__isnull=True) | Q(alert__computed_on__lt=today))
+    return refresh_crop_alerts(stale, today)
+
+
+def update_alert_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Upserted in the same transaction as the save, so it commits or rolls back with it
+    _store([instance], timezone.localdate())
+    if CropStage.alert.related.is_cached(instance):
+        CropStage.alert.related.delete_cached_value(instance)
+
+
+post_save.connect(update_alert_on_save, sender=CropStage, dispatch_uid='crop_alert_post_save')
@@ -0,0 +1,607 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.db.models import (
+    BooleanField, Case, Count, DateField, Exists, ExpressionWrapper, F, FloatField, Min, OuterRef, Q, Subquery, Sum,
+    Value, When, Window,
+)
+from django.db.models.functions import Cast, Coalesce, TruncDate, TruncDay, TruncMonth, TruncQuarter, TruncWeek
+from .db_functions import AddDays, DaysBetween
+from .models import CropStage, Expenditure, Sale, SpraySchedule
+
+ZERO = Decimal('0')
+CENTS = Decimal('0.01')
+
+SERIES_BUCKETS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+    'quarter': TruncQuarter,
+}
+
+
+def sale_summary(sales, top_buyers=5):
+    """
+    Totals, payment status, crop and buyer breakdowns for a Sale queryset.
+
+    One query groups by crop with conditional aggregates per payment status;
+    overall totals are added up from those few crop rows. A second query
+    ranks buyers with ORDER BY/LIMIT.
+    """
+    sales = sales.order_by()
+
+    status_aggregates = {}
+    for code, _ in Sale.PAYMENT_STATUS_CHOICES:
+        status_aggregates[f'{code}_count'] = Count('id', filter=Q(payment_status=code))
+        status_aggregates[f'{code}_amount'] = Sum('total_amount', filter=Q(payment_status=code))
+
+    crop_rows = list(
+        sales.values('crop_name').annotate(
+            count=Count('id'),
+            sales_amount=Sum('total_amount'),
+            quantity=Sum('quantity_sold'),
+            received=Sum('amount_received'),
+            transportation=Sum('transportation_cost'),
+            commission=Sum('commission_amount'),
+            first_unit=Min('unit'),
+            **status_aggregates
+        ).order_by('-sales_amount', 'crop_name')
+    )
+
+    def total(field):
+        return sum((row[field] or ZERO for row in crop_rows), ZERO)
+
+    total_sales_amount = total('sales_amount')
+    total_amount_received = total('received')
+    total_transactions = sum(row['count'] for row in crop_rows)
+
+    payment_status_breakdown = [
+        {
+            'status': code,
+            'status_display': label,
+            'count': sum(row[f'{code}_count'] for row in crop_rows),
+            'total_amount': total(f'{code}_amount'),
+        }
+        for code, label in Sale.PAYMENT_STATUS_CHOICES
+    ]
+
+    unit_labels = dict(Sale.UNIT_CHOICES)
+    crop_breakdown = [
+        {
+            'crop_name': row['crop_name'],
+            'count': row['count'],
+            'total_amount': row['sales_amount'] or ZERO,
+            'total_quantity': row['quantity'] or ZERO,
+            'unit': unit_labels.get(row['first_unit'], row['first_unit']),
+        }
+        for row in crop_rows
+    ]
+
+    buyers = [
+        {'buyer_name': row['buyer_name'], 'count': row['count'], 'total_amount': row['sales_amount'] or ZERO}
+        for row in sales.values('buyer_name').annotate(
+            count=Count('id'),
+            sales_amount=Sum('total_amount'),
+        ).order_by('-sales_amount', 'buyer_name')[:top_buyers]
+    ]
+
+    return {
+        'total_sales_amount': total_sales_amount,
+        'total_amount_received': total_amount_received,
+        'total_pending_amount': total_sales_amount - total_amount_received,
+        'total_net_amount': total_sales_amount - total('transportation') - total('commission'),
+        'total_transactions': total_transactions,
+        'average_sale_amount': round(total_sales_amount / total_transactions if total_transactions > 0 else 0, 2),
+        'payment_completion_rate': round((total_amount_received / total_sales_amount * 100) if total_sales_amount > 0 else 0, 2),
+        'payment_status_breakdown': payment_status_breakdown,
+        'crop_breakdown': crop_breakdown,
+        'top_buyers': buyers,
+    }
+
+
+def expenditure_summary(expenditures):
+    """
+    Totals with category and payment method breakdowns for an Expenditure
+    queryset, from a single GROUP BY category, payment_method.
+    """
+    rows = list(
+        expenditures.order_by().values('category', 'payment_method').annotate(
+            amount=Sum('amount'),
+            count=Count('id'),
+        )
+    )
+
+    total_amount = sum((row['amount'] for row in rows), ZERO)
+    total_transactions = sum(row['count'] for row in rows)
+
+    category_totals = {}
+    payment_totals = {}
+    for row in rows:
+        category_totals[row['category']] = category_totals.get(row['category'], ZERO) + row['amount']
+        payment_totals[row['payment_method']] = payment_totals.get(row['payment_method'], ZERO) + row['amount']
+
+    category_breakdown = {}
+    for category_code, category_name in Expenditure.CATEGORY_CHOICES:
+        category_total = category_totals.get(category_code, ZERO)
+        if category_total > 0:
+            category_breakdown[category_name] = {
+                'amount': category_total,
+                'percentage': round((category_total / total_amount * 100) if total_amount > 0 else 0, 2)
+            }
+
+    payment_breakdown = {}
+    for payment_code, payment_name in Expenditure.PAYMENT_METHOD_CHOICES:
+        payment_total = payment_totals.get(payment_code, ZERO)
+        if payment_total > 0:
+            payment_breakdown[payment_name] = payment_total
+
+    return {
+        'total_expenditure': total_amount,
+        'total_transactions': total_transactions,
+        'average_transaction': round(total_amount / total_transactions if total_transactions > 0 else 0, 2),
+        'category_breakdown': category_breakdown,
+        'payment_method_breakdown': payment_breakdown,
+    }
+
+
+def _next_bucket(day, bucket):
+    if bucket == 'day':
+        return day + timedelta(days=1)
+    if bucket == 'week':
+        return day + timedelta(days=7)
+    months = 3 if bucket == 'quarter' else 1
+    month = day.month - 1 + months
+    return day.replace(year=day.year + month // 12, month=month % 12 + 1, day=1)
+
+
+def _delta_pct(current, previous):
+    if previous is None or not previous:
+        return None
+    return round(float((current - previous) / previous * 100), 2)
+
+
+def _matrix(cells, choices, bucket_index, bucket_count):
+    """Rows for each choice that has any spend, one column per bucket."""
+    keys, labels, values = [], [], []
+    for code, label in choices:
+        if code not in cells:
+            continue
+        row = [0.0] * bucket_count
+        for bucket_start, amount in cells[code].items():
+            row[bucket_index[bucket_start]] = float(amount)
+        keys.append(code)
+        labels.append(label)
+        values.append(row)
+    return {'keys': keys, 'labels': labels, 'values': values}
+
+
+def expenditure_timeseries(expenditures, bucket='month'):
+    """
+    Spend per time bucket in a columnar shape for charts: parallel arrays
+    indexed by bucket, plus category x bucket and payment method x bucket
+    matrices. Everything comes from one GROUP BY bucket, category,
+    payment_method; empty buckets between the first and last are filled
+    with zeros so deltas compare adjacent periods.
+    """
+    trunc = SERIES_BUCKETS[bucket]
+    rows = list(
+        expenditures.order_by().annotate(
+            bucket_start=trunc('expense_date')
+        ).values('bucket_start', 'category', 'payment_method').annotate(
+            amount=Sum('amount'),
+            count=Count('id'),
+        ).order_by('bucket_start')
+    )
+
+    buckets = []
+    if rows:
+        current, last = rows[0]['bucket_start'], rows[-1]['bucket_start']
+        while current <= last:
+            buckets.append(current)
+            current = _next_bucket(current, bucket)
+    bucket_index = {bucket_start: index for index, bucket_start in enumerate(buckets)}
+
+    totals = [ZERO] * len(buckets)
+    counts = [0] * len(buckets)
+    category_cells = {}
+    payment_cells = {}
+    for row in rows:
+        index = bucket_index[row['bucket_start']]
+        totals[index] += row['amount']
+        counts[index] += row['count']
+        for cells, key in ((category_cells, row['category']), (payment_cells, row['payment_method'])):
+            by_bucket = cells.setdefault(key, {})
+            by_bucket[row['bucket_start']] = by_bucket.get(row['bucket_start'], ZERO) + row['amount']
+
+    previous = [None] + totals[:-1]
+    return {
+        'bucket': bucket,
+        'buckets': [bucket_start.isoformat() for bucket_start in buckets],
+        'totals': [float(total) for total in totals],
+        'counts': counts,
+        'deltas': [None if before is None else float(total - before) for total, before in zip(totals, previous)],
+        'delta_pct': [_delta_pct(total, before) for total, before in zip(totals, previous)],
+        'categories': _matrix(category_cells, Expenditure.CATEGORY_CHOICES, bucket_index, len(buckets)),
+        'payment_methods': _matrix(payment_cells, Expenditure.PAYMENT_METHOD_CHOICES, bucket_index, len(buckets)),
+    }
+
+
+def overdue_crops(today):
+    """Crop stages whose expected harvest date has passed without a recorded harvest"""
+    return Q(expected_harvest_date__lt=today, actual_harvest_date__isnull=True)
+
+
+def with_crop_timeline(crop_stages, today):
+    """
+    Annotate crop stages with growth_duration_days, days_in_current_stage,
+    days_to_harvest and is_overdue, computed in SQL from one `today` so
+    they can be filtered and sorted on. The values shadow the model's
+    properties of the same names on the loaded rows.
+    """
+    today = Value(today, output_field=DateField())
+    return crop_stages.annotate(
+        growth_duration_days=DaysBetween(today, 'transplant_date'),
+        days_in_current_stage=Case(
+            When(stage_start_date__isnull=True, then=Value(0)),
+            default=DaysBetween(Coalesce('stage_end_date', today), 'stage_start_date'),
+        ),
+        days_to_harvest=DaysBetween('expected_harvest_date', today),
+        is_overdue=Case(When(overdue_crops(today), then=Value(True)), default=Value(False), output_field=BooleanField()),
+    )
+
+
+# ?ordering= keys for crop stage lists -> (column, reversed). The day counts
+# sort on the indexed date they are derived from.
+CROP_STAGE_ORDERING = {
+    'days_to_harvest': ('expected_harvest_date', False),
+    'growth_duration_days': ('transplant_date', True),
+    'days_in_current_stage': ('days_in_current_stage', False),
+    'expected_harvest_date': ('expected_harvest_date', False),
+    'transplant_date': ('transplant_date', False),
+    'crop_name': ('crop_name', False),
+    'created_at': ('created_at', False),
+}
+
+
+def crop_stage_ordering(ordering):
+    """
+    Sort key (see pagination.keyset_page) for an ?ordering= value such as
+    "days_to_harvest" or "-created_at"; missing values sort last. Raises
+    ValueError for unknown keys.
+    """
+    descending = ordering.startswith('-')
+    key = ordering.lstrip('-')
+    if key not in CROP_STAGE_ORDERING:
+        raise ValueError(f"Unknown ordering '{key}'; use one of: {', '.join(CROP_STAGE_ORDERING)}")
+    column, reverse = CROP_STAGE_ORDERING[key]
+    return f'-{column}' if descending != reverse else column
+
+
+def with_phi_violations(spray_schedules):
+    """
+    Annotate sprays with `harvested_in_phi` / `sold_in_phi`: whether
+    a crop on the same farm was harvested, or produce from it sold, before
+    completion_date + phi_log days. A crop matches through the spray's
+    crop_stage or when its farm_section/batch_code equals the spray's
+    crop_zone; a sale matches on batch_code. Both checks are EXISTS
+    subqueries, so the whole audit is one SQL statement. Sprays without a
+    completion_date never match.
+    """
+    spray_schedules = spray_schedules.annotate(
+        sprayed_on=TruncDate('completion_date'),
+        phi_end=AddDays(TruncDate('completion_date'), F('phi_log')),
+    )
+
+    harvests = CropStage.objects.filter(
+        farm_id=OuterRef('farm_id'),
+        actual_harvest_date__gte=OuterRef('sprayed_on'),
+        actual_harvest_date__lt=OuterRef('phi_end'),
+    ).filter(
+        Q(id=OuterRef('crop_stage_id'))
+        | Q(farm_section=OuterRef('crop_zone'))
+        | Q(batch_code=OuterRef('crop_zone'))
+    )
+    sales = Sale.objects.filter(
+        farm_id=OuterRef('farm_id'),
+        sale_date__gte=OuterRef('sprayed_on'),
+        sale_date__lt=OuterRef('phi_end'),
+    ).filter(
+        Q(batch_code=OuterRef('crop_stage__batch_code'))
+        | Q(batch_code=OuterRef('crop_zone'))
+    )
+    return spray_schedules.annotate(
+        harvested_in_phi=Exists(harvests),
+        sold_in_phi=Exists(sales),
+    )
+
+
+def spray_summary(spray_schedules, start_date, now, trend_start, violation_limit=50):
+    """
+    Spray schedule counters, PHI violations and a monthly trend. The
+    counters are one conditional aggregate, the violations one EXISTS
+    query and the trend one GROUP BY month over the last months from
+    trend_start.
+    """
+    in_period = Q(date_time__gte=start_date)
+    reason_counts = {
+        code: Count('id', filter=in_period & Q(reason=code))
+        for code, _ in SpraySchedule.REASON_CHOICES
+    }
+    counters = spray_schedules.order_by().aggregate(
+        total_schedules=Count('id', filter=in_period),
+        completed_schedules=Count('id', filter=in_period & Q(is_completed=True)),
+        pending_schedules=Count('id', filter=in_period & Q(is_completed=False)),
+        overdue_reminders=Count('id', filter=Q(
+            next_spray_reminder__lt=now,
+            next_spray_reminder__isnull=False,
+            is_completed=False
+        )),
+        **reason_counts
+    )
+
+    violated = Q(is_completed=True) & (Q(harvested_in_phi=True) | Q(sold_in_phi=True))
+    violations = list(
+        with_phi_violations(spray_schedules.filter(in_period)).filter(violated).values(
+            'id', 'spray_id', 'farm_id', 'crop_zone', 'product_used', 'phi_log',
+            'sprayed_on', 'phi_end', 'harvested_in_phi', 'sold_in_phi',
+        ).order_by('-completion_date')
+    )
+
+    monthly_rows = with_phi_violations(
+        spray_schedules.filter(date_time__gte=trend_start)
+    ).order_by().annotate(
+        month=TruncMonth('date_time')
+    ).values('month').annotate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(is_completed=True)),
+        phi_violations=Count('id', filter=violated),
+        **{code: Count('id', filter=Q(reason=code)) for code, _ in SpraySchedule.REASON_CHOICES}
+    ).order_by('month')
+
+    return {
+        'total_schedules': counters['total_schedules'],
+        'completed_schedules': counters['completed_schedules'],
+        'pending_schedules': counters['pending_schedules'],
+        'overdue_reminders': counters['overdue_reminders'],
+        'phi_violations': len(violations),
+        'phi_violation_details': violations[:violation_limit],
+        'reason_breakdown': {code: counters[code] for code, _ in SpraySchedule.REASON_CHOICES},
+        'monthly_trend': [
+            {**row, 'month': row['month'].strftime('%Y-%m')}
+            for row in monthly_rows
+        ],
+    }
+
+
+# Bases for spreading farm-level costs over crop batches: name -> CropStage field
+ALLOCATION_BASES = {
+    'area': 'area',
+    'plants': 'number_of_plants',
+}
+
+
+def _margin(row):
+    row['net_margin'] = (
+        row['revenue'] - row['selling_costs'] - row['direct_costs'] - row.get('allocated_costs', ZERO)
+    )
+    row['margin_pct'] = round(float(row['net_margin'] / row['revenue'] * 100), 2) if row['revenue'] else None
+    return row
+
+
+def profit_and_loss(sales, expenditures, crop_stages, basis='area'):
+    """
+    Net margin per farm, crop and batch.
+
+    Revenue and selling costs (transportation, commission) come from one
+    GROUP BY farm, batch, crop over `sales`; costs from one GROUP BY farm,
+    batch over `expenditures`, where expenditures without a batch_code are
+    farm-level overhead. Overhead is spread over `crop_stages` in the
+    database: each batch's share is its area (or plant count) divided by a
+    SUM() OVER (PARTITION BY farm) window, times the farm's unbatched spend
+    from a correlated subquery. Overhead of farms without a weighted batch
+    stays unallocated on the farm row.
+    """
+    weight_field = ALLOCATION_BASES[basis]
+
+    sale_rows = sales.order_by().values('farm_id', 'farm__name', 'batch_code', 'crop_name').annotate(
+        revenue=Sum('total_amount'),
+        transportation=Sum('transportation_cost'),
+        commission=Sum('commission_amount'),
+    )
+    cost_rows = expenditures.order_by().values('farm_id', 'farm__name', 'batch_code').annotate(amount=Sum('amount'))
+
+    unbatched = Q(batch_code__isnull=True) | Q(batch_code='')
+    farm_overhead = expenditures.order_by().filter(unbatched, farm_id=OuterRef('farm_id')).values('farm_id').annotate(
+        total=Sum('amount')
+    ).values('total')
+    allocation_rows = crop_stages.order_by().filter(**{f'{weight_field}__gt': 0}).annotate(
+        weight=Cast(weight_field, FloatField()),
+        farm_weight=Window(Sum(Cast(weight_field, FloatField())), partition_by=[F('farm_id')]),
+        overhead=Cast(Coalesce(Subquery(farm_overhead), 0), FloatField()),
+    ).annotate(
+        allocated=ExpressionWrapper(F('overhead') * F('weight') / F('farm_weight'), output_field=FloatField()),
+    ).values('farm_id', 'farm__name', 'batch_code', 'crop_name', 'allocated')
+
+    def empty_row(**keys):
+        return {**keys, 'revenue': ZERO, 'selling_costs': ZERO, 'direct_costs': ZERO}
+
+    farms = {}
+    batches = {}
+
+    def farm_row(farm_id, farm_name):
+        if farm_id not in farms:
+            farms[farm_id] = {**empty_row(farm_id=farm_id, farm_name=farm_name), 'overhead_costs': ZERO, 'allocated_costs': ZERO}
+        return farms[farm_id]
+
+    def batch_row(farm_id, batch_code, crop_name=None):
+        key = (farm_id, batch_code)
+        if key not in batches:
+            batches[key] = {**empty_row(farm_id=farm_id, batch_code=batch_code, crop_name=crop_name), 'allocated_costs': ZERO}
+        elif crop_name and not batches[key]['crop_name']:
+            batches[key]['crop_name'] = crop_name
+        return batches[key]
+
+    for row in sale_rows:
+        selling_costs = (row['transportation'] or ZERO) + (row['commission'] or ZERO)
+        for target in (farm_row(row['farm_id'], row['farm__name']), batch_row(row['farm_id'], row['batch_code'], row['crop_name'])):
+            target['revenue'] += row['revenue'] or ZERO
+            target['selling_costs'] += selling_costs
+
+    for row in cost_rows:
+        farm = farm_row(row['farm_id'], row['farm__name'])
+        if row['batch_code']:
+            farm['direct_costs'] += row['amount']
+            batch_row(row['farm_id'], row['batch_code'])['direct_costs'] += row['amount']
+        else:
+            farm['overhead_costs'] += row['amount']
+
+    for row in allocation_rows:
+        allocated = Decimal(row['allocated']).quantize(CENTS)
+        if not allocated:
+            continue
+        farm_row(row['farm_id'], row['farm__name'])['allocated_costs'] += allocated
+        batch_row(row['farm_id'], row['batch_code'], row['crop_name'])['allocated_costs'] += allocated
+
+    crops = {}
+    for batch in batches.values():
+        crop = crops.setdefault(batch['crop_name'], {**empty_row(crop_name=batch['crop_name']), 'allocated_costs': ZERO})
+        for field in ('revenue', 'selling_costs', 'direct_costs', 'allocated_costs'):
+            crop[field] += batch[field]
+
+    for farm in farms.values():
+        farm['unallocated_costs'] = farm['overhead_costs'] - farm['allocated_costs']
+        # A farm's margin carries all of its overhead, allocated or not
+        farm['net_margin'] = farm['revenue'] - farm['selling_costs'] - farm['direct_costs'] - farm['overhead_costs']
+        farm['margin_pct'] = round(float(farm['net_margin'] / farm['revenue'] * 100), 2) if farm['revenue'] else None
+
+    totals = empty_row()
+    for field in ('revenue', 'selling_costs', 'direct_costs', 'overhead_costs', 'allocated_costs', 'unallocated_costs'):
+        totals[field] = sum((farm[field] for farm in farms.values()), ZERO)
+    totals['net_margin'] = totals['revenue'] - totals['selling_costs'] - totals['direct_costs'] - totals['overhead_costs']
+    totals['margin_pct'] = round(float(totals['net_margin'] / totals['revenue'] * 100), 2) if totals['revenue'] else None
+
+    def by_margin(rows):
+        return sorted(rows, key=lambda row: row['net_margin'], reverse=True)
+
+    return {
+        'allocation_basis': basis,
+        'totals': totals,
+        'farms': by_margin(farms.values()),
+        'crops': by_margin(_margin(crop) for crop in crops.values()),
+        'batches': by_margin(_margin(batch) for batch in batches.values()),
+    }
+
+
+def _rate(part, whole):
+    return round(part / whole * 100, 2) if whole else 0
+
+
+def labor_summary(worker_tasks, expenditures, worker_limit=100):
+    """
+    Worker-days, labor cost, completion and issue rates per worker, farm and
+    month, reconciled against `labor` expenditures.
+
+    A worker-day is a distinct (worker, assigned_date), so several tasks on
+    one day are paid once; cost is worker-days x the worker's current
+    wage_per_day. Everything comes from one GROUP BY worker, month over
+    worker tasks (rolled up in Python) and one GROUP BY farm, month over
+    the labor expenditures.
+    """
+    rows = list(
+        worker_tasks.filter(worker__isnull=False).order_by().annotate(
+            month=TruncMonth('assigned_date')
+        ).values(
+            'worker_id', 'worker__name', 'worker__employment_type', 'worker__wage_per_day',
+            'worker__farm_id', 'worker__farm__name', 'month',
+        ).annotate(
+            worker_days=Count('assigned_date', distinct=True),
+            tasks=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+            issues=Count('id', filter=Q(status='issue')),
+        )
+    )
+    expense_rows = expenditures.filter(category='labor').order_by().annotate(
+        month=TruncMonth('expense_date')
+    ).values('farm_id', 'farm__name', 'month').annotate(amount=Sum('amount'))
+
+    def empty():
+        return {'worker_days': 0, 'tasks': 0, 'completed': 0, 'issues': 0, 'labor_cost': ZERO}
+
+    def add(target, row, cost):
+        target['worker_days'] += row['worker_days']
+        target['tasks'] += row['tasks']
+        target['completed'] += row['completed']
+        target['issues'] += row['issues']
+        target['labor_cost'] += cost
+        return target
+
+    workers, farms, months, employment = {}, {}, {}, {}
+    farm_months = {}
+    for row in rows:
+        cost = row['worker__wage_per_day'] * row['worker_days']
+        add(workers.setdefault(row['worker_id'], {
+            'worker_id': row['worker_id'],
+            'name': row['worker__name'],
+            'employment_type': row['worker__employment_type'],
+            'wage_per_day': row['worker__wage_per_day'],
+            'farm_id': row['worker__farm_id'],
+            **empty(),
+        }), row, cost)
+        add(farms.setdefault(row['worker__farm_id'], {
+            'farm_id': row['worker__farm_id'], 'farm_name': row['worker__farm__name'], 'workers': 0, **empty(),
+        }), row, cost)
+        add(months.setdefault(row['month'], {'month': row['month'].strftime('%Y-%m'), **empty()}), row, cost)
+        add(employment.setdefault(row['worker__employment_type'], {'workers': 0, **empty()}), row, cost)
+        cell = farm_months.setdefault((row['worker__farm_id'], row['month']), {
+            'farm_id': row['worker__farm_id'], 'farm_name': row['worker__farm__name'], 'computed_cost': ZERO,
+        })
+        cell['computed_cost'] += cost
+
+    for worker in workers.values():
+        farms[worker['farm_id']]['workers'] += 1
+        employment[worker['employment_type']]['workers'] += 1
+
+    for row in expense_rows:
+        cell = farm_months.setdefault((row['farm_id'], row['month']), {
+            'farm_id': row['farm_id'], 'farm_name': row['farm__name'], 'computed_cost': ZERO,
+        })
+        cell['recorded_expense'] = row['amount']
+
+    def with_rates(row):
+        row['completion_rate'] = _rate(row['completed'], row['tasks'])
+        row['issue_rate'] = _rate(row['issues'], row['tasks'])
+        return row
+
+    reconciliation = []
+    for (farm_id, month), cell in sorted(farm_months.items(), key=lambda item: (item[0][1], item[0][0])):
+        recorded = cell.get('recorded_expense', ZERO)
+        reconciliation.append({
+            'farm_id': farm_id,
+            'farm_name': cell['farm_name'],
+            'month': month.strftime('%Y-%m'),
+            'computed_cost': cell['computed_cost'],
+            'recorded_expense': recorded,
+            'variance': recorded - cell['computed_cost'],
+        })
+
+    total = empty()
+    for farm in farms.values():
+        for field in total:
+            total[field] += farm[field]
+    total_recorded = sum((row['recorded_expense'] for row in reconciliation), ZERO)
+
+    return {
+        'totals': {
+            **with_rates(total),
+            'workers': len(workers),
+            'recorded_labor_expense': total_recorded,
+            'variance': total_recorded - total['labor_cost'],
+        },
+        'employment_types': {code: with_rates(row) for code, row in employment.items()},
+        'farms': sorted((with_rates(row) for row in farms.values()), key=lambda row: row['labor_cost'], reverse=True),
+        'months': [with_rates(months[month]) for month in sorted(months)],
+        'workers': sorted(
+            (with_rates(row) for row in workers.values()),
+            key=lambda row: (row['labor_cost'], row['worker_days']), reverse=True
+        )[:worker_limit],
+        'reconciliation': reconciliation,
+    }
@@ -2,4 +2,9 @@ from django.apps import AppConfig
 
 class FarmsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'farms'
\ No newline at end of file
+    name = 'farms'
+
+    def ready(self):
+        # Register the KPI snapshot, monthly facts and crop alert signal handlers,
+        # and the system check that every list projection can be built
+        from . import alerts, facts, kpis, projections  # noqa: F401
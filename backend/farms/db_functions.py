@@ -0,0 +1,54 @@
+from django.db.models import DateField, Func, IntegerField
+
+
+class AddDays(Func):
+    """
+    date + integer number of days, evaluated in the database. Both
+    arguments may be expressions, e.g. AddDays(TruncDate('completion_date'),
+    F('phi_log')).
+    """
+    arg_joiner = ' + '
+    template = '(%(expressions)s)'
+    output_field = DateField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template="date(%(expressions)s || ' days')",
+            arg_joiner=", '+' || ",
+            **extra_context
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='DATE_ADD(%(expressions)s DAY)',
+            arg_joiner=', INTERVAL ',
+            **extra_context
+        )
+
+
+class DaysBetween(Func):
+    """
+    DaysBetween(end, start): whole days from one date expression to
+    another, evaluated in the database; NULL if either is NULL.
+    """
+    arg_joiner = ' - '
+    template = '(%(expressions)s)'
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='CAST(julianday(%(expressions)s) AS INTEGER)',
+            arg_joiner=') - julianday(',
+            **extra_context
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='DATEDIFF(%(expressions)s)',
+            arg_joiner=', ',
+            **extra_context
+        )
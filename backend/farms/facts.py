@@ -0,0 +1,234 @@
+import logging
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+from .models import (
+    CropStage, Expenditure, Farm, FarmMonthlyFacts, FarmTask, Fertigation, IssueReport, Sale, SpraySchedule,
+)
+
+logger = logging.getLogger(__name__)
+
+# model, date field that decides the month, rows counted, FarmMonthlyFacts field -> aggregate
+FactSource = namedtuple('FactSource', 'model date_field condition metrics')
+
+FACT_SOURCES = [
+    FactSource(Sale, 'sale_date', Q(), {
+        'sales_amount': Sum('total_amount'),
+        'sales_count': Count('id'),
+    }),
+    FactSource(Expenditure, 'expense_date', Q(), {
+        'expense_amount': Sum('amount'),
+    }),
+    FactSource(Fertigation, 'date_time', Q(status='completed'), {
+        'water_volume': Sum('water_volume'),
+        'fertigations': Count('id'),
+    }),
+    FactSource(SpraySchedule, 'date_time', Q(), {
+        'sprays': Count('id'),
+    }),
+    FactSource(FarmTask, 'completed_at', Q(status='completed'), {
+        'tasks_completed': Count('id'),
+    }),
+    FactSource(IssueReport, 'created_at', Q(), {
+        'issues_opened': Count('id'),
+    }),
+    # There is no resolved timestamp; the last update of a resolved issue stands in for it
+    FactSource(IssueReport, 'updated_at', Q(status='resolved'), {
+        'issues_resolved': Count('id'),
+    }),
+    FactSource(CropStage, 'actual_harvest_date', Q(), {
+        'yield_amount': Sum('actual_yield'),
+    }),
+]
+
+FACT_METRICS = [name for source in FACT_SOURCES for name in source.metrics]
+
+SOURCE_MODELS = {source.model for source in FACT_SOURCES}
+
+
+def _month(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    return value.replace(day=1)
+
+
+def _cells(instance):
+    """(farm_id, month) cells an instance contributes to, one per source of its model."""
+    if instance.farm_id is None:
+        return set()
+    # Views may assign the raw request string; to_python() reads it as the database will store it
+    dates = {
+        source.date_field: instance._meta.get_field(source.date_field).to_python(getattr(instance, source.date_field))
+        for source in FACT_SOURCES
+        if source.model is type(instance)
+    }
+    return {(instance.farm_id, _month(value)) for value in dates.values() if value is not None}
+
+
+def refresh_cell(model, farm_id, month):
+    """Recompute the metrics `model` feeds for one farm and month."""
+    values = {}
+    for source in FACT_SOURCES:
+        if source.model is not model:
+            continue
+        in_month = {f'{source.date_field}__year': month.year, f'{source.date_field}__month': month.month}
+        totals = model.objects.filter(source.condition, farm_id=farm_id, **in_month).aggregate(**source.metrics)
+        values.update({name: value or 0 for name, value in totals.items()})
+    updated = FarmMonthlyFacts.objects.filter(farm_id=farm_id, month=month).update(updated_at=timezone.now(), **values)
+    # Nothing to record for an empty cell, and its farm may be gone
+    if not updated and any(values.values()):
+        FarmMonthlyFacts.objects.get_or_create(farm_id=farm_id, month=month, defaults=values)
+
+
+def _refresh_after_commit(model, cells):
+    def refresh():
+        for farm_id, month in cells:
+            refresh_cell(model, farm_id, month)
+    if cells:
+        transaction.on_commit(refresh)
+
+
+def remember_fact_cells(sender, instance, raw=False, **kwargs):
+    # An edit can move a row to another month or farm; the old cell needs a refresh too
+    if raw or instance.pk is None:
+        return
+    previous = sender.objects.filter(pk=instance.pk).first()
+    instance._previous_fact_cells = _cells(previous) if previous else set()
+
+
+def update_facts_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_after_commit(sender, _cells(instance) | getattr(instance, '_previous_fact_cells', set()))
+
+
+def update_facts_on_delete(sender, instance, origin=None, **kwargs):
+    # Facts go with the farm when a whole farm is deleted
+    if isinstance(origin, Farm) or getattr(origin, 'model', None) is Farm:
+        return
+    if origin is None or origin is instance:
+        _refresh_after_commit(sender, _cells(instance))
+        return
+    # A queryset delete or a cascade (e.g. from a user) removes many rows in one
+    # delete() call; their farms are reconciled once, not a cell per row
+    farm_ids = getattr(origin, '_fact_farm_ids', None)
+    if farm_ids is None:
+        farm_ids = origin._fact_farm_ids = set()
+        transaction.on_commit(lambda: reconcile_monthly_facts(farm_ids, log_drift=False))
+    if instance.farm_id is not None:
+        farm_ids.add(instance.farm_id)
+
+
+# Connected per model so deletes of other models keep Django's fast-delete path
+for _model in SOURCE_MODELS:
+    pre_save.connect(remember_fact_cells, sender=_model, dispatch_uid=f'facts_pre_save_{_model.__name__}')
+    post_save.connect(update_facts_on_save, sender=_model, dispatch_uid=f'facts_post_save_{_model.__name__}')
+    post_delete.connect(update_facts_on_delete, sender=_model, dispatch_uid=f'facts_post_delete_{_model.__name__}')
+
+
+def reconcile_monthly_facts(farm_ids=None, log_drift=True):
+    """
+    Rebuild FarmMonthlyFacts from the source tables with one GROUP BY
+    farm, month query per source, and write only the cells that drifted.
+    Returns the number of rows created, updated and deleted.
+    """
+    expected = {}
+    for source in FACT_SOURCES:
+        rows = source.model.objects.filter(
+            source.condition, farm_id__isnull=False, **{f'{source.date_field}__isnull': False}
+        )
+        if farm_ids is not None:
+            rows = rows.filter(farm_id__in=farm_ids)
+        rows = rows.order_by().annotate(fact_month=TruncMonth(source.date_field)).values(
+            'farm_id', 'fact_month'
+        ).annotate(**source.metrics)
+        for row in rows:
+            cell = expected.setdefault((row['farm_id'], _month(row['fact_month'])), {})
+            cell.update({name: row[name] or 0 for name in source.metrics})
+
+    existing = FarmMonthlyFacts.objects.all()
+    if farm_ids is not None:
+        existing = existing.filter(farm_id__in=farm_ids)
+
+    to_update, stale = [], []
+    for facts in existing:
+        values = expected.pop((facts.farm_id, facts.month), None)
+        if values is None:
+            # refresh_cell() leaves a zero row behind when a cell empties; it adds nothing to any total
+            if any(getattr(facts, name) for name in FACT_METRICS):
+                stale.append(facts.pk)
+            continue
+        changed = False
+        for name in FACT_METRICS:
+            value = values.get(name, 0)
+            if Decimal(getattr(facts, name)) != Decimal(value):
+                setattr(facts, name, value)
+                changed = True
+        if changed:
+            facts.updated_at = timezone.now()
+            to_update.append(facts)
+
+    to_create = [
+        FarmMonthlyFacts(farm_id=farm_id, month=month, **values)
+        for (farm_id, month), values in expected.items()
+    ]
+
+    with transaction.atomic():
+        FarmMonthlyFacts.objects.filter(pk__in=stale).delete()
+        FarmMonthlyFacts.objects.bulk_update(to_update, FACT_METRICS + ['updated_at'], batch_size=500)
+        FarmMonthlyFacts.objects.bulk_create(to_create, batch_size=500)
+
+    if log_drift and (to_create or to_update or stale):
+        logger.warning(
+            f"Monthly facts drifted: {len(to_create)} created, {len(to_update)} updated, {len(stale)} deleted"
+        )
+    return {'created': len(to_create), 'updated': len(to_update), 'deleted': len(stale)}
+
+
+
+# Rankable metrics: every fact plus margins derived from them
+PORTFOLIO_METRICS = FACT_METRICS + ['net_amount']
+
+
+def portfolio(farms, date_from=None, date_to=None, metric='sales_amount', descending=True, bounds=None, limit=50, offset=0):
+    """
+    Farms ranked by `metric` summed over the months in range, as one
+    GROUP BY farm over FarmMonthlyFacts. `bounds` maps metric -> (min, max),
+    either side None, and becomes a HAVING clause.
+    """
+    facts = FarmMonthlyFacts.objects.filter(farm__in=farms)
+    if date_from:
+        facts = facts.filter(month__gte=date_from.replace(day=1))
+    if date_to:
+        facts = facts.filter(month__lte=date_to)
+
+    totals = {f'total_{name}': Sum(name) for name in FACT_METRICS}
+    totals['total_net_amount'] = Sum('sales_amount') - Sum('expense_amount')
+    rows = facts.order_by().values('farm_id', 'farm__name', 'farm__location').annotate(
+        months=Count('id'), **totals
+    )
+
+    for name, (low, high) in (bounds or {}).items():
+        if low is not None:
+            rows = rows.filter(**{f'total_{name}__gte': low})
+        if high is not None:
+            rows = rows.filter(**{f'total_{name}__lte': high})
+
+    ordering = f'-total_{metric}' if descending else f'total_{metric}'
+    return [
+        {
+            'farm_id': row['farm_id'],
+            'farm_name': row['farm__name'],
+            'location': row['farm__location'],
+            'months': row['months'],
+            **{name: row[f'total_{name}'] or 0 for name in PORTFOLIO_METRICS},
+        }
+        for row in rows.order_by(ordering, 'farm_id')[offset:offset + limit]
+    ]
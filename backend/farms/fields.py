@@ -0,0 +1,120 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+class SparseFieldsetMixin:
+    """
+    Field selection for list serializers (?fields=, ?omit=, ?expand=).
+
+    Meta.expandable_fields maps an ?expand= name to fields that are left
+    out unless it is requested. Meta.field_sources maps computed fields to
+    the lookups they read, so a selection made only of known fields loads
+    only those columns.
+    """
+    
+    def __init__(self, *args, selected_fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if selected_fields is None:
+            # Expandable fields are opt-in wherever the serializer is used
+            expandable = getattr(self.Meta, 'expandable_fields', {})
+            selected_fields = [name for name in self.fields
+                               if not any(name in names for names in expandable.values())]
+        for name in [name for name in self.fields if name not in selected_fields]:
+            self.fields.pop(name)
+    
+    @classmethod
+    def readable_fields(cls):
+        """Every readable field, expandable ones included"""
+        serializer, fields = cls(), {}
+        for name, field in serializer.get_fields().items():
+            field.bind(name, serializer)
+            if not field.write_only:
+                fields[name] = field
+        return fields
+    
+    @classmethod
+    def select_fields(cls, fields=(), omit=(), expand=()):
+        """Names of the fields to render, in serializer order; raises ValueError for unknown names"""
+        available = cls.readable_fields()
+        expandable = getattr(cls.Meta, 'expandable_fields', {})
+        checks = (('fields', fields, available), ('omit', omit, available), ('expand', expand, expandable))
+        for param, names, known in checks:
+            unknown = [name for name in names if name not in known]
+            if unknown:
+                raise ValueError(f"Unknown {param}: {', '.join(unknown)}")
+        if fields:
+            return [name for name in available if name in fields and name not in omit]
+        hidden = {name for key, names in expandable.items() if key not in expand for name in names}
+        return [name for name in available if name not in hidden and name not in omit]
+    
+    @classmethod
+    def field_lookups(cls, selected, annotations=()):
+        """Model lookups read by the selected fields, or None when some field reads undeclared attributes"""
+        sources = getattr(cls.Meta, 'field_sources', {})
+        opts = cls.Meta.model._meta
+        fields = cls.readable_fields()
+        lookups = []
+        for name in selected:
+            source = fields[name].source
+            if name in sources:
+                lookups.extend(sources[name])
+            elif isinstance(fields[name], serializers.BaseSerializer):
+                # Nested serializers read whole related rows
+                return None
+            elif source in annotations:
+                continue
+            elif source.startswith('get_') and source.endswith('_display'):
+                lookups.append(source[4:-8])
+            elif '.' in source:
+                lookups.append(source.replace('.', '__'))
+            else:
+                try:
+                    model_field = opts.get_field(source)
+                except FieldDoesNotExist:
+                    return None
+                if not (model_field.many_to_many or model_field.one_to_many):
+                    lookups.append(source)
+        return list(dict.fromkeys(lookups))
+    
+    @classmethod
+    def restrict_queryset(cls, queryset, selected):
+        """Follow only the relations and load only the columns the selected fields read"""
+        lookups = cls.field_lookups(selected, queryset.query.annotations)
+        if lookups is None:
+            return queryset
+        relations = {lookup.rsplit('__', 1)[0] for lookup in lookups if '__' in lookup}
+        return queryset.select_related(None).select_related(*relations).only(*lookups)
+    
+    @classmethod
+    def eager_queryset(cls, queryset, selected):
+        setup = getattr(cls, 'setup_eager_loading', None)
+        if setup is not None:
+            queryset = setup(queryset)
+        return cls.restrict_queryset(queryset, selected)
+
+
+def field_params(request):
+    """Comma-separated ?fields=, ?omit= and ?expand= as lists of names"""
+    return {
+        key: [name.strip() for name in request.query_params.get(key, '').split(',') if name.strip()]
+        for key in ('fields', 'omit', 'expand')
+    }
+
+
+def selected_fields(request, serializer_class):
+    """Fields picked by ?fields=, ?omit= and ?expand=; ValueError for unknown names"""
+    return serializer_class.select_fields(**field_params(request))
+
+
+def selected_keys(request, keys):
+    """
+    ?fields= and ?omit= for lists built as dicts rather than through a
+    serializer: the picked keys, in order. ValueError for unknown names;
+    these lists have nothing to ?expand=
+    """
+    params = field_params(request)
+    for param, names in params.items():
+        unknown = [name for name in names if param == 'expand' or name not in keys]
+        if unknown:
+            raise ValueError(f"Unknown {param}: {', '.join(unknown)}")
+    return [key for key in keys if (not params['fields'] or key in params['fields']) and key not in params['omit']]
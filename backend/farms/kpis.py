@@ -0,0 +1,156 @@
+import time
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import CropStage, DailyTask, FarmTask, Worker, WorkerTask
+
+# Snapshots also expire on their own; the date in the key rolls them over at midnight
+SNAPSHOT_TIMEOUT = 60 * 60
+
+# A version bump only reaches the processes that share the cache. With a
+# per-process cache a bump made in a Celery worker or another server process
+# is invisible here, so snapshots there must expire within seconds instead.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+LOCAL_SNAPSHOT_TIMEOUT = 15
+
+
+def snapshot_timeout():
+    if settings.CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHES:
+        return LOCAL_SNAPSHOT_TIMEOUT
+    return SNAPSHOT_TIMEOUT
+
+
+def _sources(today):
+    """source name -> (queryset, conditional aggregates counted per farm and user)"""
+    active = Q(status__in=['pending', 'in_progress'])
+    return {
+        'farm_tasks': (FarmTask.objects.all(), {
+            'total': Count('id'),
+            'pending': Count('id', filter=Q(status='pending')),
+            'in_progress': Count('id', filter=Q(status='in_progress')),
+            'completed': Count('id', filter=Q(status='completed')),
+            'overdue': Count('id', filter=active & Q(due_date__lt=today)),
+            'high_priority_active': Count('id', filter=active & Q(priority='high')),
+            'medium_priority_active': Count('id', filter=active & Q(priority='medium')),
+            'low_priority_active': Count('id', filter=active & Q(priority='low')),
+            'due_this_week': Count('id', filter=active & Q(due_date__gte=today, due_date__lte=today + timedelta(days=7))),
+        }),
+        'worker_tasks': (WorkerTask.objects.all(), {
+            'total': Count('id'),
+            'today_assigned': Count('id', filter=Q(assigned_date=today)),
+            'today_completed': Count('id', filter=Q(assigned_date=today, status='completed')),
+            'pending': Count('id', filter=Q(status='pending')),
+            'completed': Count('id', filter=Q(status='completed')),
+            'issue': Count('id', filter=Q(status='issue')),
+        }),
+        'workers': (Worker.objects.all(), {
+            'total': Count('id'),
+        }),
+        'daily_tasks': (DailyTask.objects.all(), {
+            'today': Count('id', filter=Q(date=today)),
+            'this_month': Count('id', filter=Q(date__year=today.year, date__month=today.month)),
+        }),
+        'crop_stages': (CropStage.objects.all(), {
+            'total': Count('id'),
+            'healthy': Count('id', filter=Q(health_status='healthy')),
+            'needs_attention': Count('id', filter=Q(health_status='needs_attention')),
+        }),
+    }
+
+
+def _version_key(farm_id):
+    return f'farm_kpis_version:{farm_id}'
+
+
+def bump_kpi_version(farm_id):
+    """Invalidate the cached snapshot of a farm (None for farm-less worker tasks)."""
+    key = _version_key(farm_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Version was evicted; start from the clock so old snapshots are never reused
+        cache.set(key, time.time_ns(), None)
+
+
+def _compute(farm_ids, today):
+    """Snapshots for several farms with one GROUP BY farm, user query per source."""
+    snapshots = {farm_id: {} for farm_id in farm_ids}
+    in_farms = Q(farm_id__in=[farm_id for farm_id in farm_ids if farm_id is not None])
+    if None in farm_ids:
+        in_farms |= Q(farm_id__isnull=True)
+
+    for source, (queryset, aggregates) in _sources(today).items():
+        for snapshot in snapshots.values():
+            snapshot[source] = {}
+        rows = queryset.filter(in_farms).order_by().values('farm_id', 'user_id').annotate(**aggregates)
+        for row in rows:
+            farm_id = row.pop('farm_id')
+            snapshots[farm_id][source][row.pop('user_id')] = row
+    return snapshots
+
+
+def farm_kpi_snapshots(farm_ids):
+    """
+    {farm_id: {source: {user_id: counters}}}, served from the cache. Each
+    farm's snapshot is stored under its current version, which signals bump
+    whenever one of the source rows is saved or deleted; misses for all
+    farms are computed together.
+    """
+    farm_ids = list(dict.fromkeys(farm_ids))
+    today = date.today()
+
+    version_keys = {farm_id: _version_key(farm_id) for farm_id in farm_ids}
+    versions = cache.get_many(version_keys.values())
+    for farm_id, key in version_keys.items():
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+
+    snapshot_keys = {
+        farm_id: f'farm_kpis:{farm_id}:{today.isoformat()}:v{versions[key]}'
+        for farm_id, key in version_keys.items()
+    }
+    cached = cache.get_many(snapshot_keys.values())
+    snapshots = {
+        farm_id: cached[key] for farm_id, key in snapshot_keys.items() if key in cached
+    }
+
+    missing = [farm_id for farm_id in farm_ids if farm_id not in snapshots]
+    if missing:
+        computed = _compute(missing, today)
+        cache.set_many({snapshot_keys[farm_id]: computed[farm_id] for farm_id in missing}, snapshot_timeout())
+        snapshots.update(computed)
+    return snapshots
+
+
+def user_kpis(user, farm_ids):
+    """A user's counters per source, added up over the given farms."""
+    totals = {
+        source: dict.fromkeys(aggregates, 0)
+        for source, (_, aggregates) in _sources(date.today()).items()
+    }
+    for snapshot in farm_kpi_snapshots(farm_ids).values():
+        for source, by_user in snapshot.items():
+            for name, value in by_user.get(user.id, {}).items():
+                totals[source][name] += value
+    return totals
+
+
+@receiver(post_save, sender=FarmTask)
+@receiver(post_delete, sender=FarmTask)
+@receiver(post_save, sender=WorkerTask)
+@receiver(post_delete, sender=WorkerTask)
+@receiver(post_save, sender=Worker)
+@receiver(post_delete, sender=Worker)
+@receiver(post_save, sender=DailyTask)
+@receiver(post_delete, sender=DailyTask)
+@receiver(post_save, sender=CropStage)
+@receiver(post_delete, sender=CropStage)
+def invalidate_farm_kpis(sender, instance, **kwargs):
+    bump_kpi_version(instance.farm_id)
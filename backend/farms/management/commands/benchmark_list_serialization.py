@@ -0,0 +1,161 @@
+import json
+import time
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from farm_management.renderers import ORJSONRenderer
+from farms.models import (
+    CropStage, DailyTask, Farm, Fertigation, Notification, NotificationRecipient, Sale, SprayIrrigationLog,
+)
+from farms.notifications import notifications_for
+from farms.projections import CROP_STAGE_LIST, DAILY_TASK_LIST, FERTIGATION_LIST, NOTIFICATION_LIST, SALE_LIST
+from farms.serializers import (
+    CropStageSerializer, DailyTaskSerializer, FertigationSerializer, NotificationSerializer, SaleSerializer,
+)
+from farms.streaming import json_array
+
+User = get_user_model()
+
+
+class RolledBack(Exception):
+    pass
+
+
+def _eager(serializer_class, queryset):
+    setup = getattr(serializer_class, 'setup_eager_loading', None)
+    return setup(queryset) if setup else queryset
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare rows/second of the ModelSerializer + JSONRenderer list path with the values() '
+        'projection + orjson path on the hot list endpoints, and check both (and the streamed '
+        'projection) render the same JSON. '
+        'Fixture data is created inside a transaction that is always rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=2000,
+            help='Rows of each kind in the fixture (default: 2000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per path; the fastest is reported (default: 3)',
+        )
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        if rows < 1 or repeat < 1:
+            raise CommandError('--rows and --repeat must be positive')
+
+        mismatches = []
+        try:
+            with transaction.atomic():
+                user = self.seed(rows)
+                cases = [
+                    ('notifications', NotificationSerializer, NOTIFICATION_LIST,
+                     notifications_for(user).select_related('farm', 'user').order_by('-created_at')),
+                    ('daily tasks', DailyTaskSerializer, DAILY_TASK_LIST, DailyTask.objects.filter(user=user)),
+                    ('fertigations', FertigationSerializer, FERTIGATION_LIST, Fertigation.objects.filter(user=user)),
+                    ('sales', SaleSerializer, SALE_LIST, Sale.objects.filter(user=user)),
+                    ('crop stages', CropStageSerializer, CROP_STAGE_LIST, CropStage.objects.filter(user=user)),
+                ]
+                self.stdout.write(
+                    f'{"endpoint":<16}{"rows":>8}{"serializer rows/s":>20}{"projection rows/s":>20}{"speedup":>10}'
+                )
+                for name, serializer_class, projection, queryset in cases:
+                    before, slow = self.time(lambda: JSONRenderer().render(
+                        serializer_class(_eager(serializer_class, queryset.all()), many=True).data
+                    ), repeat)
+                    after, fast = self.time(lambda: ORJSONRenderer().render(projection.rows(queryset.all())), repeat)
+                    count = queryset.count()
+                    self.stdout.write(
+                        f'{name:<16}{count:>8}{count / slow:>20.0f}{count / fast:>20.0f}{slow / fast:>9.1f}x'
+                    )
+                    if json.loads(before) != json.loads(after):
+                        mismatches.append(name)
+                    # Odd chunk size so chunk boundaries fall mid-list
+                    streamed = b''.join(json_array(projection.chunks(queryset.all(), chunk_size=97)))
+                    if json.loads(streamed) != json.loads(after):
+                        mismatches.append(f'{name} (streamed)')
+                raise RolledBack
+        except RolledBack:
+            pass
+
+        if mismatches:
+            raise CommandError(f'Projection output differs from the serializer for: {", ".join(mismatches)}')
+        self.stdout.write(self.style.SUCCESS('Projection output matches the serializers'))
+
+    def time(self, render, repeat):
+        best, output = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = render()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return output, best
+
+    def seed(self, rows):
+        agronomist = User.objects.create_user(username='_bench_agronomist', password=None, user_type='agronomist')
+        user = User.objects.create_user(username='_bench_farm_user', password=None, user_type='farm_user')
+        farm = Farm.objects.create(name='Benchmark farm', location='-', size_in_acres=10, created_by=agronomist)
+        farm.users.add(user)
+
+        today = date.today()
+        now = timezone.now()
+        owned = {'farm': farm, 'user': user}
+        stages = CropStage.objects.bulk_create([
+            CropStage(
+                **owned, crop_name='Tomato', variety='Hybrid', batch_code=f'B{index}',
+                current_stage='vegetative', transplant_date=today - timedelta(days=index % 120),
+                expected_harvest_date=today + timedelta(days=30 - index % 60), expected_yield=100,
+            )
+            for index in range(rows)
+        ])
+        SprayIrrigationLog.objects.bulk_create([
+            SprayIrrigationLog(
+                **owned, crop_stage=stages[index % len(stages)], date=today - timedelta(days=index % 30),
+                activity_type='spray' if index % 2 else 'irrigation', notes='Benchmark log',
+            )
+            for index in range(rows)
+        ])
+        DailyTask.objects.bulk_create([
+            DailyTask(**owned, date=today - timedelta(days=index), farm_hygiene=True, main_tank_ec='1.50')
+            for index in range(rows)
+        ])
+        Fertigation.objects.bulk_create([
+            Fertigation(
+                **owned, crop_stage=stages[index % len(stages)], crop_zone_name='Zone A',
+                date_time=now - timedelta(hours=index), operator_name='-', ec_before='1.20', ph_before='6.10',
+                ec_after='1.80', ph_after='6.00', water_volume='250.00',
+                nutrients_used=[{'product_name': 'NPK', 'quantity': 2, 'cost': 40}],
+            )
+            for index in range(rows)
+        ])
+        Sale.objects.bulk_create([
+            Sale(
+                **owned, crop_name='Tomato', batch_code=f'B{index}', buyer_name='Buyer',
+                sale_date=today - timedelta(days=index % 365), quantity_sold='12.500', price_per_unit='40.00',
+                total_amount='500.00', amount_received='200.00',
+            )
+            for index in range(rows)
+        ])
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                title=f'Notice {index}', message='Benchmark notification', farm=farm, user=user,
+                created_by=agronomist, due_date=now + timedelta(days=index % 10),
+            )
+            for index in range(rows)
+        ])
+        NotificationRecipient.objects.bulk_create([
+            NotificationRecipient(notification=notification, recipient=user) for notification in notifications
+        ])
+        return user
@@ -0,0 +1,12 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the per-endpoint query budget tests (farms.tests.test_query_budget) '
+        'against a test database; shorthand for manage.py test on that module.'
+    )
+
+    def handle(self, *args, **options):
+        call_command('test', 'farms.tests.test_query_budget', verbosity=options['verbosity'])
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from farms.facts import reconcile_monthly_facts
+
+
+class Command(BaseCommand):
+    help = 'Rebuild FarmMonthlyFacts from the source tables (also used to backfill after deploying)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--farm',
+            type=int,
+            action='append',
+            dest='farm_ids',
+            help='Only reconcile this farm id (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        result = reconcile_monthly_facts(options['farm_ids'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Monthly facts reconciled: {result['created']} created, {result['updated']} updated, {result['deleted']} deleted"
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from farms.alerts import refresh_crop_alerts, refresh_stale_crop_alerts
+from farms.models import CropStage
+
+
+class Command(BaseCommand):
+    help = 'Recompute CropAlert rows that are missing or out of date (also used to backfill after deploying)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--farm',
+            type=int,
+            action='append',
+            dest='farm_ids',
+            help='Only refresh crop stages of this farm id (repeatable)',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute every alert, not only stale ones',
+        )
+
+    def handle(self, *args, **options):
+        crop_stages = CropStage.objects.all()
+        if options['farm_ids']:
+            crop_stages = crop_stages.filter(farm_id__in=options['farm_ids'])
+        if options['all']:
+            refreshed = refresh_crop_alerts(crop_stages)
+        else:
+            refreshed = refresh_stale_crop_alerts(crop_stages)
+        self.stdout.write(self.style.SUCCESS(f'Crop alerts refreshed: {refreshed}'))
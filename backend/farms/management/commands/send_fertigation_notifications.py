@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
 from farms.models import Fertigation, Notification
+from farms.notifications import create_notification
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
@@ -21,15 +22,15 @@ class Command(BaseCommand):
         
         for fertigation in due_fertigations:
             # Create notification for the user
-            notification = Notification.objects.create(
-                title=f"Fertigation Due: {fertigation.crop_zone_name}",
-                message=f"Scheduled fertigation for {fertigation.crop_zone_name} at {fertigation.farm.name} is now due. Please proceed with the application.",
+            notification = create_notification(
+                [fertigation.user],
+                template='fertigation_due',
+                params={'zone': fertigation.crop_zone_name},
                 notification_type='fertigation_due',
                 farm=fertigation.farm,
                 user=fertigation.user,
                 due_date=fertigation.date_time,
-                related_object_id=fertigation.id,
-                is_read=False
+                related_object_id=fertigation.id
             )
             
             # Send WebSocket notification
@@ -40,8 +41,8 @@ class Command(BaseCommand):
                         "type": "notification",
                         "notification": {
                             "id": notification.id,
-                            "title": notification.title,
-                            "message": notification.message,
+                            "title": notification.rendered_title,
+                            "message": notification.rendered_message,
                             "type": notification.notification_type,
                             "created_at": notification.created_at.isoformat()
                         }
@@ -64,22 +65,21 @@ class Command(BaseCommand):
             # Check if overdue notification already exists
             existing_notification = Notification.objects.filter(
                 notification_type='fertigation_overdue',
-                farm=fertigation.farm,
-                user=fertigation.user,
-                message__icontains=fertigation.crop_zone_name
+                related_object_id=fertigation.id,
+                user=fertigation.user
             ).first()
             
             if not existing_notification:
                 # Create overdue notification
-                notification = Notification.objects.create(
-                    title=f"Fertigation Overdue: {fertigation.crop_zone_name}",
-                    message=f"Scheduled fertigation for {fertigation.crop_zone_name} at {fertigation.farm.name} was scheduled for {fertigation.date_time.strftime('%Y-%m-%d %H:%M')} but is still pending.",
+                notification = create_notification(
+                    [fertigation.user],
+                    template='fertigation_overdue',
+                    params={'zone': fertigation.crop_zone_name, 'scheduled_at': fertigation.date_time},
                     notification_type='fertigation_overdue',
                     farm=fertigation.farm,
                     user=fertigation.user,
                     due_date=fertigation.date_time,
-                    related_object_id=fertigation.id,
-                    is_read=False
+                    related_object_id=fertigation.id
                 )
                 
                 # Send WebSocket notification
@@ -90,8 +90,8 @@ class Command(BaseCommand):
                             "type": "notification",
                             "notification": {
                                 "id": notification.id,
-                                "title": notification.title,
-                                "message": notification.message,
+                                "title": notification.rendered_title,
+                                "message": notification.rendered_message,
                                 "type": notification.notification_type,
                                 "created_at": notification.created_at.isoformat()
                             }
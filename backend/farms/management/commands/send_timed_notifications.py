@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
 from farms.models import Fertigation, Notification, CropStage
+from farms.notifications import create_notification
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
@@ -41,15 +42,15 @@ class Command(BaseCommand):
             ).first()
             
             if not existing_notification:
-                notification = Notification.objects.create(
-                    title=f"🚿 Fertigation Due: {fertigation.crop_zone_name}",
-                    message=f"Scheduled fertigation for {fertigation.crop_zone_name} at {fertigation.farm.name} is now due. Please proceed with the application.",
+                notification = create_notification(
+                    [fertigation.user],
+                    template='fertigation_due',
+                    params={'zone': fertigation.crop_zone_name},
                     notification_type='fertigation_due',
                     farm=fertigation.farm,
                     user=fertigation.user,
                     due_date=fertigation.date_time,
-                    related_object_id=fertigation.id,
-                    is_read=False
+                    related_object_id=fertigation.id
                 )
                 
                 self.send_websocket_notification(channel_layer, notification)
@@ -84,21 +85,21 @@ class Command(BaseCommand):
                 if due_notification:
                     # Update the existing due notification to overdue
                     due_notification.notification_type = 'fertigation_overdue'
-                    due_notification.title = f"⚠️ Fertigation Overdue: {fertigation.crop_zone_name}"
-                    due_notification.message = f"Scheduled fertigation for {fertigation.crop_zone_name} at {fertigation.farm.name} was scheduled for {fertigation.date_time.strftime('%Y-%m-%d %H:%M')} but is still pending."
+                    due_notification.template = 'fertigation_overdue'
+                    due_notification.params = {'zone': fertigation.crop_zone_name, 'scheduled_at': fertigation.date_time}
                     due_notification.save()
                     notification = due_notification
                 else:
                     # Create new overdue notification
-                    notification = Notification.objects.create(
-                        title=f"⚠️ Fertigation Overdue: {fertigation.crop_zone_name}",
-                        message=f"Scheduled fertigation for {fertigation.crop_zone_name} at {fertigation.farm.name} was scheduled for {fertigation.date_time.strftime('%Y-%m-%d %H:%M')} but is still pending.",
+                    notification = create_notification(
+                        [fertigation.user],
+                        template='fertigation_overdue',
+                        params={'zone': fertigation.crop_zone_name, 'scheduled_at': fertigation.date_time},
                         notification_type='fertigation_overdue',
                         farm=fertigation.farm,
                         user=fertigation.user,
                         due_date=fertigation.date_time,
-                        related_object_id=fertigation.id,
-                        is_read=False
+                        related_object_id=fertigation.id
                     )
                 
                 self.send_websocket_notification(channel_layer, notification)
@@ -131,15 +132,15 @@ class Command(BaseCommand):
                     timezone.datetime.combine(crop_stage.expected_harvest_date, timezone.datetime.min.time())
                 )
                 
-                notification = Notification.objects.create(
-                    title=f"🌾 Harvest Due: {crop_stage.crop_name}",
-                    message=f"Crop {crop_stage.crop_name} ({crop_stage.variety}) in batch {crop_stage.batch_code} at {crop_stage.farm.name} is ready for harvest.",
+                notification = create_notification(
+                    [crop_stage.user],
+                    template='harvest_due',
+                    params={'crop': crop_stage.crop_name, 'variety': crop_stage.variety, 'batch': crop_stage.batch_code},
                     notification_type='harvest_due',
                     farm=crop_stage.farm,
                     user=crop_stage.user,
                     due_date=harvest_datetime,
-                    related_object_id=crop_stage.id,
-                    is_read=False
+                    related_object_id=crop_stage.id
                 )
                 
                 self.send_websocket_notification(channel_layer, notification)
@@ -177,20 +178,20 @@ class Command(BaseCommand):
                 
                 if due_notification:
                     due_notification.notification_type = 'harvest_overdue'
-                    due_notification.title = f"⚠️ Harvest Overdue: {crop_stage.crop_name}"
-                    due_notification.message = f"Crop {crop_stage.crop_name} ({crop_stage.variety}) in batch {crop_stage.batch_code} at {crop_stage.farm.name} was scheduled for harvest on {crop_stage.expected_harvest_date.strftime('%Y-%m-%d')} but is still pending."
+                    due_notification.template = 'harvest_overdue'
+                    due_notification.params = {'crop': crop_stage.crop_name, 'variety': crop_stage.variety, 'batch': crop_stage.batch_code, 'harvest_date': crop_stage.expected_harvest_date}
                     due_notification.save()
                     notification = due_notification
                 else:
-                    notification = Notification.objects.create(
-                        title=f"⚠️ Harvest Overdue: {crop_stage.crop_name}",
-                        message=f"Crop {crop_stage.crop_name} ({crop_stage.variety}) in batch {crop_stage.batch_code} at {crop_stage.farm.name} was scheduled for harvest on {crop_stage.expected_harvest_date.strftime('%Y-%m-%d')} but is still pending.",
+                    notification = create_notification(
+                        [crop_stage.user],
+                        template='harvest_overdue',
+                        params={'crop': crop_stage.crop_name, 'variety': crop_stage.variety, 'batch': crop_stage.batch_code, 'harvest_date': crop_stage.expected_harvest_date},
                         notification_type='harvest_overdue',
                         farm=crop_stage.farm,
                         user=crop_stage.user,
                         due_date=harvest_datetime,
-                        related_object_id=crop_stage.id,
-                        is_read=False
+                        related_object_id=crop_stage.id
                     )
                 
                 self.send_websocket_notification(channel_layer, notification)
@@ -210,8 +211,8 @@ class Command(BaseCommand):
                         "type": "notification",
                         "notification": {
                             "id": notification.id,
-                            "title": notification.title,
-                            "message": notification.message,
+                            "title": notification.rendered_title,
+                            "message": notification.rendered_message,
                             "type": notification.notification_type,
                             "due_date": notification.due_date.isoformat() if notification.due_date else None,
                             "is_overdue": notification.is_overdue,
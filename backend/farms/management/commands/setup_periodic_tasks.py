@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
-from django_celery_beat.models import PeriodicTask, IntervalSchedule
+from django_celery_beat.models import CrontabSchedule, PeriodicTask, IntervalSchedule
 import json
+from django.conf import settings
 
 class Command(BaseCommand):
     help = 'Setup periodic tasks for notification system'
@@ -47,10 +48,62 @@ class Command(BaseCommand):
             cleanup_task.enabled = True
             cleanup_task.save()
         
+        # Nightly monthly facts reconciliation, after the day's writes have settled
+        nightly_schedule, created = CrontabSchedule.objects.get_or_create(
+            minute='30',
+            hour='2',
+            day_of_week='*',
+            day_of_month='*',
+            month_of_year='*',
+            timezone=settings.CELERY_TIMEZONE,
+        )
+        
+        facts_task, created = PeriodicTask.objects.get_or_create(
+            name='Reconcile Farm Monthly Facts',
+            defaults={
+                'crontab': nightly_schedule,
+                'task': 'farms.tasks.reconcile_farm_monthly_facts',
+                'enabled': True,
+            }
+        )
+        
+        if not created:
+            facts_task.interval = None
+            facts_task.crontab = nightly_schedule
+            facts_task.enabled = True
+            facts_task.save()
+        
+        # Crop alerts roll over to the new day right after midnight
+        midnight_schedule, created = CrontabSchedule.objects.get_or_create(
+            minute='5',
+            hour='0',
+            day_of_week='*',
+            day_of_month='*',
+            month_of_year='*',
+            timezone=settings.CELERY_TIMEZONE,
+        )
+        
+        alerts_task, created = PeriodicTask.objects.get_or_create(
+            name='Refresh Crop Alerts',
+            defaults={
+                'crontab': midnight_schedule,
+                'task': 'farms.tasks.refresh_all_crop_alerts',
+                'enabled': True,
+            }
+        )
+        
+        if not created:
+            alerts_task.interval = None
+            alerts_task.crontab = midnight_schedule
+            alerts_task.enabled = True
+            alerts_task.save()
+        
         self.stdout.write(
             self.style.SUCCESS(
                 'Successfully set up periodic tasks:\n'
                 '- Send Timed Notifications (every minute)\n'
-                '- Cleanup Old Notifications (daily)'
+                '- Cleanup Old Notifications (daily)\n'
+                '- Reconcile Farm Monthly Facts (nightly at 02:30)\n'
+                '- Refresh Crop Alerts (nightly at 00:05)'
             )
         )
\ No newline at end of file
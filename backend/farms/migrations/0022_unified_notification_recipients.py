@@ -0,0 +1,123 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_to_recipients(apps, schema_editor):
+    """
+    Move read state onto recipient rows and fold AgronomistNotification into
+    Notification. Notifications addressed to agronomists for daily tasks and
+    issue reports were duplicate writes of the AgronomistNotification rows,
+    so the agronomist copy is kept and the duplicate is dropped.
+    """
+    Notification = apps.get_model('farms', 'Notification')
+    NotificationRecipient = apps.get_model('farms', 'NotificationRecipient')
+    AgronomistNotification = apps.get_model('farms', 'AgronomistNotification')
+    Farm = apps.get_model('farms', 'Farm')
+    FarmUsers = Farm.users.through
+
+    Notification.objects.filter(
+        user__user_type__in=['agronomist', 'superuser'],
+        notification_type__in=['daily_task', 'issue_report']
+    ).delete()
+
+    receipts = []
+    for notification in Notification.objects.filter(user__isnull=False).iterator():
+        receipts.append(NotificationRecipient(
+            notification_id=notification.id, recipient_id=notification.user_id, is_read=notification.is_read
+        ))
+
+    farm_wide = Notification.objects.filter(user__isnull=True, is_farm_wide=True, farm__isnull=False)
+    for notification in farm_wide.iterator():
+        farm_user_ids = FarmUsers.objects.filter(farm_id=notification.farm_id).values_list('customuser_id', flat=True)
+        for user_id in farm_user_ids:
+            receipts.append(NotificationRecipient(
+                notification_id=notification.id, recipient_id=user_id, is_read=notification.is_read
+            ))
+
+    for old in AgronomistNotification.objects.all().iterator():
+        notification = Notification.objects.create(
+            title=old.title,
+            message=old.message,
+            notification_type=old.notification_type,
+            farm_id=old.source_farm_id,
+            user_id=old.agronomist_user_id,
+            created_by_id=old.source_user_id,
+            related_object_id=old.related_object_id,
+            related_model_name=old.related_model_name,
+        )
+        # created_at is auto_now_add, keep the original timestamp
+        Notification.objects.filter(id=notification.id).update(created_at=old.created_at)
+        receipts.append(NotificationRecipient(
+            notification_id=notification.id, recipient_id=old.agronomist_user_id, is_read=old.is_read
+        ))
+
+    NotificationRecipient.objects.bulk_create(receipts, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('farms', '0021_change_farmtask_photo_to_image_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationRecipient',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_read', models.BooleanField(default=False)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-notification'],
+            },
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='related_model_name',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('daily_task', 'Daily Task Submission'), ('farm_created', 'Farm Created'), ('user_created', 'User Created'), ('harvest_due', 'Harvest Due'), ('harvest_overdue', 'Harvest Overdue'), ('harvest_reminder', 'Harvest Reminder'), ('fertigation_due', 'Fertigation Due'), ('fertigation_overdue', 'Fertigation Overdue'), ('admin_message', 'Agronomist Message'), ('agronomist_message', 'Agronomist Message'), ('farm_announcement', 'Farm Announcement'), ('task_reminder', 'Task Reminder'), ('issue_report', 'Issue Report'), ('farm_user_created', 'Farm User Created'), ('system_alert', 'System Alert'), ('general', 'General')], default='general', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='notificationrecipient',
+            name='notification',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recipients', to='farms.notification'),
+        ),
+        migrations.AddField(
+            model_name='notificationrecipient',
+            name='recipient',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_receipts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='notificationrecipient',
+            index=models.Index(fields=['recipient', '-notification'], name='farms_notif_recipie_7efbf9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationrecipient',
+            index=models.Index(fields=['recipient', 'is_read'], name='farms_notif_recipie_79d7b5_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='notificationrecipient',
+            unique_together={('notification', 'recipient')},
+        ),
+        migrations.RunPython(copy_to_recipients, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='farms_notif_is_read_3be001_idx',
+        ),
+        migrations.RemoveField(
+            model_name='notification',
+            name='is_read',
+        ),
+        migrations.DeleteModel(
+            name='AgronomistNotification',
+        ),
+    ]
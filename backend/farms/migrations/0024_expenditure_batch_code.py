@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farms', '0023_notification_templates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expenditure',
+            name='batch_code',
+            field=models.CharField(blank=True, help_text='Crop batch this cost belongs to; leave empty for farm-level costs', max_length=100, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='expenditure',
+            index=models.Index(fields=['farm', 'batch_code'], name='farms_expen_farm_id_f2e46c_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farms', '0024_expenditure_batch_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FarmMonthlyFacts',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('sales_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('sales_count', models.PositiveIntegerField(default=0)),
+                ('expense_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('water_volume', models.DecimalField(decimal_places=2, default=0, help_text='Completed fertigation water volume (L)', max_digits=14)),
+                ('sprays', models.PositiveIntegerField(default=0)),
+                ('fertigations', models.PositiveIntegerField(default=0)),
+                ('tasks_completed', models.PositiveIntegerField(default=0)),
+                ('issues_opened', models.PositiveIntegerField(default=0)),
+                ('issues_resolved', models.PositiveIntegerField(default=0)),
+                ('yield_amount', models.DecimalField(decimal_places=2, default=0, help_text='Actual yield of batches harvested this month', max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('farm', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_facts', to='farms.farm')),
+            ],
+            options={
+                'ordering': ['farm', '-month'],
+                'indexes': [models.Index(fields=['month', 'farm'], name='farms_farmm_month_10a637_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='farmmonthlyfacts',
+            constraint=models.UniqueConstraint(fields=('farm', 'month'), name='unique_farm_month_facts'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farms', '0025_farm_monthly_facts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cropstage',
+            index=models.Index(fields=['user', 'expected_harvest_date'], name='farms_crops_user_id_2550f9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cropstage',
+            index=models.Index(fields=['farm', 'expected_harvest_date'], name='farms_crops_farm_id_ab8970_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cropstage',
+            index=models.Index(fields=['user', 'transplant_date'], name='farms_crops_user_id_9526ca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cropstage',
+            index=models.Index(fields=['farm', 'transplant_date'], name='farms_crops_farm_id_03c212_idx'),
+        ),
+    ]
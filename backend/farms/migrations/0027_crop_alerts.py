@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('farms', '0026_cropstage_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CropAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timeline_status', models.CharField(choices=[('on_track', 'On Track'), ('due_soon', 'Due Soon'), ('overdue', 'Overdue')], max_length=20)),
+                ('health_alert', models.BooleanField(default=False)),
+                ('stage_progress', models.PositiveSmallIntegerField(default=0)),
+                ('yield_status', models.CharField(choices=[('unknown', 'Unknown'), ('pending', 'Pending'), ('excellent', 'Excellent'), ('good', 'Good'), ('fair', 'Fair'), ('poor', 'Poor')], max_length=20)),
+                ('next_action', models.CharField(blank=True, max_length=200, null=True)),
+                ('alerts', models.JSONField(default=list)),
+                ('alert_count', models.PositiveSmallIntegerField(default=0)),
+                ('computed_on', models.DateField(help_text='Day the summary was computed for')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('crop_stage', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='alert', to='farms.cropstage')),
+                ('farm', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='crop_alerts', to='farms.farm')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-health_alert', '-alert_count', 'crop_stage'],
+                'indexes': [models.Index(condition=models.Q(('alert_count__gt', 0)), fields=['farm', '-health_alert', '-alert_count'], name='crop_alert_farm_active_idx'), models.Index(condition=models.Q(('alert_count__gt', 0)), fields=['user', '-health_alert', '-alert_count'], name='crop_alert_user_active_idx'), models.Index(fields=['computed_on'], name='farms_cropa_compute_339b86_idx')],
+            },
+        ),
+    ]
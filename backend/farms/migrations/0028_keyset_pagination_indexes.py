@@ -0,0 +1,181 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farms', '0027_crop_alerts'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='cropstage',
+            name='farms_crops_user_id_013c7b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='cropstage',
+            name='farms_crops_user_id_2550f9_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='cropstage',
+            name='farms_crops_farm_id_ab8970_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='cropstage',
+            name='farms_crops_user_id_9526ca_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='cropstage',
+            name='farms_crops_farm_id_03c212_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='expenditure',
+            name='farms_expen_farm_id_45d655_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='expenditure',
+            name='farms_expen_user_id_a72f67_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='issuereport',
+            name='farms_issue_farm_us_cf0efb_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='plantdiseaseprediction',
+            name='farms_plant_farm_id_403c15_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='plantdiseaseprediction',
+            name='farms_plant_user_id_abbeb1_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='sale',
+            name='farms_sale_farm_id_db0bf2_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='sale',
+            name='farms_sale_user_id_5b7730_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='sprayschedule',
+            name='farms_spray_farm_id_7e293a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='sprayschedule',
+            name='farms_spray_user_id_8959d7_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='workertask',
+            name='farms_worke_user_id_e24c3c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='cropstage',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='farms_crops_user_id_8f8a1e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cropstage',
+            index=models.Index(fields=['farm', '-created_at', '-id'], name='farms_crops_farm_id_c597d4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cropstage',
+            index=models.Index(fields=['user', 'expected_harvest_date', 'id'], name='farms_crops_user_id_438438_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cropstage',
+            index=models.Index(fields=['farm', 'expected_harvest_date', 'id'], name='farms_crops_farm_id_f9cbdd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cropstage',
+            index=models.Index(fields=['user', 'transplant_date', 'id'], name='farms_crops_user_id_855cb8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cropstage',
+            index=models.Index(fields=['farm', 'transplant_date', 'id'], name='farms_crops_farm_id_49e7c4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailytask',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='farms_daily_user_id_1a0350_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailytask',
+            index=models.Index(fields=['farm', '-created_at', '-id'], name='farms_daily_farm_id_2b12cc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expenditure',
+            index=models.Index(fields=['farm', '-expense_date', '-id'], name='farms_expen_farm_id_db73e3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expenditure',
+            index=models.Index(fields=['user', '-expense_date', '-id'], name='farms_expen_user_id_281193_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fertigation',
+            index=models.Index(fields=['user', '-date_time', '-id'], name='farms_ferti_user_id_a93cb3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fertigation',
+            index=models.Index(fields=['farm', '-date_time', '-id'], name='farms_ferti_farm_id_e0023c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fertigation',
+            index=models.Index(fields=['user', 'status', 'scheduled_date', 'id'], name='farms_ferti_user_id_fef656_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issuereport',
+            index=models.Index(fields=['farm_user', '-created_at', '-id'], name='farms_issue_farm_us_9a0042_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issuereport',
+            index=models.Index(fields=['farm', '-created_at', '-id'], name='farms_issue_farm_id_871437_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['farm', '-priority', '-id'], name='farms_notif_farm_id_3357bc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plantdiseaseprediction',
+            index=models.Index(fields=['farm', '-analysis_timestamp', '-id'], name='farms_plant_farm_id_6f7504_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plantdiseaseprediction',
+            index=models.Index(fields=['user', '-analysis_timestamp', '-id'], name='farms_plant_user_id_50c671_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['farm', '-sale_date', '-id'], name='farms_sale_farm_id_9032aa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['user', '-sale_date', '-id'], name='farms_sale_user_id_eea510_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sprayirrigationlog',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='farms_spray_user_id_4a63c9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sprayschedule',
+            index=models.Index(fields=['farm', '-date_time', '-id'], name='farms_spray_farm_id_a5f38b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sprayschedule',
+            index=models.Index(fields=['user', '-date_time', '-id'], name='farms_spray_user_id_742d98_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='worker',
+            index=models.Index(fields=['user', 'name', 'id'], name='farms_worke_user_id_62389d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='worker',
+            index=models.Index(fields=['farm', '-created_at', '-id'], name='farms_worke_farm_id_b8a170_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workertask',
+            index=models.Index(fields=['user', '-assigned_date', '-id'], name='farms_worke_user_id_1a4cc4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workertask',
+            index=models.Index(fields=['farm', '-created_at', '-id'], name='farms_worke_farm_id_06784b_idx'),
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 from django.conf import settings
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
+from django.utils.functional import cached_property
 
 class Farm(models.Model):
     name = models.CharField(max_length=200)
@@ -56,6 +58,8 @@ class DailyTask(models.Model):
             models.Index(fields=['user', '-date']),
             models.Index(fields=['farm', '-date']),
             models.Index(fields=['-created_at']),
+            models.Index(fields=['user', '-created_at', '-id']),
+            models.Index(fields=['farm', '-created_at', '-id']),
         ]
     
     def __str__(self):
@@ -75,20 +79,26 @@ class Notification(models.Model):
         ('agronomist_message', 'Agronomist Message'),
         ('farm_announcement', 'Farm Announcement'),
         ('task_reminder', 'Task Reminder'),
+        ('issue_report', 'Issue Report'),
+        ('farm_user_created', 'Farm User Created'),
+        ('system_alert', 'System Alert'),
         ('general', 'General'),
     )
     
-    title = models.CharField(max_length=200)
-    message = models.TextField()
+    # Free-text notifications store title/message; generated ones store a template id and params
+    title = models.CharField(max_length=200, blank=True)
+    message = models.TextField(blank=True)
+    template = models.CharField(max_length=50, blank=True, default='')  # Key of farms.notification_templates.NOTIFICATION_TEMPLATES
+    params = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
     notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES, default='general')
     farm = models.ForeignKey(Farm, on_delete=models.CASCADE, null=True, blank=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name='received_notifications')
-    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name='sent_notifications')
-    is_read = models.BooleanField(default=False)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='sent_notifications')
     is_farm_wide = models.BooleanField(default=False, help_text="True if notification is for all farm users, False for specific user")
     priority = models.CharField(max_length=10, choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], default='medium')
     due_date = models.DateTimeField(null=True, blank=True)  # When the task/activity is due
     related_object_id = models.PositiveIntegerField(null=True, blank=True)  # ID of related fertigation/harvest etc
+    related_model_name = models.CharField(max_length=50, null=True, blank=True)  # e.g., 'IssueReport', 'DailyTask'
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -96,16 +106,31 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['farm', '-created_at']),
+            models.Index(fields=['farm', '-priority', '-id']),
             models.Index(fields=['created_by', '-created_at']),
             models.Index(fields=['notification_type']),
-            models.Index(fields=['is_read']),
             models.Index(fields=['is_farm_wide']),
             models.Index(fields=['priority']),
             models.Index(fields=['due_date']),
         ]
     
     def __str__(self):
-        return f"{self.title} - {self.created_at}"
+        return f"{self.rendered_title} - {self.created_at}"
+    
+    def render(self):
+        """Return (title, message); template notifications are rendered (and cached) on read"""
+        if not self.template:
+            return self.title, self.message
+        from .notification_templates import render_notification
+        return render_notification(self.template, self.params, self.farm.name if self.farm_id else None)
+    
+    @property
+    def rendered_title(self):
+        return self.render()[0]
+    
+    @property
+    def rendered_message(self):
+        return self.render()[1]
     
     @property
     def is_overdue(self):
@@ -139,6 +164,28 @@ class Notification(models.Model):
             else:
                 return f"{delta.seconds // 60} minutes remaining"
 
+
+class NotificationRecipient(models.Model):
+    """
+    Delivery row linking one notification body to one recipient.
+    Read state lives here so a broadcast stores its text only once.
+    """
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='recipients')
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notification_receipts')
+    is_read = models.BooleanField(default=False)
+    delivered_at = models.DateTimeField(null=True, blank=True)  # When the realtime push was dispatched
+    
+    class Meta:
+        ordering = ['-notification']
+        unique_together = ['notification', 'recipient']
+        indexes = [
+            models.Index(fields=['recipient', '-notification']),
+            models.Index(fields=['recipient', 'is_read']),
+        ]
+    
+    def __str__(self):
+        return f"{self.notification_id} -> {self.recipient_id}"
+
 class SprayIrrigationLog(models.Model):
     ACTIVITY_TYPE_CHOICES = (
         ('spray', 'Spray'),
@@ -171,6 +218,9 @@ class SprayIrrigationLog(models.Model):
     
     class Meta:
         ordering = ['-created_at', '-date']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.farm.name} - {self.activity_type} - {self.date}"
@@ -213,8 +263,8 @@ class SpraySchedule(models.Model):
     class Meta:
         ordering = ['-date_time', '-created_at']
         indexes = [
-            models.Index(fields=['farm', '-date_time']),
-            models.Index(fields=['user', '-date_time']),
+            models.Index(fields=['farm', '-date_time', '-id']),
+            models.Index(fields=['user', '-date_time', '-id']),
             models.Index(fields=['reason']),
             models.Index(fields=['next_spray_reminder']),
             models.Index(fields=['is_completed']),
@@ -308,16 +358,23 @@ class CropStage(models.Model):
     class Meta:
         ordering = ['-created_at', 'crop_name']
         indexes = [
-            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['user', '-created_at', '-id']),
+            models.Index(fields=['farm', '-created_at', '-id']),
             models.Index(fields=['farm', 'current_stage']),
             models.Index(fields=['batch_code']),
             models.Index(fields=['health_status']),
+            models.Index(fields=['user', 'expected_harvest_date', 'id']),
+            models.Index(fields=['farm', 'expected_harvest_date', 'id']),
+            models.Index(fields=['user', 'transplant_date', 'id']),
+            models.Index(fields=['farm', 'transplant_date', 'id']),
         ]
     
     def __str__(self):
         return f"{self.crop_name} ({self.variety}) - {self.batch_code}"
     
-    @property
+    # The day counts below are cached per instance; with_crop_timeline()
+    # annotates the same names from the database, which take precedence
+    @cached_property
     def growth_duration_days(self):
         from django.utils import timezone
         if self.transplant_date:
@@ -325,7 +382,7 @@ class CropStage(models.Model):
             return (current_date - self.transplant_date).days
         return 0
     
-    @property
+    @cached_property
     def days_in_current_stage(self):
         """Calculate days spent in current stage"""
         if not self.stage_start_date:
@@ -335,7 +392,7 @@ class CropStage(models.Model):
         end_date = self.stage_end_date or current_date
         return (end_date - self.stage_start_date).days
     
-    @property
+    @cached_property
     def days_to_harvest(self):
         """Calculate days remaining to expected harvest"""
         if not self.expected_harvest_date:
@@ -352,7 +409,7 @@ class CropStage(models.Model):
             return None
         return round((float(self.actual_yield) / float(self.expected_yield)) * 100, 2)
     
-    @property
+    @cached_property
     def is_overdue(self):
         """Check if harvest is overdue"""
         if not self.expected_harvest_date or self.actual_harvest_date:
@@ -361,6 +418,52 @@ class CropStage(models.Model):
         current_date = timezone.localtime().date()
         return current_date > self.expected_harvest_date
 
+class CropAlert(models.Model):
+    """Progress summary of a crop stage as of computed_on, kept current by farms.alerts"""
+    TIMELINE_STATUS = (
+        ('on_track', 'On Track'),
+        ('due_soon', 'Due Soon'),
+        ('overdue', 'Overdue'),
+    )
+    
+    YIELD_STATUS = (
+        ('unknown', 'Unknown'),
+        ('pending', 'Pending'),
+        ('excellent', 'Excellent'),
+        ('good', 'Good'),
+        ('fair', 'Fair'),
+        ('poor', 'Poor'),
+    )
+    
+    crop_stage = models.OneToOneField(CropStage, on_delete=models.CASCADE, related_name='alert')
+    farm = models.ForeignKey(Farm, on_delete=models.CASCADE, related_name='crop_alerts')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    
+    timeline_status = models.CharField(max_length=20, choices=TIMELINE_STATUS)
+    health_alert = models.BooleanField(default=False)
+    stage_progress = models.PositiveSmallIntegerField(default=0)
+    yield_status = models.CharField(max_length=20, choices=YIELD_STATUS)
+    next_action = models.CharField(max_length=200, blank=True, null=True)
+    alerts = models.JSONField(default=list)
+    alert_count = models.PositiveSmallIntegerField(default=0)
+    
+    computed_on = models.DateField(help_text="Day the summary was computed for")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-health_alert', '-alert_count', 'crop_stage']
+        indexes = [
+            # Only alerting crops are listed, so only they are indexed
+            models.Index(fields=['farm', '-health_alert', '-alert_count'], condition=models.Q(alert_count__gt=0),
+                         name='crop_alert_farm_active_idx'),
+            models.Index(fields=['user', '-health_alert', '-alert_count'], condition=models.Q(alert_count__gt=0),
+                         name='crop_alert_user_active_idx'),
+            models.Index(fields=['computed_on']),
+        ]
+    
+    def __str__(self):
+        return f"{self.crop_stage_id} - {self.timeline_status} ({self.alert_count} alerts)"
+
 class Fertigation(models.Model):
     STATUS_CHOICES = (
         ('scheduled', 'Scheduled'),
@@ -401,6 +504,11 @@ class Fertigation(models.Model):
     
     class Meta:
         ordering = ['-date_time', '-created_at']
+        indexes = [
+            models.Index(fields=['user', '-date_time', '-id']),
+            models.Index(fields=['farm', '-date_time', '-id']),
+            models.Index(fields=['user', 'status', 'scheduled_date', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.crop_zone_name} - {self.date_time.strftime('%Y-%m-%d %H:%M')}"
@@ -446,6 +554,8 @@ class Worker(models.Model):
         ordering = ['name']
         indexes = [
             models.Index(fields=['user', 'farm']),
+            models.Index(fields=['user', 'name', 'id']),
+            models.Index(fields=['farm', '-created_at', '-id']),
             models.Index(fields=['employment_type']),
         ]
     
@@ -475,9 +585,10 @@ class WorkerTask(models.Model):
     class Meta:
         ordering = ['-assigned_date', '-created_at']
         indexes = [
-            models.Index(fields=['user', '-assigned_date']),
+            models.Index(fields=['user', '-assigned_date', '-id']),
             models.Index(fields=['worker', 'status']),
             models.Index(fields=['-created_at']),
+            models.Index(fields=['farm', '-created_at', '-id']),
         ]
     
     def __str__(self):
@@ -522,7 +633,8 @@ class IssueReport(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['farm_user', '-created_at']),
+            models.Index(fields=['farm_user', '-created_at', '-id']),
+            models.Index(fields=['farm', '-created_at', '-id']),
             models.Index(fields=['agronomist_user']),
             models.Index(fields=['status']),
             models.Index(fields=['severity']),
@@ -532,46 +644,6 @@ class IssueReport(models.Model):
         return f"Issue #{self.id} - {self.get_issue_type_display()} - {self.severity}"
 
 
-class AgronomistNotification(models.Model):
-    """
-    Separate notification model for agronomists that persists independently
-    """
-    NOTIFICATION_TYPES = (
-        ('daily_task', 'Daily Task Submission'),
-        ('issue_report', 'Issue Report'),
-        ('farm_user_created', 'Farm User Created'),
-        ('farm_created', 'Farm Created'),
-        ('system_alert', 'System Alert'),
-        ('general', 'General'),
-    )
-    
-    agronomist_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='agronomist_notifications')
-    title = models.CharField(max_length=200)
-    message = models.TextField()
-    notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES, default='general')
-    
-    # Source information (who triggered this notification)
-    source_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='triggered_agronomist_notifications')
-    source_farm = models.ForeignKey(Farm, on_delete=models.SET_NULL, null=True, blank=True)
-    
-    # Reference to original objects
-    related_object_id = models.PositiveIntegerField(null=True, blank=True)
-    related_model_name = models.CharField(max_length=50, null=True, blank=True)  # e.g., 'IssueReport', 'DailyTask'
-    
-    is_read = models.BooleanField(default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
-    
-    class Meta:
-        ordering = ['-created_at']
-        indexes = [
-            models.Index(fields=['agronomist_user', '-created_at']),
-            models.Index(fields=['notification_type']),
-            models.Index(fields=['is_read']),
-        ]
-    
-    def __str__(self):
-        return f"Agronomist Notification: {self.title} - {self.agronomist_user.username}"
-
 class Expenditure(models.Model):
     CATEGORY_CHOICES = (
         ('seeds_plants', 'Seeds/Plants'),
@@ -617,14 +689,18 @@ class Expenditure(models.Model):
     bill_number = models.CharField(max_length=100, blank=True, null=True, help_text="Bill/Invoice number")
     vendor_name = models.CharField(max_length=200, blank=True, null=True, help_text="Supplier/Vendor name")
     
+    # Cost attribution (optional)
+    batch_code = models.CharField(max_length=100, blank=True, null=True, help_text="Crop batch this cost belongs to; leave empty for farm-level costs")
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-expense_date', '-created_at']
         indexes = [
-            models.Index(fields=['farm', '-expense_date']),
-            models.Index(fields=['user', '-expense_date']),
+            models.Index(fields=['farm', '-expense_date', '-id']),
+            models.Index(fields=['farm', 'batch_code']),
+            models.Index(fields=['user', '-expense_date', '-id']),
             models.Index(fields=['category']),
             models.Index(fields=['payment_method']),
             models.Index(fields=['-created_at']),
@@ -696,8 +772,8 @@ class Sale(models.Model):
     class Meta:
         ordering = ['-sale_date', '-created_at']
         indexes = [
-            models.Index(fields=['farm', '-sale_date']),
-            models.Index(fields=['user', '-sale_date']),
+            models.Index(fields=['farm', '-sale_date', '-id']),
+            models.Index(fields=['user', '-sale_date', '-id']),
             models.Index(fields=['payment_status']),
             models.Index(fields=['crop_name']),
             models.Index(fields=['buyer_name']),
@@ -804,8 +880,8 @@ class PlantDiseasePrediction(models.Model):
     class Meta:
         ordering = ['-analysis_timestamp', '-created_at']
         indexes = [
-            models.Index(fields=['farm', '-analysis_timestamp']),
-            models.Index(fields=['user', '-analysis_timestamp']),
+            models.Index(fields=['farm', '-analysis_timestamp', '-id']),
+            models.Index(fields=['user', '-analysis_timestamp', '-id']),
             models.Index(fields=['disease_status']),
             models.Index(fields=['confidence_level']),
             models.Index(fields=['is_resolved']),
@@ -888,6 +964,36 @@ class FarmTask(models.Model):
     def __str__(self):
         return f"{self.title} - {self.farm.name} - {self.user.username}"
 
+class FarmMonthlyFacts(models.Model):
+    """Per farm and month totals, kept current by farms.facts signal handlers"""
+    farm = models.ForeignKey(Farm, on_delete=models.CASCADE, related_name='monthly_facts')
+    month = models.DateField(help_text="First day of the month")
+    
+    sales_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sales_count = models.PositiveIntegerField(default=0)
+    expense_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    water_volume = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Completed fertigation water volume (L)")
+    sprays = models.PositiveIntegerField(default=0)
+    fertigations = models.PositiveIntegerField(default=0)
+    tasks_completed = models.PositiveIntegerField(default=0)
+    issues_opened = models.PositiveIntegerField(default=0)
+    issues_resolved = models.PositiveIntegerField(default=0)
+    yield_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Actual yield of batches harvested this month")
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['farm', '-month']
+        constraints = [
+            models.UniqueConstraint(fields=['farm', 'month'], name='unique_farm_month_facts'),
+        ]
+        indexes = [
+            models.Index(fields=['month', 'farm']),
+        ]
+    
+    def __str__(self):
+        return f"{self.farm.name} - {self.month:%Y-%m}"
+
 @receiver(post_delete, sender=Farm)
 def delete_farm_users(sender, instance, **kwargs):
     for user in instance.users.all():
@@ -0,0 +1,156 @@
+import json
+import logging
+from functools import lru_cache
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+logger = logging.getLogger(__name__)
+
+
+def _readings_message(verb, time_label):
+    """Daily task message with the optional water-measurement sentence."""
+    def render(params):
+        message = f"{params['user']} {verb} daily tasks for {params['farm']}. "
+        message += f"Tasks: {params['tasks'] or 'None'}. "
+        if params.get('measurements'):
+            message += f"Water measurements {'updated' if verb == 'updated' else 'recorded'} for: {params['measurements']}. "
+        message += f"{time_label} at {params['recorded_at']:%H:%M:%S}"
+        return message
+    return render
+
+
+# template id -> (title, message). Strings are str.format templates; the
+# message may also be a callable taking the decoded params. `farm` is always
+# available and comes from the notification's farm.
+NOTIFICATION_TEMPLATES = {
+    # Scheduled notifications
+    'fertigation_due': (
+        "🚿 Fertigation Due: {zone}",
+        "Scheduled fertigation for {zone} at {farm} is now due. Please proceed with the application.",
+    ),
+    'fertigation_overdue': (
+        "⚠️ Fertigation Overdue: {zone}",
+        "Scheduled fertigation for {zone} at {farm} was scheduled for {scheduled_at:%Y-%m-%d %H:%M} but is still pending.",
+    ),
+    'harvest_due': (
+        "🌾 Harvest Due: {crop}",
+        "Crop {crop} ({variety}) in batch {batch} at {farm} is ready for harvest.",
+    ),
+    'harvest_overdue': (
+        "⚠️ Harvest Overdue: {crop}",
+        "Crop {crop} ({variety}) in batch {batch} at {farm} was scheduled for harvest on {harvest_date:%Y-%m-%d} but is still pending.",
+    ),
+    'harvest_overdue_alert': (
+        "🚨 Harvest Overdue: {crop} ({batch})",
+        "The harvest for {crop} ({variety}) - Batch: {batch} was due on {harvest_date:%B %d, %Y} and is now {days} day(s) overdue. Please harvest as soon as possible to avoid quality loss.",
+    ),
+    'harvest_due_today': (
+        "📅 Harvest Due Today: {crop} ({batch})",
+        "Today is the expected harvest date for {crop} ({variety}) - Batch: {batch}. Current stage: {stage}. Growth duration: {growth_days} days.",
+    ),
+    'harvest_reminder': (
+        "⏰ Harvest Reminder: {crop} ({batch})",
+        "Harvest for {crop} ({variety}) - Batch: {batch} is due in {days} day(s) on {harvest_date:%B %d, %Y}. Please prepare for harvesting.",
+    ),
+    'growth_stage_updated': (
+        "🌱 Growth Stage Updated: {crop} ({batch})",
+        "Your {crop} ({variety}) has progressed from {from_stage} to {to_stage} stage after {growth_days} days of growth.",
+    ),
+
+    # Activity notifications
+    'daily_task_submitted': (
+        "Daily Task Submitted",
+        "{user} submitted daily tasks for {farm} at {recorded_at:%H:%M:%S}",
+    ),
+    'daily_task_completed': (
+        "Daily Tasks Completed",
+        _readings_message('completed', 'Submitted'),
+    ),
+    'daily_task_updated': (
+        "Daily Tasks Updated",
+        _readings_message('updated', 'Updated'),
+    ),
+    'issue_report_submitted': (
+        "Issue Report Submitted",
+        "Your issue report has been submitted successfully. Issue Type: {issue_type}, Severity: {severity}",
+    ),
+    'issue_report_received': (
+        "New Issue Report from {user}",
+        "Farm: {farm}, Issue Type: {issue_type}, Severity: {severity}, Description: {description}",
+    ),
+    'fertigation_completed': (
+        "Fertigation Completed: {zone}",
+        "Fertigation activity completed for {zone} at {farm}. EC change: {ec_change:.2f}, pH change: {ph_change:.2f}",
+    ),
+    'fertigation_scheduled': (
+        "Fertigation Scheduled: {zone}",
+        "Fertigation scheduled for {zone} at {farm} on {scheduled_at:%Y-%m-%d %H:%M}",
+    ),
+    'spray_scheduled': (
+        "Spray Schedule Created",
+        "Spray schedule {spray_id} for {zone} has been created. Product: {product}, Date: {scheduled_at:%Y-%m-%d %H:%M}",
+    ),
+    'spray_reminder': (
+        "Spray Reminder Set",
+        "Reminder set for next spray on {zone}. Reminder date: {reminder_at:%Y-%m-%d %H:%M}",
+    ),
+    'spray_completed': (
+        "Spray Application Completed",
+        "Spray {spray_id} for {zone} has been completed. Product: {product}. PHI: {phi} days.",
+    ),
+    'disease_detected': (
+        "Plant Disease & Pest Detected: {diseases}",
+        "Disease detected in {farm}. Location: {location}. Confidence: {confidence}",
+    ),
+    'disease_resolved': (
+        "Plant Disease & Pest Issue Resolved",
+        "Disease issue in {farm} has been marked as resolved by {user}",
+    ),
+}
+
+
+def _decode_params(params):
+    """
+    Params are stored with DjangoJSONEncoder, so datetimes and dates come back
+    as ISO strings. Keys ending in `_at` are datetimes (shown in local time),
+    keys ending in `_date` are dates.
+    """
+    decoded = {}
+    for key, value in params.items():
+        if isinstance(value, str) and key.endswith('_at'):
+            parsed = parse_datetime(value)
+            if parsed is not None:
+                value = timezone.localtime(parsed) if timezone.is_aware(parsed) else parsed
+        elif isinstance(value, str) and key.endswith('_date'):
+            value = parse_date(value[:10]) or value
+        decoded[key] = value
+    return decoded
+
+
+@lru_cache(maxsize=4096)
+def _render_cached(template_id, params_json, farm_name):
+    title_template, message_template = NOTIFICATION_TEMPLATES[template_id]
+    params = _decode_params(json.loads(params_json))
+    params['farm'] = farm_name or 'N/A'
+    try:
+        title = title_template.format_map(params)
+        if callable(message_template):
+            message = message_template(params)
+        else:
+            message = message_template.format_map(params)
+    except (KeyError, ValueError, TypeError) as e:
+        logger.warning(f"Could not render notification template '{template_id}': {str(e)}")
+        return title_template, message_template if isinstance(message_template, str) else ''
+    return title, message
+
+
+def render_notification(template_id, params, farm_name=None):
+    """
+    Render a template notification to (title, message). Results are cached
+    per distinct template/params/farm combination.
+    """
+    if template_id not in NOTIFICATION_TEMPLATES:
+        logger.warning(f"Unknown notification template '{template_id}'")
+        return '', ''
+    params_json = json.dumps(params or {}, sort_keys=True, default=str)
+    return _render_cached(template_id, params_json, farm_name)
@@ -0,0 +1,114 @@
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db.models import F
+from django.utils import timezone
+from .models import Notification, NotificationRecipient
+
+logger = logging.getLogger(__name__)
+
+
+def create_notification(recipients, title='', message='', notification_type='general', farm=None, user=None,
+                        created_by=None, is_farm_wide=False, priority='medium', due_date=None,
+                        related_object_id=None, related_model_name=None, template='', params=None):
+    """
+    Store a notification body once and fan it out to every recipient.
+    `recipients` may contain user instances or user ids. Generated
+    notifications pass a `template` id and `params` instead of title/message.
+    """
+    notification = Notification.objects.create(
+        title=title,
+        message=message,
+        template=template,
+        params=params or {},
+        notification_type=notification_type,
+        farm=farm,
+        user=user,
+        created_by=created_by,
+        is_farm_wide=is_farm_wide,
+        priority=priority,
+        due_date=due_date,
+        related_object_id=related_object_id,
+        related_model_name=related_model_name
+    )
+
+    recipient_ids = {getattr(recipient, 'pk', recipient) for recipient in recipients if recipient is not None}
+    NotificationRecipient.objects.bulk_create([
+        NotificationRecipient(notification=notification, recipient_id=recipient_id)
+        for recipient_id in recipient_ids
+    ])
+    return notification
+
+
+def notifications_for(user):
+    """
+    Notifications delivered to a user, annotated with that user's read state.
+    """
+    return Notification.objects.filter(
+        recipients__recipient=user
+    ).annotate(is_read=F('recipients__is_read'))
+
+
+def mark_notifications_read(user, notification_ids=None):
+    receipts = NotificationRecipient.objects.filter(recipient=user, is_read=False)
+    if notification_ids:
+        receipts = receipts.filter(notification_id__in=notification_ids)
+    return receipts.update(is_read=True)
+
+
+def delete_notifications_for(user, notification_ids=None):
+    """
+    Remove notifications from a user's feed. The body is deleted once
+    no recipient references it anymore.
+    """
+    receipts = NotificationRecipient.objects.filter(recipient=user)
+    if notification_ids:
+        receipts = receipts.filter(notification_id__in=notification_ids)
+    affected_ids = list(receipts.values_list('notification_id', flat=True))
+    deleted_count, _ = receipts.delete()
+    Notification.objects.filter(id__in=affected_ids, recipients__isnull=True).delete()
+    return deleted_count
+
+
+def push_agronomist_notification(notification, agronomist_user, source_user=None, **extra):
+    """
+    Send a stored notification to an agronomist's WebSocket groups and
+    record when it was dispatched. Extra keyword arguments are added to
+    the payload as-is.
+    """
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        return False
+
+    farm = notification.farm
+    user_name = None
+    if source_user:
+        user_name = f"{source_user.first_name} {source_user.last_name}".strip() or source_user.username
+
+    notification_data = {
+        'type': 'notification_message',
+        'title': notification.rendered_title,
+        'message': notification.rendered_message,
+        'notification_type': notification.notification_type,
+        'notification_id': notification.id,
+        'priority': notification.priority,
+        'farm_id': farm.id if farm else None,
+        'farm_name': farm.name if farm else None,
+        'user_id': source_user.id if source_user else None,
+        'user_name': user_name,
+        'timestamp': notification.created_at.isoformat(),
+        **extra
+    }
+
+    try:
+        # Send to the specific agronomist, then to the general group (fallback)
+        async_to_sync(channel_layer.group_send)(f'agronomist_{agronomist_user.id}_notifications', notification_data)
+        async_to_sync(channel_layer.group_send)('agronomist_notifications', notification_data)
+    except Exception as e:
+        logger.error(f"Failed to push notification {notification.id}: {str(e)}")
+        return False
+
+    NotificationRecipient.objects.filter(
+        notification=notification, recipient=agronomist_user
+    ).update(delivered_at=timezone.now())
+    return True
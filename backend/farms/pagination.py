@@ -0,0 +1,153 @@
+import base64
+import binascii
+import json
+from datetime import date, time
+from decimal import Decimal
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.utils.urls import replace_query_param
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def requested_page_size(request, default=DEFAULT_PAGE_SIZE):
+    """?page_size=, capped at MAX_PAGE_SIZE; ValueError when it is not a positive integer"""
+    value = request.query_params.get('page_size')
+    if value is None:
+        return min(default, MAX_PAGE_SIZE)
+    try:
+        page_size = int(value)
+    except ValueError:
+        raise ValueError('page_size must be an integer')
+    if page_size < 1:
+        raise ValueError('page_size must be positive')
+    return min(page_size, MAX_PAGE_SIZE)
+
+
+def _json_value(value):
+    # Full isoformat: DjangoJSONEncoder drops microseconds, which would skip or repeat rows
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(sort, value, pk):
+    payload = json.dumps([sort, _json_value(value), pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor, sort, field):
+    """(value, pk) of a cursor issued for `sort`; ValueError when it is malformed or for another ordering"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        cursor_sort, value, pk = payload
+        if cursor_sort != sort or not isinstance(pk, int):
+            raise ValueError
+        return (None if value is None else field.to_python(value)), pk
+    except (ValueError, TypeError, binascii.Error, ValidationError):
+        raise ValueError('Invalid cursor')
+
+
+def _sort_field(queryset, name):
+    if name in queryset.query.annotations:
+        # Annotations may always be NULL
+        return queryset.query.annotations[name].output_field, True
+    try:
+        field = queryset.model._meta.get_field(name)
+    except FieldDoesNotExist:
+        raise ValueError(f"Cannot paginate on '{name}'")
+    return field, field.null
+
+
+class Keyset:
+    """
+    Rows ordered by (sort key, pk), both in the direction of `sort`
+    ("-created_at" is newest first), with missing values last. Positions
+    are compared on the pair, so a page starts right after the previous
+    one however many rows precede it and whatever was inserted since.
+    """
+
+    def __init__(self, queryset, sort):
+        self.sort = sort
+        self.descending = sort.startswith('-')
+        self.name = sort.lstrip('-')
+        self.field, self.nullable = _sort_field(queryset, self.name)
+        self.by_pk = getattr(self.field, 'primary_key', False)
+
+    def ordering(self):
+        pk = F('pk').desc() if self.descending else F('pk').asc()
+        if self.by_pk:
+            return [pk]
+        key = F(self.name).desc() if self.descending else F(self.name).asc()
+        if self.nullable:
+            key = F(self.name).desc(nulls_last=True) if self.descending else F(self.name).asc(nulls_last=True)
+        return [key, pk]
+
+    def after(self, value, pk):
+        """Rows strictly after (value, pk)"""
+        op = 'lt' if self.descending else 'gt'
+        if self.by_pk:
+            return Q(**{f'pk__{op}': pk})
+        if value is None:
+            return Q(**{f'{self.name}__isnull': True, f'pk__{op}': pk})
+        # The inclusive bound lets the database seek the index instead of filtering from the start
+        rows = Q(**{f'{self.name}__{op}e': value}) & (
+            Q(**{f'{self.name}__{op}': value}) | Q(**{self.name: value, f'pk__{op}': pk})
+        )
+        if self.nullable:
+            rows |= Q(**{f'{self.name}__isnull': True})
+        return rows
+
+    def through(self, value, pk):
+        """Rows up to and including (value, pk)"""
+        op = 'gt' if self.descending else 'lt'
+        if self.by_pk:
+            return Q(**{f'pk__{op}e': pk})
+        if value is None:
+            return Q(**{f'{self.name}__isnull': False}) | Q(**{f'{self.name}__isnull': True, f'pk__{op}e': pk})
+        return Q(**{f'{self.name}__{op}e': value}) & (
+            Q(**{f'{self.name}__{op}': value}) | Q(**{self.name: value, f'pk__{op}e': pk})
+        )
+
+
+def sorted_by(queryset, sort):
+    """`queryset` in the order keyset_page() pages it"""
+    return queryset.order_by(*Keyset(queryset, sort).ordering())
+
+
+def keyset_page(queryset, sort, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    (page queryset, next cursor or None) of `queryset` ordered by `sort`.
+    One query reads the key of the page's last row and whether another
+    follows; the page is then bounded by that key rather than sliced, so
+    it ends exactly where the next cursor starts. Raises ValueError for an
+    invalid cursor or sort key.
+    """
+    keyset = Keyset(queryset, sort)
+    queryset = queryset.order_by(*keyset.ordering())
+    if cursor:
+        queryset = queryset.filter(keyset.after(*decode_cursor(cursor, sort, keyset.field)))
+
+    key = 'pk' if keyset.by_pk else keyset.name
+    bounds = list(queryset.values_list(key, 'pk')[page_size - 1:page_size + 1])
+    if len(bounds) < 2:
+        return queryset, None
+    last_value, last_pk = bounds[0]
+    return queryset.filter(keyset.through(last_value, last_pk)), encode_cursor(sort, last_value, last_pk)
+
+
+def paginate(request, queryset, sort, default_page_size=DEFAULT_PAGE_SIZE):
+    """keyset_page() for the request's ?cursor= and ?page_size="""
+    page_size = requested_page_size(request, default_page_size)
+    return keyset_page(queryset, sort, request.query_params.get('cursor'), page_size)
+
+
+def next_page_headers(request, cursor):
+    """Link / X-Next-Cursor headers pointing at the page after this one"""
+    if cursor is None:
+        return {}
+    url = replace_query_param(request.build_absolute_uri(), 'cursor', cursor)
+    return {'Link': f'<{url}>; rel="next"', 'X-Next-Cursor': cursor}
@@ -0,0 +1,344 @@
+from collections import defaultdict
+from itertools import islice
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework import serializers
+from .alerts import SUMMARY_FIELDS, progress_summary
+from .models import CropStage
+from .notification_templates import render_notification
+from .serializers import (
+    AgronomistNotificationSerializer, CropStageSerializer, DailyTaskSerializer, FertigationSerializer,
+    NotificationSerializer, SaleSerializer,
+)
+
+# Serializer field types whose values are copied from the row unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField, serializers.CharField, serializers.ChoiceField, serializers.IntegerField,
+    serializers.DateField, serializers.JSONField, serializers.PrimaryKeyRelatedField, serializers.ReadOnlyField,
+)
+
+
+class ProjectedRow:
+    """
+    Attribute view of one values() row. Projections subclass it per model
+    and copy the model's own properties and get_FOO_display() methods onto
+    the subclass, so they and serializer methods run unchanged on it.
+    """
+    def __init__(self, values):
+        self.__dict__ = values
+
+
+def _display_method(attname, choices):
+    def get_display(self):
+        value = getattr(self, attname)
+        return choices.get(value, value)
+    return get_display
+
+
+def row_class(model):
+    attrs = {name: value for name, value in vars(model).items() if isinstance(value, (property, cached_property))}
+    for field in model._meta.concrete_fields:
+        if field.choices:
+            attrs[f'get_{field.name}_display'] = _display_method(field.attname, dict(field.flatchoices))
+    return type(f'{model.__name__}Row', (ProjectedRow,), attrs)
+
+
+# Fallback of a field DRF leaves out of the output when its relation is unset
+_SKIP = object()
+
+
+def _localtime(value):
+    return timezone.localtime(value) if value is not None and timezone.is_aware(value) else value
+
+
+def _represent(field, row, source):
+    # Like Serializer.to_representation: a missing attribute falls back to the field default, None stays None
+    if field.default is serializers.empty:
+        value = getattr(row, source)
+    else:
+        value = getattr(row, source, field.default)
+    return None if value is None else field.to_representation(value)
+
+
+class Projection:
+    """
+    Fast read path for a list serializer: rows come from one values_list()
+    query and a function built once per projection turns each tuple
+    into the dict the serializer would have produced.
+
+    Fields map to columns where they can (model fields, `farm.name` style
+    sources, choice displays); anything else - model properties,
+    SerializerMethodFields - is evaluated on a ProjectedRow of the columns
+    the serializer's Meta.field_sources declares for them (all of the
+    model's columns when a field has none). `overrides` maps field name ->
+    (function of the row, extra values() lookups it reads) for fields that
+    follow relations in Python. `attach` maps field name -> function that
+    sets extra attributes on the rows before conversion, run only when
+    that field is selected.
+    """
+
+    def __init__(self, serializer_class, overrides=None, attach=None):
+        self.serializer_class = serializer_class
+        self.serializer = serializer_class()
+        self.model = serializer_class.Meta.model
+        self.overrides = overrides or {}
+        self.attach = attach or {}
+        self.row_class = row_class(self.model)
+        self._compiled = {}
+
+    def _plan(self, annotations, selected):
+        """
+        (columns, needs_row, [(key, kind, detail)], [(key, relation column, fallback)])
+        for the selected readable fields (all of them when `selected` is None).
+        """
+        opts = self.model._meta
+        columns, plan, optional, row_fields = [], [], [], []
+
+        def column(lookup):
+            if lookup not in columns:
+                columns.append(lookup)
+            return columns.index(lookup)
+
+        for name, field in self.serializer.fields.items():
+            if field.write_only or (selected is not None and name not in selected):
+                continue
+            source = field.source
+            if name in self.overrides:
+                function, lookups = self.overrides[name]
+                for lookup in lookups:
+                    column(lookup)
+                plan.append((name, 'override', function))
+                row_fields.append(name)
+            elif isinstance(field, serializers.SerializerMethodField):
+                plan.append((name, 'method', getattr(self.serializer, field.method_name)))
+                row_fields.append(name)
+            elif source.startswith('get_') and source.endswith('_display'):
+                model_field = opts.get_field(source[4:-8])
+                plan.append((name, 'display', (column(model_field.attname), dict(model_field.flatchoices))))
+            elif '.' in source:
+                relation = opts.get_field(source.split('.')[0])
+                plan.append((name, self._kind(field), column(source.replace('.', '__'))))
+                if relation.null:
+                    # DRF skips a field whose relation is unset unless it has a default or allows null
+                    via = column(relation.attname)
+                    if field.default is not serializers.empty:
+                        optional.append((name, via, field.default))
+                    elif field.allow_null:
+                        optional.append((name, via, None))
+                    else:
+                        optional.append((name, via, _SKIP))
+            elif source in annotations:
+                plan.append((name, self._kind(field), column(source)))
+            else:
+                try:
+                    model_field = opts.get_field(source)
+                except FieldDoesNotExist:
+                    # Model property
+                    plan.append((name, 'attribute', (source, field)))
+                    row_fields.append(name)
+                    continue
+                if model_field.many_to_many or model_field.one_to_many or isinstance(model_field, models.FileField):
+                    raise ValueError(f'{self.serializer.__class__.__name__}.{name} cannot be projected')
+                plan.append((name, self._kind(field), column(model_field.attname)))
+
+        if row_fields:
+            lookups = self.serializer_class.field_lookups(row_fields, annotations)
+            if lookups is None:
+                lookups = [field.attname for field in opts.concrete_fields]
+            column(opts.pk.attname)
+            # Annotations stand in for the model properties of the same name, as on model instances
+            for annotation in sorted(annotations):
+                column(annotation)
+            for lookup in lookups:
+                try:
+                    column(opts.get_field(lookup).attname)
+                except FieldDoesNotExist:
+                    column(lookup)
+        return columns, bool(row_fields), plan, optional
+
+    @staticmethod
+    def _kind(field):
+        if isinstance(field, serializers.DateTimeField):
+            return 'datetime'
+        if isinstance(field, serializers.DecimalField):
+            return 'decimal'
+        if isinstance(field, PASSTHROUGH_FIELDS):
+            return 'value'
+        raise ValueError(f'{field.__class__.__name__} cannot be projected')
+
+    def _getter(self, key, kind, detail):
+        """Function of (values, row) returning the representation of one field"""
+        if kind == 'value':
+            return lambda v, r: v[detail]
+        if kind == 'datetime':
+            return lambda v, r: _localtime(v[detail])
+        if kind == 'decimal':
+            field = self.serializer.fields[key]
+            return lambda v, r: None if v[detail] is None else field.to_representation(v[detail])
+        if kind == 'display':
+            column, choices = detail
+            return lambda v, r: choices.get(v[column], v[column])
+        if kind == 'attribute':
+            source, field = detail
+            return lambda v, r: _represent(field, r, source)
+        return lambda v, r: detail(r)
+
+    def _compile(self, annotations, selected):
+        """Build `convert(values, row)` once per set of annotations and fields."""
+        columns, needs_row, plan, optional = self._plan(annotations, selected)
+        getters = [(key, self._getter(key, kind, detail)) for key, kind, detail in plan]
+
+        def convert(v, r):
+            d = {key: getter(v, r) for key, getter in getters}
+            for key, via, fallback in optional:
+                if v[via] is None:
+                    if fallback is _SKIP:
+                        del d[key]
+                    else:
+                        d[key] = fallback
+            return d
+
+        attach = [function for name, function in self.attach.items() if selected is None or name in selected]
+        return columns, needs_row, attach, convert
+
+    def _compiled_for(self, queryset, fields):
+        annotations = frozenset(queryset.query.annotations)
+        key = (annotations, None if fields is None else frozenset(fields))
+        if key not in self._compiled:
+            self._compiled[key] = self._compile(*key)
+        return self._compiled[key]
+
+    def _convert(self, compiled, values):
+        columns, needs_row, attach, convert = compiled
+        if not needs_row:
+            return [convert(value, None) for value in values]
+
+        row_class = self.row_class
+        rows = [row_class(dict(zip(columns, value))) for value in values]
+        for function in attach:
+            function(rows)
+        return [convert(value, row) for value, row in zip(values, rows)]
+
+    def rows(self, queryset, fields=None):
+        """
+        Serialized rows of `queryset`, equal to
+        `serializer_class(queryset, many=True, selected_fields=fields).data`.
+        """
+        compiled = self._compiled_for(queryset, fields)
+        return self._convert(compiled, list(queryset.values_list(*compiled[0])))
+
+    def chunks(self, queryset, fields=None, chunk_size=2000):
+        """
+        rows() in lists of up to `chunk_size`, read through a database
+        iterator so only one chunk is held in memory at a time.
+        """
+        compiled = self._compiled_for(queryset, fields)
+        values = queryset.values_list(*compiled[0]).iterator(chunk_size=chunk_size)
+        while chunk := list(islice(values, chunk_size)):
+            yield self._convert(compiled, chunk)
+
+
+# Projections of the hot list endpoints
+
+def _rendered(row):
+    if not row.template:
+        return row.title, row.message
+    return render_notification(row.template, row.params, row.farm__name)
+
+
+def _full_name(prefix):
+    def full_name(row):
+        username = getattr(row, f'{prefix}__username')
+        if username is None:
+            return None
+        name = f"{getattr(row, f'{prefix}__first_name')} {getattr(row, f'{prefix}__last_name')}".strip()
+        return name or username
+    return full_name
+
+
+def _person_lookups(prefix):
+    return (f'{prefix}__username', f'{prefix}__first_name', f'{prefix}__last_name')
+
+
+_RENDER_LOOKUPS = ('farm__name',)
+
+NOTIFICATION_LIST = Projection(NotificationSerializer, overrides={
+    'title': (lambda row: _rendered(row)[0], _RENDER_LOOKUPS),
+    'message': (lambda row: _rendered(row)[1], _RENDER_LOOKUPS),
+    'user_full_name': (_full_name('user'), _person_lookups('user')),
+})
+
+AGRONOMIST_NOTIFICATION_LIST = Projection(AgronomistNotificationSerializer, overrides={
+    'title': (lambda row: _rendered(row)[0], _RENDER_LOOKUPS),
+    'message': (lambda row: _rendered(row)[1], _RENDER_LOOKUPS),
+    'source_user_full_name': (_full_name('created_by'), _person_lookups('created_by')),
+})
+
+DAILY_TASK_LIST = Projection(DailyTaskSerializer)
+
+_CROP_STAGE_NAMES = dict(CropStage.CROP_STAGES)
+
+
+def _crop_stage_info(row):
+    if row.crop_stage_id is None:
+        return None
+    return {
+        'id': row.crop_stage_id,
+        'crop_name': row.crop_stage__crop_name,
+        'variety': row.crop_stage__variety,
+        'batch_code': row.crop_stage__batch_code,
+        'current_stage': row.crop_stage__current_stage,
+        'current_stage_display': _CROP_STAGE_NAMES.get(row.crop_stage__current_stage, row.crop_stage__current_stage),
+    }
+
+
+FERTIGATION_LIST = Projection(FertigationSerializer, overrides={
+    'crop_stage_info': (_crop_stage_info, (
+        'crop_stage__crop_name', 'crop_stage__variety', 'crop_stage__batch_code', 'crop_stage__current_stage',
+    )),
+})
+
+SALE_LIST = Projection(SaleSerializer)
+
+
+def _attach_recent_logs(rows):
+    recent_logs = defaultdict(list)
+    for log in CropStageSerializer.recent_logs_queryset().filter(crop_stage_id__in=[row.id for row in rows]):
+        recent_logs[log.crop_stage_id].append(log)
+    for row in rows:
+        row.recent_logs = recent_logs[row.id]
+
+
+def _progress_summary(row):
+    today = timezone.localdate()
+    if row.alert__computed_on == today:
+        return {name: getattr(row, f'alert__{name}') for name in SUMMARY_FIELDS}
+    return progress_summary(row, today)
+
+
+CROP_STAGE_LIST = Projection(
+    CropStageSerializer,
+    overrides={
+        'progress_summary': (_progress_summary, tuple(f'alert__{name}' for name in SUMMARY_FIELDS + ('computed_on',))),
+    },
+    attach={'recent_activities': _attach_recent_logs},
+)
+
+PROJECTIONS = (
+    NOTIFICATION_LIST, AGRONOMIST_NOTIFICATION_LIST, DAILY_TASK_LIST, FERTIGATION_LIST, SALE_LIST, CROP_STAGE_LIST,
+)
+
+
+@checks.register()
+def check_projections(app_configs, **kwargs):
+    """Fail at startup, not at request time, when a serializer field cannot be projected"""
+    errors = []
+    for projection in PROJECTIONS:
+        try:
+            projection._compile(frozenset(), None)
+        except (ValueError, FieldDoesNotExist) as e:
+            errors.append(checks.Error(str(e), obj=projection.serializer_class, id='farms.E001'))
+    return errors
@@ -1,6 +1,17 @@
+from django.db.models import Count, F, Prefetch, Q, Window
+from django.db.models.functions import RowNumber
 from rest_framework import serializers
-from .models import Farm, DailyTask, Notification, SprayIrrigationLog, SpraySchedule, CropStage, Fertigation, Worker, WorkerTask, IssueReport, AgronomistNotification, Expenditure, Sale, PlantDiseasePrediction, FarmTask
+from .models import Farm, DailyTask, Notification, SprayIrrigationLog, SpraySchedule, CropStage, CropAlert, Fertigation, Worker, WorkerTask, IssueReport, Expenditure, Sale, PlantDiseasePrediction, FarmTask
+from accounts.models import CustomUser
 from accounts.serializers import UserSerializer
+from .alerts import SUMMARY_FIELDS, SUMMARY_SOURCES, progress_summary, stored_summary
+from .fields import SparseFieldsetMixin
+
+# Lookups read by rendered notification text and by crop_stage_info summaries
+RENDER_SOURCES = ('template', 'params', 'title', 'message', 'farm', 'farm__name')
+CROP_STAGE_INFO_SOURCES = (
+    'crop_stage', 'crop_stage__crop_name', 'crop_stage__variety', 'crop_stage__batch_code', 'crop_stage__current_stage',
+)
 
 class FarmSerializer(serializers.ModelSerializer):
     users_details = UserSerializer(source='users', many=True, read_only=True)
@@ -12,13 +23,53 @@ class FarmSerializer(serializers.ModelSerializer):
                  'users_details', 'created_by', 'created_by_details', 'is_active', 
                  'created_at', 'updated_at')
         read_only_fields = ('id', 'created_by', 'created_at', 'updated_at')
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('created_by').prefetch_related('users')
+
+class FarmListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Compact farm for lists and pickers: assigned user ids and a count
+    instead of nested profiles, which ?expand=users adds back
+    """
+    created_by_username = serializers.CharField(source='created_by.username', read_only=True, default=None)
+    user_count = serializers.SerializerMethodField()
+    users_details = UserSerializer(source='users', many=True, read_only=True)
+    created_by_details = UserSerializer(source='created_by', read_only=True)
+    
+    class Meta:
+        model = Farm
+        fields = ('id', 'name', 'location', 'size_in_acres', 'description', 'users', 'user_count',
+                 'users_details', 'created_by', 'created_by_username', 'created_by_details',
+                 'is_active', 'created_at', 'updated_at')
+        read_only_fields = fields
+        expandable_fields = {'users': ('users_details', 'created_by_details')}
+        field_sources = {'user_count': ()}
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Two queries for any number of farms: farms with their creator, then assigned user ids"""
+        return queryset.select_related('created_by').prefetch_related(
+            Prefetch('users', queryset=CustomUser.objects.only('id'))
+        )
+    
+    @classmethod
+    def eager_queryset(cls, queryset, selected):
+        if 'users_details' in selected:
+            # Expanded profiles need whole user rows
+            return queryset.select_related('created_by').prefetch_related('users')
+        return super().eager_queryset(queryset, selected)
+    
+    def get_user_count(self, obj):
+        return len(obj.users.all())
 
 class CreateFarmSerializer(serializers.ModelSerializer):
     class Meta:
         model = Farm
         fields = ('name', 'location', 'size_in_acres', 'description')
 
-class DailyTaskSerializer(serializers.ModelSerializer):
+class DailyTaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     farm_name = serializers.CharField(source='farm.name', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
     
@@ -26,16 +77,24 @@ class DailyTaskSerializer(serializers.ModelSerializer):
         model = DailyTask
         fields = '__all__'
         read_only_fields = ('user', 'created_at', 'updated_at')
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('farm', 'user')
 
 class CreateDailyTaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = DailyTask
         exclude = ('user', 'created_at', 'updated_at')
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    title = serializers.CharField(source='rendered_title', read_only=True)
+    message = serializers.CharField(source='rendered_message', read_only=True)
     farm_name = serializers.CharField(source='farm.name', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
     user_full_name = serializers.SerializerMethodField()
+    # Read state is per recipient; feeds annotate it on the queryset
+    is_read = serializers.BooleanField(read_only=True, default=False)
     is_overdue = serializers.ReadOnlyField()
     time_until_due = serializers.ReadOnlyField()
     
@@ -45,6 +104,13 @@ class NotificationSerializer(serializers.ModelSerializer):
                  'user', 'user_name', 'user_full_name', 'is_read', 'due_date', 
                  'is_overdue', 'time_until_due', 'related_object_id', 'created_at')
         read_only_fields = ('id', 'created_at', 'is_overdue', 'time_until_due')
+        field_sources = {
+            'title': RENDER_SOURCES,
+            'message': RENDER_SOURCES,
+            'user_full_name': ('user__username', 'user__first_name', 'user__last_name'),
+            'is_overdue': ('due_date',),
+            'time_until_due': ('due_date',),
+        }
     
     def get_user_full_name(self, obj):
         if obj.user:
@@ -53,27 +119,41 @@ class NotificationSerializer(serializers.ModelSerializer):
         return None
 
 
-class AgronomistNotificationSerializer(serializers.ModelSerializer):
-    source_user_name = serializers.CharField(source='source_user.username', read_only=True)
-    source_farm_name = serializers.CharField(source='source_farm.name', read_only=True)
+class AgronomistNotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Agronomist feed view of a notification: the user and farm that
+    triggered it are exposed as source_user/source_farm.
+    """
+    title = serializers.CharField(source='rendered_title', read_only=True)
+    message = serializers.CharField(source='rendered_message', read_only=True)
+    source_user = serializers.PrimaryKeyRelatedField(source='created_by', read_only=True)
+    source_user_name = serializers.CharField(source='created_by.username', read_only=True)
+    source_farm = serializers.PrimaryKeyRelatedField(source='farm', read_only=True)
+    source_farm_name = serializers.CharField(source='farm.name', read_only=True)
     source_user_full_name = serializers.SerializerMethodField()
+    is_read = serializers.BooleanField(read_only=True, default=False)
     
     class Meta:
-        model = AgronomistNotification
+        model = Notification
         fields = ('id', 'title', 'message', 'notification_type', 'source_user', 
                  'source_user_name', 'source_user_full_name', 'source_farm', 
                  'source_farm_name', 'related_object_id', 'related_model_name',
                  'is_read', 'created_at')
         read_only_fields = ('id', 'created_at')
+        field_sources = {
+            'title': RENDER_SOURCES,
+            'message': RENDER_SOURCES,
+            'source_user_full_name': ('created_by__username', 'created_by__first_name', 'created_by__last_name'),
+        }
     
     def get_source_user_full_name(self, obj):
-        if obj.source_user:
-            full_name = f"{obj.source_user.first_name} {obj.source_user.last_name}".strip()
-            return full_name if full_name else obj.source_user.username
+        if obj.created_by:
+            full_name = f"{obj.created_by.first_name} {obj.created_by.last_name}".strip()
+            return full_name if full_name else obj.created_by.username
         return None
 
 
-class SprayIrrigationLogSerializer(serializers.ModelSerializer):
+class SprayIrrigationLogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     farm_name = serializers.CharField(source='farm.name', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
     crop_stage_info = serializers.SerializerMethodField()
@@ -83,6 +163,14 @@ class SprayIrrigationLogSerializer(serializers.ModelSerializer):
         model = SprayIrrigationLog
         fields = '__all__'
         read_only_fields = ('user', 'created_at', 'updated_at')
+        field_sources = {
+            'crop_stage_info': CROP_STAGE_INFO_SOURCES + ('crop_stage__transplant_date',),
+            'has_image': ('image_data',),
+        }
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('farm', 'user', 'crop_stage')
     
     def get_has_image(self, obj):
         return bool(obj.image_data)
@@ -105,7 +193,7 @@ class CreateSprayIrrigationLogSerializer(serializers.ModelSerializer):
         model = SprayIrrigationLog
         exclude = ('user', 'created_at', 'updated_at')
 
-class CropStageSerializer(serializers.ModelSerializer):
+class CropStageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     farm_name = serializers.CharField(source='farm.name', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
     growth_duration_days = serializers.ReadOnlyField()
@@ -119,14 +207,49 @@ class CropStageSerializer(serializers.ModelSerializer):
     stage_recommendations = serializers.SerializerMethodField()
     progress_summary = serializers.SerializerMethodField()
     
+    RECENT_ACTIVITY_LIMIT = 5
+    
     class Meta:
         model = CropStage
         fields = '__all__'
         read_only_fields = ('user', 'created_at', 'updated_at')
+        field_sources = {
+            'growth_duration_days': ('transplant_date',),
+            'days_in_current_stage': ('stage_start_date', 'stage_end_date'),
+            'days_to_harvest': ('expected_harvest_date',),
+            'yield_efficiency': ('expected_yield', 'actual_yield'),
+            'is_overdue': ('expected_harvest_date', 'actual_harvest_date'),
+            'recent_activities': (),
+            'stage_recommendations': ('current_stage', 'transplant_date'),
+            'progress_summary': SUMMARY_SOURCES + tuple(f'alert__{name}' for name in SUMMARY_FIELDS + ('computed_on',)),
+        }
+    
+    @classmethod
+    def recent_logs_queryset(cls):
+        """
+        The latest spray/irrigation logs of every stage: ROW_NUMBER() OVER
+        (PARTITION BY crop_stage_id ORDER BY date DESC) keeps the top logs.
+        """
+        return SprayIrrigationLog.objects.annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=[F('crop_stage_id')],
+                order_by=[F('date').desc(), F('id').desc()],
+            )
+        ).filter(row_number__lte=cls.RECENT_ACTIVITY_LIMIT).order_by('-date', '-id')
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load farm/user/alert and the recent logs of every stage in the list with one extra query"""
+        return queryset.select_related('farm', 'user', 'alert').prefetch_related(
+            Prefetch('spray_irrigation_logs', queryset=cls.recent_logs_queryset(), to_attr='recent_logs')
+        )
     
     def get_recent_activities(self, obj):
         """Get recent spray/irrigation activities for this crop stage"""
-        recent_logs = obj.spray_irrigation_logs.order_by('-date')[:5]
+        recent_logs = getattr(obj, 'recent_logs', None)
+        if recent_logs is None:
+            recent_logs = obj.spray_irrigation_logs.order_by('-date', '-id')[:self.RECENT_ACTIVITY_LIMIT]
         activities = []
         for log in recent_logs:
             activity = {
@@ -199,71 +322,40 @@ class CropStageSerializer(serializers.ModelSerializer):
         return recommendations
     
     def get_progress_summary(self, obj):
-        """Get comprehensive progress summary for crop stage"""
+        """Read from the materialized CropAlert; computed here when it is missing or out of date"""
         from django.utils import timezone
         
-        summary = {
-            'timeline_status': 'on_track',
-            'health_alert': False,
-            'stage_progress': 0,
-            'yield_status': 'unknown',
-            'next_action': None,
-            'alerts': []
-        }
-        
-        current_date = timezone.localtime().date()
-        
-        # Timeline status
-        if obj.expected_harvest_date:
-            if obj.is_overdue:
-                summary['timeline_status'] = 'overdue'
-                summary['alerts'].append('Harvest is overdue')
-            elif obj.days_to_harvest is not None:
-                if obj.days_to_harvest <= 3:
-                    summary['timeline_status'] = 'due_soon'
-                    summary['alerts'].append(f'Harvest due in {obj.days_to_harvest} days')
-        
-        # Health alerts
-        if obj.health_status == 'needs_attention':
-            summary['health_alert'] = True
-            summary['alerts'].append('Crop needs immediate attention')
-        elif obj.health_status == 'moderate':
-            summary['alerts'].append('Monitor crop health closely')
-        
-        # Stage progress calculation
-        if obj.stage_start_date and obj.stage_end_date:
-            total_stage_days = (obj.stage_end_date - obj.stage_start_date).days
-            days_passed = (current_date - obj.stage_start_date).days
-            if total_stage_days > 0:
-                summary['stage_progress'] = min(100, max(0, int((days_passed / total_stage_days) * 100)))
-        
-        # Yield status
-        if obj.expected_yield:
-            if obj.actual_yield:
-                efficiency = obj.yield_efficiency
-                if efficiency >= 90:
-                    summary['yield_status'] = 'excellent'
-                elif efficiency >= 75:
-                    summary['yield_status'] = 'good'
-                elif efficiency >= 60:
-                    summary['yield_status'] = 'fair'
-                else:
-                    summary['yield_status'] = 'poor'
-            else:
-                summary['yield_status'] = 'pending'
-        
-        # Next action recommendation
-        stage_actions = {
-            'germination': 'Monitor moisture and temperature',
-            'seedling': 'Ensure adequate light and ventilation',
-            'vegetative': 'Apply nitrogen fertilizer and prune',
-            'flowering': 'Monitor for pests and diseases',
-            'fruiting': 'Support branches and maintain watering',
-            'harvest': 'Plan harvest schedule'
+        today = timezone.localdate()
+        return stored_summary(getattr(obj, 'alert', None), today) or progress_summary(obj, today)
+
+class CropAlertSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    crop_name = serializers.CharField(source='crop_stage.crop_name', read_only=True)
+    variety = serializers.CharField(source='crop_stage.variety', read_only=True)
+    batch_code = serializers.CharField(source='crop_stage.batch_code', read_only=True)
+    current_stage = serializers.CharField(source='crop_stage.current_stage', read_only=True)
+    farm_name = serializers.CharField(source='farm.name', read_only=True)
+    timeline_status_display = serializers.CharField(source='get_timeline_status_display', read_only=True)
+    is_stale = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = CropAlert
+        fields = ('crop_stage', 'crop_name', 'variety', 'batch_code', 'current_stage', 'farm', 'farm_name',
+                 'user', 'timeline_status', 'timeline_status_display', 'health_alert', 'stage_progress',
+                 'yield_status', 'next_action', 'alerts', 'alert_count', 'computed_on', 'is_stale')
+        read_only_fields = fields
+        field_sources = {
+            'is_stale': ('computed_on',),
         }
-        summary['next_action'] = stage_actions.get(obj.current_stage, 'Continue monitoring')
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('crop_stage', 'farm')
+    
+    def get_is_stale(self, obj):
+        """True until the nightly refresh brings a summary from an earlier day up to today"""
+        from django.utils import timezone
         
-        return summary
+        return obj.computed_on < timezone.localdate()
 
 class CreateCropStageSerializer(serializers.ModelSerializer):
     health_status = serializers.CharField(default='healthy', required=False)
@@ -311,7 +403,7 @@ class CreateCropStageSerializer(serializers.ModelSerializer):
         
         return super().update(instance, validated_data)
 
-class FertigationSerializer(serializers.ModelSerializer):
+class FertigationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     farm_name = serializers.CharField(source='farm.name', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
     crop_stage_info = serializers.SerializerMethodField()
@@ -322,6 +414,16 @@ class FertigationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Fertigation
         fields = '__all__'
+        field_sources = {
+            'crop_stage_info': CROP_STAGE_INFO_SOURCES,
+            'ec_change': ('ec_before', 'ec_after'),
+            'ph_change': ('ph_before', 'ph_after'),
+            'total_nutrients_cost': ('nutrients_used',),
+        }
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('farm', 'user', 'crop_stage')
         
     def get_crop_stage_info(self, obj):
         if obj.crop_stage:
@@ -395,7 +497,7 @@ class CreateFertigationSerializer(serializers.ModelSerializer):
 
 
 
-class WorkerSerializer(serializers.ModelSerializer):
+class WorkerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     farm_name = serializers.CharField(source='farm.name', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
     employment_type_display = serializers.CharField(source='get_employment_type_display', read_only=True)
@@ -407,10 +509,22 @@ class WorkerSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('user', 'created_at', 'updated_at')
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Count active/completed tasks and join farm and user in the list query itself"""
+        return queryset.select_related('farm', 'user').annotate(
+            active_tasks=Count('tasks', filter=Q(tasks__status__in=['pending', 'issue'])),
+            completed_tasks=Count('tasks', filter=Q(tasks__status='completed')),
+        )
+    
     def get_active_tasks_count(self, obj):
+        if hasattr(obj, 'active_tasks'):
+            return obj.active_tasks
         return obj.tasks.filter(status__in=['pending', 'issue']).count()
     
     def get_completed_tasks_count(self, obj):
+        if hasattr(obj, 'completed_tasks'):
+            return obj.completed_tasks
         return obj.tasks.filter(status='completed').count()
 
 class CreateWorkerSerializer(serializers.ModelSerializer):
@@ -418,7 +532,7 @@ class CreateWorkerSerializer(serializers.ModelSerializer):
         model = Worker
         exclude = ('user', 'created_at', 'updated_at')
 
-class WorkerTaskSerializer(serializers.ModelSerializer):
+class WorkerTaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     worker_id = serializers.IntegerField(source='worker.id', read_only=True)
     worker_name = serializers.CharField(source='worker.name', read_only=True)
     worker_employment_type = serializers.CharField(source='worker.employment_type', read_only=True)
@@ -434,6 +548,10 @@ class WorkerTaskSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('user', 'created_at', 'updated_at')
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('worker', 'farm', 'user')
+    
     def get_assigned_date_display(self, obj):
         return obj.assigned_date.strftime('%B %d, %Y')
     
@@ -452,7 +570,7 @@ class UpdateWorkerTaskSerializer(serializers.ModelSerializer):
         model = WorkerTask
         fields = ('status', 'remarks', 'completion_notes')
 
-class IssueReportSerializer(serializers.ModelSerializer):
+class IssueReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     issue_type_display = serializers.CharField(source='get_issue_type_display', read_only=True)
     severity_display = serializers.CharField(source='get_severity_display', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -464,6 +582,10 @@ class IssueReportSerializer(serializers.ModelSerializer):
                  'photo_evidence', 'severity', 'severity_display', 'status', 'status_display',
                  'resolution_notes', 'agronomist_username', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('agronomist_user')
 
 class CreateIssueReportSerializer(serializers.ModelSerializer):
     class Meta:
@@ -488,7 +610,7 @@ class UpdateIssueReportSerializer(serializers.ModelSerializer):
         fields = ('status', 'resolution_notes')
 
 
-class SprayScheduleSerializer(serializers.ModelSerializer):
+class SprayScheduleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     farm_name = serializers.CharField(source='farm.name', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
     crop_stage_info = serializers.SerializerMethodField()
@@ -502,6 +624,17 @@ class SprayScheduleSerializer(serializers.ModelSerializer):
         model = SpraySchedule
         fields = '__all__'
         read_only_fields = ('user', 'created_at', 'updated_at', 'spray_id')
+        field_sources = {
+            'crop_stage_info': CROP_STAGE_INFO_SOURCES + ('crop_stage__transplant_date',),
+            'days_until_harvest_safe': ('completion_date', 'phi_log'),
+            'is_phi_complete': ('completion_date', 'phi_log'),
+            'is_reminder_due': ('next_spray_reminder',),
+            'has_image': ('image_data',),
+        }
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('farm', 'user', 'crop_stage')
     
     def get_has_image(self, obj):
         return bool(obj.image_data)
@@ -562,7 +695,7 @@ class UpdateSprayScheduleSerializer(serializers.ModelSerializer):
         return data
 
 # Expenditure Management Serializers
-class ExpenditureSerializer(serializers.ModelSerializer):
+class ExpenditureSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     category_display = serializers.CharField(source='get_category_display', read_only=True)
     payment_method_display = serializers.CharField(source='get_payment_method_display', read_only=True)
     farm_name = serializers.CharField(source='farm.name', read_only=True)
@@ -575,6 +708,10 @@ class ExpenditureSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('user', 'created_at', 'updated_at')
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('farm', 'user')
+    
     def get_expense_date_display(self, obj):
         return obj.expense_date.strftime('%B %d, %Y')
 
@@ -592,7 +729,7 @@ class UpdateExpenditureSerializer(serializers.ModelSerializer):
     class Meta:
         model = Expenditure
         fields = ('expense_title', 'category', 'amount', 'payment_method', 'expense_date', 
-                 'notes', 'bill_number', 'vendor_name')
+                 'notes', 'bill_number', 'vendor_name', 'batch_code')
     
     def validate_amount(self, value):
         if value <= 0:
@@ -600,7 +737,7 @@ class UpdateExpenditureSerializer(serializers.ModelSerializer):
         return value
 
 # Sale Management Serializers
-class SaleSerializer(serializers.ModelSerializer):
+class SaleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     payment_status_display = serializers.CharField(source='get_payment_status_display', read_only=True)
     unit_display = serializers.CharField(source='get_unit_display', read_only=True)
     farm_name = serializers.CharField(source='farm.name', read_only=True)
@@ -618,6 +755,20 @@ class SaleSerializer(serializers.ModelSerializer):
         model = Sale
         fields = '__all__'
         read_only_fields = ('user', 'total_amount', 'created_at', 'updated_at')
+        field_sources = {
+            'total_amount_display': ('total_amount',),
+            'price_per_unit_display': ('price_per_unit', 'unit'),
+            'remaining_amount': ('total_amount', 'amount_received'),
+            'remaining_amount_display': ('total_amount', 'amount_received'),
+            'payment_completion_percentage': ('total_amount', 'amount_received'),
+            'net_amount': ('total_amount', 'transportation_cost', 'commission_amount'),
+            'net_amount_display': ('total_amount', 'transportation_cost', 'commission_amount'),
+            'sale_date_display': ('sale_date',),
+        }
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('farm', 'user')
     
     def get_sale_date_display(self, obj):
         return obj.sale_date.strftime('%B %d, %Y')
@@ -730,7 +881,7 @@ class UpdatePlantDiseasePredictionSerializer(serializers.ModelSerializer):
         model = PlantDiseasePrediction
         fields = ('user_notes', 'location_in_farm', 'is_resolved', 'actions_taken')
 
-class PlantDiseasePredictionListSerializer(serializers.ModelSerializer):
+class PlantDiseasePredictionListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Optimized serializer for listing multiple predictions"""
     farm_name = serializers.CharField(source='farm.name', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
@@ -746,6 +897,10 @@ class PlantDiseasePredictionListSerializer(serializers.ModelSerializer):
                  'disease_status', 'confidence_level', 'confidence_score',
                  'primary_disease_name', 'disease_count', 'severity_level',
                  'location_in_farm', 'is_resolved', 'analysis_timestamp')
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('farm', 'user', 'crop_stage')
 
     def get_primary_disease_name(self, obj):
         primary = obj.primary_disease
@@ -754,7 +909,7 @@ class PlantDiseasePredictionListSerializer(serializers.ModelSerializer):
 
 
 
-class FarmTaskSerializer(serializers.ModelSerializer):
+class FarmTaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     farm_name = serializers.CharField(source='farm.name', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
     user_full_name = serializers.SerializerMethodField()
@@ -770,6 +925,10 @@ class FarmTaskSerializer(serializers.ModelSerializer):
                  'image_data', 'is_overdue', 'created_at', 'updated_at')
         read_only_fields = ('id', 'user', 'completed_at', 'created_at', 'updated_at')
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('farm', 'user')
+    
     def get_user_full_name(self, obj):
         if obj.user:
             full_name = f"{obj.user.first_name} {obj.user.last_name}".strip()
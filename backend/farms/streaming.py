@@ -0,0 +1,54 @@
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from farm_management.renderers import ORJSONRenderer
+
+STREAM_CHUNK_SIZE = 500
+
+
+def wants_stream(request):
+    """?stream=true asks for the whole list as one streamed JSON array"""
+    return request.query_params.get('stream', '').lower() in ('1', 'true')
+
+
+def serialized_chunks(queryset, serializer_class, selected=None, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Serializer output for `queryset` in lists of up to `chunk_size`. Rows
+    come from a database iterator, and prefetches run once per chunk.
+    """
+    instances = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(instances, chunk_size)):
+        yield serializer_class(chunk, many=True, selected_fields=selected).data
+
+
+def json_array(chunks):
+    """Encode lists of rows as the bytes of one JSON array, a chunk at a time"""
+    renderer = ORJSONRenderer()
+    yield b'['
+    separator = b''
+    for rows in chunks:
+        if rows:
+            # Each chunk renders as "[...]"; its elements join the outer array
+            yield separator + renderer.render(rows)[1:-1]
+            separator = b','
+    yield b']'
+
+
+async def _async_chunks(chunks):
+    # Each step runs on the thread the view ran on, which holds its database connection
+    step = sync_to_async(next, thread_sensitive=True)
+    while (chunk := await step(chunks, None)) is not None:
+        yield chunk
+
+
+def streaming_json_response(request, chunks):
+    """
+    StreamingHttpResponse of a JSON array. Under ASGI the content is an
+    async iterator; Django would otherwise read a sync one into memory
+    before sending it.
+    """
+    content = json_array(chunks)
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        content = _async_chunks(content)
+    return StreamingHttpResponse(content, content_type='application/json')
@@ -7,6 +7,9 @@ from asgiref.sync import async_to_sync
 import logging
 
 from .models import Fertigation, Notification, CropStage
+from .notifications import create_notification
+from .alerts import refresh_crop_alerts
+from .facts import reconcile_monthly_facts
 
 logger = logging.getLogger(__name__)
 
@@ -63,15 +66,15 @@ def process_fertigation_notifications(channel_layer, now):
             ).first()
             
             if not existing_notification:
-                notification = Notification.objects.create(
-                    title=f"🚿 Fertigation Due: {fertigation.crop_zone_name}",
-                    message=f"Scheduled fertigation for {fertigation.crop_zone_name} at {fertigation.farm.name} is now due. Please proceed with the application.",
+                notification = create_notification(
+                    [fertigation.user],
+                    template='fertigation_due',
+                    params={'zone': fertigation.crop_zone_name},
                     notification_type='fertigation_due',
                     farm=fertigation.farm,
                     user=fertigation.user,
                     due_date=fertigation.date_time,
-                    related_object_id=fertigation.id,
-                    is_read=False
+                    related_object_id=fertigation.id
                 )
                 
                 send_websocket_notification(channel_layer, notification)
@@ -104,21 +107,21 @@ def process_fertigation_notifications(channel_layer, now):
                 if due_notification:
                     # Update the existing due notification to overdue
                     due_notification.notification_type = 'fertigation_overdue'
-                    due_notification.title = f"⚠️ Fertigation Overdue: {fertigation.crop_zone_name}"
-                    due_notification.message = f"Scheduled fertigation for {fertigation.crop_zone_name} at {fertigation.farm.name} was scheduled for {fertigation.date_time.strftime('%Y-%m-%d %H:%M')} but is still pending."
+                    due_notification.template = 'fertigation_overdue'
+                    due_notification.params = {'zone': fertigation.crop_zone_name, 'scheduled_at': fertigation.date_time}
                     due_notification.save()
                     notification = due_notification
                 else:
                     # Create new overdue notification
-                    notification = Notification.objects.create(
-                        title=f"⚠️ Fertigation Overdue: {fertigation.crop_zone_name}",
-                        message=f"Scheduled fertigation for {fertigation.crop_zone_name} at {fertigation.farm.name} was scheduled for {fertigation.date_time.strftime('%Y-%m-%d %H:%M')} but is still pending.",
+                    notification = create_notification(
+                        [fertigation.user],
+                        template='fertigation_overdue',
+                        params={'zone': fertigation.crop_zone_name, 'scheduled_at': fertigation.date_time},
                         notification_type='fertigation_overdue',
                         farm=fertigation.farm,
                         user=fertigation.user,
                         due_date=fertigation.date_time,
-                        related_object_id=fertigation.id,
-                        is_read=False
+                        related_object_id=fertigation.id
                     )
                 
                 send_websocket_notification(channel_layer, notification)
@@ -156,15 +159,15 @@ def process_harvest_notifications(channel_layer, now):
                     timezone.datetime.combine(crop_stage.expected_harvest_date, timezone.datetime.min.time())
                 )
                 
-                notification = Notification.objects.create(
-                    title=f"🌾 Harvest Due: {crop_stage.crop_name}",
-                    message=f"Crop {crop_stage.crop_name} ({crop_stage.variety}) in batch {crop_stage.batch_code} at {crop_stage.farm.name} is ready for harvest.",
+                notification = create_notification(
+                    [crop_stage.user],
+                    template='harvest_due',
+                    params={'crop': crop_stage.crop_name, 'variety': crop_stage.variety, 'batch': crop_stage.batch_code},
                     notification_type='harvest_due',
                     farm=crop_stage.farm,
                     user=crop_stage.user,
                     due_date=harvest_datetime,
-                    related_object_id=crop_stage.id,
-                    is_read=False
+                    related_object_id=crop_stage.id
                 )
                 
                 send_websocket_notification(channel_layer, notification)
@@ -200,20 +203,20 @@ def process_harvest_notifications(channel_layer, now):
                 
                 if due_notification:
                     due_notification.notification_type = 'harvest_overdue'
-                    due_notification.title = f"⚠️ Harvest Overdue: {crop_stage.crop_name}"
-                    due_notification.message = f"Crop {crop_stage.crop_name} ({crop_stage.variety}) in batch {crop_stage.batch_code} at {crop_stage.farm.name} was scheduled for harvest on {crop_stage.expected_harvest_date.strftime('%Y-%m-%d')} but is still pending."
+                    due_notification.template = 'harvest_overdue'
+                    due_notification.params = {'crop': crop_stage.crop_name, 'variety': crop_stage.variety, 'batch': crop_stage.batch_code, 'harvest_date': crop_stage.expected_harvest_date}
                     due_notification.save()
                     notification = due_notification
                 else:
-                    notification = Notification.objects.create(
-                        title=f"⚠️ Harvest Overdue: {crop_stage.crop_name}",
-                        message=f"Crop {crop_stage.crop_name} ({crop_stage.variety}) in batch {crop_stage.batch_code} at {crop_stage.farm.name} was scheduled for harvest on {crop_stage.expected_harvest_date.strftime('%Y-%m-%d')} but is still pending.",
+                    notification = create_notification(
+                        [crop_stage.user],
+                        template='harvest_overdue',
+                        params={'crop': crop_stage.crop_name, 'variety': crop_stage.variety, 'batch': crop_stage.batch_code, 'harvest_date': crop_stage.expected_harvest_date},
                         notification_type='harvest_overdue',
                         farm=crop_stage.farm,
                         user=crop_stage.user,
                         due_date=harvest_datetime,
-                        related_object_id=crop_stage.id,
-                        is_read=False
+                        related_object_id=crop_stage.id
                     )
                 
                 send_websocket_notification(channel_layer, notification)
@@ -236,8 +239,8 @@ def send_websocket_notification(channel_layer, notification):
                     "type": "notification",
                     "notification": {
                         "id": notification.id,
-                        "title": notification.title,
-                        "message": notification.message,
+                        "title": notification.rendered_title,
+                        "message": notification.rendered_message,
                         "type": notification.notification_type,
                         "due_date": notification.due_date.isoformat() if notification.due_date else None,
                         "is_overdue": notification.is_overdue,
@@ -257,10 +260,11 @@ def send_agronomist_notification(channel_layer, notification, farm_user):
             try:
                 notification_data = {
                     "type": "notification_message",
-                    "title": notification.title,
-                    "message": f"Farm User: {farm_user.username} - {notification.message}",
+                    "title": notification.rendered_title,
+                    "message": f"Farm User: {farm_user.username} - {notification.rendered_message}",
                     "notification_type": notification.notification_type,
                     "notification_id": notification.id,
+                    "priority": notification.priority,
                     "farm_id": notification.farm.id if notification.farm else None,
                     "farm_name": notification.farm.name if notification.farm else None,
                     "user_id": farm_user.id,
@@ -282,14 +286,15 @@ def send_agronomist_notification(channel_layer, notification, farm_user):
 @shared_task
 def cleanup_old_notifications():
     """
-    Clean up old read notifications older than 30 days.
+    Clean up notifications older than 30 days that every recipient has read.
     Runs daily to keep the database clean.
     """
     try:
         cutoff_date = timezone.now() - timedelta(days=30)
         deleted_count = Notification.objects.filter(
-            is_read=True,
             created_at__lt=cutoff_date
+        ).exclude(
+            recipients__is_read=False
         ).delete()[0]
         
         logger.info(f"Cleaned up {deleted_count} old notifications")
@@ -297,4 +302,37 @@ def cleanup_old_notifications():
         
     except Exception as e:
         logger.error(f"Error cleaning up notifications: {str(e)}")
-        return {'status': 'error', 'message': str(e)}
\ No newline at end of file
+        return {'status': 'error', 'message': str(e)}
+
+@shared_task
+def reconcile_farm_monthly_facts():
+    """
+    Rebuild FarmMonthlyFacts from the source tables and fix any cells the
+    signal handlers missed (bulk updates, raw SQL, failed commits).
+    Runs nightly.
+    """
+    try:
+        result = reconcile_monthly_facts()
+        logger.info(f"Reconciled farm monthly facts: {result}")
+        return {'status': 'success', **result}
+        
+    except Exception as e:
+        logger.error(f"Error reconciling farm monthly facts: {str(e)}")
+        return {'status': 'error', 'message': str(e)}
+
+@shared_task
+def refresh_all_crop_alerts():
+    """
+    Recompute every crop alert for the new day, so date-driven transitions
+    (harvest due soon or overdue, stage progress) show up without an edit
+    and rows missed by the save signal (bulk updates) are fixed.
+    Runs nightly just after midnight.
+    """
+    try:
+        refreshed = refresh_crop_alerts(CropStage.objects.all())
+        logger.info(f"Refreshed {refreshed} crop alerts")
+        return {'status': 'success', 'refreshed': refreshed}
+        
+    except Exception as e:
+        logger.error(f"Error refreshing crop alerts: {str(e)}")
+        return {'status': 'error', 'message': str(e)}
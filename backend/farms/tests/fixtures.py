@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from farms.alerts import refresh_crop_alerts
+from farms.facts import reconcile_monthly_facts
+from farms.models import (
+    CropStage, DailyTask, Expenditure, Farm, FarmTask, Fertigation, IssueReport, Notification, PlantDiseasePrediction,
+    Sale, SprayIrrigationLog, SpraySchedule, Worker, WorkerTask,
+)
+from farms.notifications import create_notification
+
+User = get_user_model()
+
+
+def seed(scale):
+    """
+    `scale` farms for the users under test, each with `scale` rows of
+    every kind, plus `scale` more farm users. Returns the users by role and
+    the first instance of each model for detail URLs.
+    """
+    superuser = User.objects.create_superuser(username='_budget_superuser', password=None)
+    agronomist = User.objects.create_user(username='_budget_agronomist', password=None, user_type='agronomist')
+    farm_user = User.objects.create_user(
+        username='_budget_farm_user', password=None, user_type='farm_user', created_by=agronomist,
+    )
+    colleagues = [
+        User.objects.create_user(
+            username=f'_budget_farm_user_{index}', password=None, user_type='farm_user', created_by=agronomist,
+        )
+        for index in range(scale)
+    ]
+    fixture = {User: farm_user}
+
+    today = date.today()
+    now = timezone.now()
+    for _ in range(scale):
+        farm = Farm.objects.create(name='Budget farm', location='-', size_in_acres=10, created_by=agronomist)
+        farm.users.add(farm_user, *colleagues)
+        fixture.setdefault(Farm, farm)
+        for index in range(scale):
+            day = today - timedelta(days=index)
+            owned = {'farm': farm, 'user': farm_user}
+            worker = Worker.objects.create(
+                **owned, name=f'Worker {index}', employment_type='permanent', wage_per_day=500,
+            )
+            rows = [
+                worker,
+                # Up to yesterday, so today's submission is still open
+                DailyTask.objects.create(**owned, date=day - timedelta(days=1)),
+                CropStage.objects.create(
+                    **owned, crop_name='Tomato', variety='Hybrid', batch_code=f'B{index}',
+                    transplant_date=day, current_stage='harvest', area=1, number_of_plants=100,
+                    expected_yield=100, actual_yield=90, losses=5, actual_harvest_date=day,
+                ),
+                SprayIrrigationLog.objects.create(**owned, date=day, activity_type='spray'),
+                SpraySchedule.objects.create(
+                    **owned, crop_zone='Zone A', date_time=now, product_used='-', dose_concentration='-',
+                    reason='pest', phi_log=7, worker_name=worker.name,
+                ),
+                Fertigation.objects.create(
+                    **owned, crop_zone_name='Zone A', date_time=now, operator_name='-', status='completed',
+                    ec_before=1, ph_before=6, ec_after=2, ph_after=6, water_volume=100,
+                ),
+                WorkerTask.objects.create(
+                    **owned, worker=worker, task_description='-', assigned_date=day,
+                    status='completed' if index % 2 else 'pending',
+                ),
+                IssueReport.objects.create(
+                    farm=farm, farm_user=farm_user, agronomist_user=agronomist, issue_type='pest',
+                    description='-', severity='low',
+                ),
+                Expenditure.objects.create(
+                    **owned, expense_title='-', category='labor', amount=100, payment_method='cash',
+                    expense_date=day,
+                ),
+                Sale.objects.create(
+                    **owned, crop_name='Tomato', batch_code=f'B{index}', buyer_name='-', sale_date=day,
+                    quantity_sold=10, price_per_unit=20,
+                ),
+                PlantDiseasePrediction.objects.create(
+                    **owned, image_data='-', disease_status='healthy', confidence_level='high', ai_analysis='-',
+                ),
+                FarmTask.objects.create(**owned, title='-'),
+            ]
+            for row in rows:
+                fixture.setdefault(type(row), row)
+            notification = create_notification(
+                [farm_user], title='Budget', message='-', farm=farm, user=farm_user, created_by=agronomist,
+            )
+            fixture.setdefault(Notification, notification)
+            create_notification(
+                [agronomist], title='Budget', message='-', farm=farm, user=farm_user, created_by=farm_user,
+            )
+
+    # Crop alerts and monthly facts as the nightly jobs leave them
+    refresh_crop_alerts(CropStage.objects.all())
+    reconcile_monthly_facts(log_drift=False)
+    return {'superuser': superuser, 'agronomist': agronomist, 'farm_user': farm_user}, fixture
@@ -0,0 +1,26 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from .fixtures import seed
+
+# Queries of one dashboard request with the KPI cache cold, however many farms the user has
+DASHBOARD_QUERIES = 7
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+class FarmUserDashboardQueryTests(TestCase):
+    def assert_dashboard_queries(self, farms):
+        users, _ = seed(farms)
+        client = APIClient()
+        client.force_authenticate(users['farm_user'])
+        with self.assertNumQueries(DASHBOARD_QUERIES):
+            response = client.get(reverse('farm_user_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_one_farm(self):
+        self.assert_dashboard_queries(1)
+
+    def test_many_farms(self):
+        data = self.assert_dashboard_queries(8)
+        self.assertEqual(data['total_farms'], 8)
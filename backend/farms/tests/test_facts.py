@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+from django.test import TestCase
+from farms.facts import reconcile_monthly_facts
+from farms.models import Expenditure, Farm, FarmMonthlyFacts, Sale
+from .fixtures import seed
+
+NO_DRIFT = {'created': 0, 'updated': 0, 'deleted': 0}
+
+
+class MonthlyFactsSignalTests(TestCase):
+    """The signals keep FarmMonthlyFacts equal to what the nightly reconcile rebuilds"""
+
+    @classmethod
+    def setUpTestData(cls):
+        users, cls.fixture = seed(2)
+        cls.farm_user = users['farm_user']
+
+    def assert_no_drift(self):
+        self.assertEqual(reconcile_monthly_facts(log_drift=False), NO_DRIFT)
+
+    def test_create_update_and_delete(self):
+        farm = self.fixture[Farm]
+        with self.captureOnCommitCallbacks(execute=True):
+            sale = Sale.objects.create(
+                farm=farm, user=self.farm_user, crop_name='Tomato', buyer_name='-', sale_date=date(2020, 1, 15),
+                quantity_sold=3, price_per_unit=7,
+            )
+        self.assert_no_drift()
+
+        # Moving a row to another month updates both months
+        with self.captureOnCommitCallbacks(execute=True):
+            sale.sale_date = date(2020, 3, 1)
+            sale.quantity_sold = 5
+            sale.save()
+        self.assert_no_drift()
+        january = FarmMonthlyFacts.objects.get(farm=farm, month=date(2020, 1, 1))
+        self.assertEqual((january.sales_amount, january.sales_count), (0, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sale.delete()
+            Expenditure.objects.filter(farm=farm).delete()
+        self.assert_no_drift()
+
+    def test_cascaded_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fixture[Farm].created_by.delete()
+        self.assert_no_drift()
+
+    def test_date_given_as_a_string(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Sale.objects.create(
+                farm=self.fixture[Farm], user=self.farm_user, crop_name='Tomato', buyer_name='-',
+                sale_date=(date.today() - timedelta(days=40)).isoformat(), quantity_sold=1, price_per_unit=2,
+            )
+        self.assert_no_drift()
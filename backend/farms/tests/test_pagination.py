@@ -0,0 +1,71 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from farms.models import CropStage, Sale
+from farms.pagination import keyset_page, sorted_by
+from .fixtures import seed
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users, cls.fixture = seed(3)
+        cls.farm_user = users['farm_user']
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.farm_user)
+
+    def follow(self, url, params):
+        """ids of every page of `url`, following X-Next-Cursor"""
+        ids, cursor = [], None
+        while True:
+            response = self.client.get(url, {**params, **({'cursor': cursor} if cursor else {})})
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data), params['page_size'])
+            ids.extend(row['id'] for row in response.data)
+            cursor = response.get('X-Next-Cursor')
+            if cursor is None:
+                self.assertNotIn('Link', response)
+                return ids
+            self.assertIn(f'cursor={cursor}', response['Link'])
+
+    def test_pages_cover_every_row_once(self):
+        ids = self.follow(reverse('sales'), {'page_size': 2})
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(set(ids), set(Sale.objects.filter(user=self.farm_user).values_list('id', flat=True)))
+
+    def test_pages_keep_the_order_on_ties(self):
+        # Every fixture crop is a Tomato, so only the pk orders the rows
+        farm = self.fixture[CropStage].farm
+        ids = self.follow(reverse('farm_crop_stages', args=[farm.id]), {'page_size': 2, 'ordering': 'crop_name'})
+        expected = sorted_by(CropStage.objects.filter(farm=farm), 'crop_name').values_list('id', flat=True)
+        self.assertEqual(ids, list(expected))
+
+    def test_default_and_maximum_page_size(self):
+        queryset = Sale.objects.filter(user=self.farm_user)
+        page, cursor = keyset_page(queryset, '-sale_date', page_size=queryset.count())
+        self.assertEqual(page.count(), queryset.count())
+        self.assertIsNone(cursor)
+        response = self.client.get(reverse('sales'), {'page_size': 10 ** 6})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), queryset.count())
+
+    def test_invalid_cursor(self):
+        for cursor in ('garbage', 'W10'):
+            response = self.client.get(reverse('sales'), {'cursor': cursor})
+            self.assertEqual(response.status_code, 400)
+
+    def test_cursor_for_another_ordering(self):
+        farm = self.fixture[CropStage].farm
+        url = reverse('farm_crop_stages', args=[farm.id])
+        response = self.client.get(url, {'page_size': 1, 'ordering': 'crop_name'})
+        cursor = response['X-Next-Cursor']
+        response = self.client.get(url, {'page_size': 1, 'ordering': '-created_at', 'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_page_size(self):
+        for page_size in ('0', '-1', 'ten'):
+            response = self.client.get(reverse('sales'), {'page_size': page_size})
+            self.assertEqual(response.status_code, 400)
@@ -0,0 +1,61 @@
+import json
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from farm_management.renderers import ORJSONRenderer
+from farms.models import CropStage, DailyTask, Fertigation, Sale
+from farms.notifications import notifications_for
+from farms.projections import CROP_STAGE_LIST, DAILY_TASK_LIST, FERTIGATION_LIST, NOTIFICATION_LIST, SALE_LIST
+from farms.serializers import (
+    CropStageSerializer, DailyTaskSerializer, FertigationSerializer, NotificationSerializer, SaleSerializer,
+)
+from farms.streaming import json_array
+from .fixtures import seed
+
+
+class ProjectionParityTests(TestCase):
+    """The values() projections render exactly what their serializers do"""
+
+    @classmethod
+    def setUpTestData(cls):
+        users, _ = seed(2)
+        cls.farm_user = users['farm_user']
+
+    def cases(self):
+        user = self.farm_user
+        return [
+            (NotificationSerializer, NOTIFICATION_LIST,
+             notifications_for(user).select_related('farm', 'user').order_by('-created_at')),
+            (DailyTaskSerializer, DAILY_TASK_LIST, DailyTask.objects.filter(user=user)),
+            (FertigationSerializer, FERTIGATION_LIST, Fertigation.objects.filter(user=user)),
+            (SaleSerializer, SALE_LIST, Sale.objects.filter(user=user)),
+            (CropStageSerializer, CROP_STAGE_LIST, CropStage.objects.filter(user=user)),
+        ]
+
+    def serialized(self, serializer_class, queryset, selected=None):
+        if selected is None:
+            selected = serializer_class.select_fields()
+        queryset = serializer_class.eager_queryset(queryset, selected)
+        return json.loads(JSONRenderer().render(serializer_class(queryset, many=True, selected_fields=selected).data))
+
+    def test_rows_match_the_serializer(self):
+        for serializer_class, projection, queryset in self.cases():
+            with self.subTest(serializer_class.__name__):
+                expected = self.serialized(serializer_class, queryset.all())
+                self.assertTrue(expected)
+                self.assertEqual(json.loads(ORJSONRenderer().render(projection.rows(queryset.all()))), expected)
+
+    def test_streamed_chunks_match_the_serializer(self):
+        for serializer_class, projection, queryset in self.cases():
+            with self.subTest(serializer_class.__name__):
+                # Chunk size 1 puts a boundary between every row
+                streamed = b''.join(json_array(projection.chunks(queryset.all(), chunk_size=1)))
+                self.assertEqual(json.loads(streamed), self.serialized(serializer_class, queryset.all()))
+
+    def test_selected_fields_match_the_serializer(self):
+        for serializer_class, projection, queryset in self.cases():
+            with self.subTest(serializer_class.__name__):
+                selected = serializer_class.select_fields(fields=['id', *list(serializer_class().fields)[-2:]])
+                expected = self.serialized(serializer_class, queryset.all(), selected)
+                self.assertEqual({key for row in expected for key in row}, set(selected))
+                rows = projection.rows(queryset.all(), selected)
+                self.assertEqual(json.loads(ORJSONRenderer().render(rows)), expected)
@@ -0,0 +1,471 @@
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, resolve, reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+from farms.models import (
+    CropStage, DailyTask, Expenditure, Farm, FarmTask, Fertigation, IssueReport, Notification, PlantDiseasePrediction,
+    Sale, SpraySchedule, Worker, WorkerTask,
+)
+from .fixtures import seed
+
+User = get_user_model()
+
+# Rows of every kind per farm, and farms per user, in the large fixture
+SCALE = 10
+
+# Password of the farm user for the login and password routes
+PASSWORD = 'budget-password'
+
+WRITE_METHODS = ('post', 'put', 'patch', 'delete')
+
+# URL namespaces (by path prefix) whose GET endpoints are checked
+CHECKED_PREFIXES = ('api/farms/', 'api/auth/')
+
+# URL name -> (user, URL kwarg -> fixture model, maximum queries per request).
+# A budget must hold at every fixture scale, so it also catches per-row queries.
+QUERY_BUDGETS = {
+    # farms
+    'get_farms': ('agronomist', {}, 2),
+    'farm_detail': ('agronomist', {'farm_id': Farm}, 4),
+    'farm_portfolio': ('agronomist', {}, 1),
+    'my_farms': ('farm_user', {}, 2),
+    'debug_farm_assignments': ('superuser', {}, 4),
+    'farm_user_dashboard': ('farm_user', {}, 7),
+    'farm_user_notifications': ('farm_user', {}, 2),
+    'agronomist_notifications': ('agronomist', {}, 3),
+    'farm_specific_dashboard': ('farm_user', {'farm_id': Farm}, 12),
+    'farm_daily_tasks': ('farm_user', {'farm_id': Farm}, 3),
+    'farm_daily_task_detail': ('farm_user', {'farm_id': Farm, 'task_id': DailyTask}, 4),
+    'farm_crop_stages': ('farm_user', {'farm_id': Farm}, 4),
+    'farm_crop_stage_detail': ('farm_user', {'farm_id': Farm, 'stage_id': CropStage}, 5),
+    'farm_notifications': ('farm_user', {'farm_id': Farm}, 4),
+    'farm_sales': ('farm_user', {'farm_id': Farm}, 2),
+    'farm_spray_schedules': ('farm_user', {'farm_id': Farm}, 3),
+    'farm_spray_schedule_detail': ('farm_user', {'farm_id': Farm, 'schedule_id': SpraySchedule}, 4),
+    'farm_fertigations': ('farm_user', {'farm_id': Farm}, 3),
+    'farm_fertigation_detail': ('farm_user', {'farm_id': Farm, 'pk': Fertigation}, 4),
+    'farm_water_quality_trend': ('farm_user', {'farm_id': Farm}, 3),
+    'farm_workers': ('farm_user', {'farm_id': Farm}, 3),
+    'farm_worker_detail': ('farm_user', {'farm_id': Farm, 'worker_id': Worker}, 6),
+    'farm_worker_tasks': ('farm_user', {'farm_id': Farm}, 3),
+    'farm_worker_task_detail': ('farm_user', {'farm_id': Farm, 'task_id': WorkerTask}, 5),
+    'farm_issue_reports': ('farm_user', {'farm_id': Farm}, 3),
+    'farm_issue_report_detail': ('farm_user', {'farm_id': Farm, 'issue_id': IssueReport}, 3),
+    'farm_expenditures': ('farm_user', {'farm_id': Farm}, 3),
+    'farm_expenditure_detail': ('farm_user', {'farm_id': Farm, 'expenditure_id': Expenditure}, 4),
+    'farm_tasks': ('farm_user', {'farm_id': Farm}, 2),
+    'farm_task_detail': ('farm_user', {'farm_id': Farm, 'task_id': FarmTask}, 2),
+    'farm_tasks_summary': ('farm_user', {'farm_id': Farm}, 6),
+    'daily_tasks': ('farm_user', {}, 2),
+    'daily_task_detail': ('farm_user', {'task_id': DailyTask}, 3),
+    'notifications': ('farm_user', {}, 2),
+    'spray_irrigation_logs': ('farm_user', {}, 2),
+    'crop_stages': ('farm_user', {}, 3),
+    'crop_stage_detail': ('farm_user', {'stage_id': CropStage}, 4),
+    'export_crop_stages': ('farm_user', {}, 1),
+    'yield_analytics': ('agronomist', {}, 2),
+    'crop_alerts': ('agronomist', {}, 2),
+    'fertigations': ('farm_user', {}, 2),
+    'fertigation_detail': ('farm_user', {'pk': Fertigation}, 3),
+    'fertigation_analytics': ('farm_user', {}, 3),
+    'fertigation_schedule': ('farm_user', {}, 2),
+    'workers': ('farm_user', {}, 2),
+    'worker_detail': ('farm_user', {'worker_id': Worker}, 5),
+    'worker_tasks': ('farm_user', {}, 2),
+    'worker_task_detail': ('farm_user', {'task_id': WorkerTask}, 4),
+    'worker_dashboard_summary': ('farm_user', {}, 8),
+    'labor_analytics': ('farm_user', {}, 2),
+    'issue_reports': ('farm_user', {}, 2),
+    'issue_report_detail': ('farm_user', {'issue_id': IssueReport}, 2),
+    'spray_schedules': ('farm_user', {}, 2),
+    'spray_schedule_detail': ('farm_user', {'schedule_id': SpraySchedule}, 3),
+    'spray_schedule_analytics': ('farm_user', {}, 3),
+    'expenditures': ('farm_user', {}, 2),
+    'expenditure_detail': ('farm_user', {'expenditure_id': Expenditure}, 3),
+    'expenditure_analytics': ('farm_user', {}, 2),
+    'expenditure_series': ('farm_user', {}, 1),
+    'sales': ('farm_user', {}, 2),
+    'sale_detail': ('farm_user', {'sale_id': Sale}, 3),
+    'sale_analytics': ('farm_user', {}, 3),
+    'profit_and_loss_report': ('farm_user', {}, 3),
+    'get_plant_disease_predictions': ('farm_user', {}, 4),
+    'get_plant_disease_prediction_detail': ('farm_user', {'prediction_id': PlantDiseasePrediction}, 2),
+    # accounts
+    'user_profile': ('farm_user', {}, 0),
+    'get_farm_users': ('agronomist', {}, 1),
+    'manage_farm_user': ('agronomist', {'user_id': User}, 1),
+    'get_all_users': ('superuser', {}, 1),
+    'get_agronomists': ('superuser', {}, 1),
+}
+
+# URL name -> query parameter -> fixture model, for endpoints that require one
+QUERY_PARAMS = {
+    'get_plant_disease_predictions': {'farm_id': Farm},
+}
+
+# List endpoints also measured with ?stream=true, the whole list read from streaming_content
+STREAMED_BUDGETS = {
+    'sales': 1,
+    'farm_crop_stages': 3,
+    'notifications': 1,
+    'farm_workers': 2,
+}
+
+# (URL name, method) -> (user, URL kwarg -> fixture model, maximum queries per request),
+# measured with the request body in WRITE_PAYLOADS and its on_commit callbacks run
+WRITE_BUDGETS = {
+    # farms
+    ('create_farm', 'post'): ('agronomist', {}, 3),
+    ('farm_detail', 'put'): ('agronomist', {'farm_id': Farm}, 5),
+    ('farm_detail', 'delete'): ('agronomist', {'farm_id': Farm}, 3),
+    ('agronomist_notifications', 'post'): ('agronomist', {}, 5),
+    ('farm_daily_tasks', 'post'): ('farm_user', {'farm_id': Farm}, 7),
+    ('farm_daily_task_detail', 'put'): ('farm_user', {'farm_id': Farm, 'task_id': DailyTask}, 9),
+    ('farm_daily_task_detail', 'delete'): ('farm_user', {'farm_id': Farm, 'task_id': DailyTask}, 3),
+    ('farm_crop_stages', 'post'): ('farm_user', {'farm_id': Farm}, 6),
+    ('farm_crop_stage_detail', 'put'): ('farm_user', {'farm_id': Farm, 'stage_id': CropStage}, 11),
+    ('farm_crop_stage_detail', 'delete'): ('farm_user', {'farm_id': Farm, 'stage_id': CropStage}, 10),
+    ('farm_notifications', 'post'): ('agronomist', {'farm_id': Farm}, 5),
+    ('farm_notifications', 'put'): ('farm_user', {'farm_id': Farm}, 2),
+    ('farm_sales', 'post'): ('farm_user', {'farm_id': Farm}, 8),
+    ('farm_spray_schedules', 'post'): ('farm_user', {'farm_id': Farm}, 9),
+    ('farm_spray_schedule_detail', 'put'): ('farm_user', {'farm_id': Farm, 'schedule_id': SpraySchedule}, 8),
+    ('farm_spray_schedule_detail', 'delete'): ('farm_user', {'farm_id': Farm, 'schedule_id': SpraySchedule}, 5),
+    ('farm_fertigations', 'post'): ('farm_user', {'farm_id': Farm}, 9),
+    ('farm_fertigation_detail', 'put'): ('farm_user', {'farm_id': Farm, 'pk': Fertigation}, 14),
+    ('farm_fertigation_detail', 'delete'): ('farm_user', {'farm_id': Farm, 'pk': Fertigation}, 5),
+    ('farm_workers', 'post'): ('farm_user', {'farm_id': Farm}, 5),
+    ('farm_worker_detail', 'put'): ('farm_user', {'farm_id': Farm, 'worker_id': Worker}, 7),
+    ('farm_worker_detail', 'delete'): ('farm_user', {'farm_id': Farm, 'worker_id': Worker}, 5),
+    ('farm_worker_tasks', 'post'): ('farm_user', {'farm_id': Farm}, 4),
+    ('farm_worker_task_detail', 'put'): ('farm_user', {'farm_id': Farm, 'task_id': WorkerTask}, 6),
+    ('farm_worker_task_detail', 'delete'): ('farm_user', {'farm_id': Farm, 'task_id': WorkerTask}, 3),
+    ('farm_issue_reports', 'post'): ('farm_user', {'farm_id': Farm}, 2),
+    ('farm_issue_report_detail', 'put'): ('farm_user', {'farm_id': Farm, 'issue_id': IssueReport}, 8),
+    ('farm_issue_report_detail', 'delete'): ('farm_user', {'farm_id': Farm, 'issue_id': IssueReport}, 6),
+    ('farm_expenditures', 'post'): ('farm_user', {'farm_id': Farm}, 9),
+    ('farm_expenditure_detail', 'put'): ('farm_user', {'farm_id': Farm, 'expenditure_id': Expenditure}, 14),
+    ('farm_expenditure_detail', 'delete'): ('farm_user', {'farm_id': Farm, 'expenditure_id': Expenditure}, 5),
+    ('farm_tasks', 'post'): ('farm_user', {'farm_id': Farm}, 3),
+    ('farm_task_detail', 'put'): ('farm_user', {'farm_id': Farm, 'task_id': FarmTask}, 4),
+    ('farm_task_detail', 'delete'): ('farm_user', {'farm_id': Farm, 'task_id': FarmTask}, 3),
+    ('daily_tasks', 'post'): ('farm_user', {}, 5),
+    ('daily_task_detail', 'put'): ('farm_user', {'task_id': DailyTask}, 8),
+    ('daily_task_detail', 'delete'): ('farm_user', {'task_id': DailyTask}, 2),
+    ('notifications', 'put'): ('farm_user', {}, 1),
+    ('notifications', 'delete'): ('farm_user', {}, 5),
+    ('spray_irrigation_logs', 'post'): ('farm_user', {}, 3),
+    ('crop_stages', 'post'): ('farm_user', {}, 6),
+    ('crop_stage_detail', 'put'): ('farm_user', {'stage_id': CropStage}, 10),
+    ('crop_stage_detail', 'delete'): ('farm_user', {'stage_id': CropStage}, 9),
+    ('import_crop_stages', 'post'): ('farm_user', {}, 8),
+    ('fertigations', 'post'): ('farm_user', {}, 12),
+    ('fertigation_detail', 'put'): ('farm_user', {'pk': Fertigation}, 14),
+    ('fertigation_detail', 'delete'): ('farm_user', {'pk': Fertigation}, 4),
+    ('fertigation_schedule', 'post'): ('farm_user', {}, 8),
+    ('workers', 'post'): ('farm_user', {}, 5),
+    ('worker_detail', 'put'): ('farm_user', {'worker_id': Worker}, 6),
+    ('worker_detail', 'delete'): ('farm_user', {'worker_id': Worker}, 4),
+    ('worker_tasks', 'post'): ('farm_user', {}, 4),
+    ('worker_task_detail', 'put'): ('farm_user', {'task_id': WorkerTask}, 5),
+    ('worker_task_detail', 'delete'): ('farm_user', {'task_id': WorkerTask}, 2),
+    ('issue_reports', 'post'): ('farm_user', {}, 10),
+    ('issue_report_detail', 'put'): ('farm_user', {'issue_id': IssueReport}, 7),
+    ('issue_report_detail', 'delete'): ('farm_user', {'issue_id': IssueReport}, 5),
+    ('spray_schedules', 'post'): ('farm_user', {}, 10),
+    ('spray_schedule_detail', 'put'): ('farm_user', {'schedule_id': SpraySchedule}, 7),
+    ('spray_schedule_detail', 'delete'): ('farm_user', {'schedule_id': SpraySchedule}, 5),
+    ('expenditures', 'post'): ('farm_user', {}, 9),
+    ('expenditure_detail', 'put'): ('farm_user', {'expenditure_id': Expenditure}, 13),
+    ('expenditure_detail', 'delete'): ('farm_user', {'expenditure_id': Expenditure}, 4),
+    ('sales', 'post'): ('farm_user', {}, 9),
+    ('sale_detail', 'put'): ('farm_user', {'sale_id': Sale}, 13),
+    ('sale_detail', 'delete'): ('farm_user', {'sale_id': Sale}, 4),
+    ('update_plant_disease_prediction', 'put'): ('farm_user', {'prediction_id': PlantDiseasePrediction}, 5),
+    # accounts
+    ('login', 'post'): ('farm_user', {}, 1),
+    ('user_profile', 'put'): ('farm_user', {}, 1),
+    ('change_password', 'post'): ('farm_user', {}, 1),
+    ('create_farm_user', 'post'): ('agronomist', {}, 2),
+    ('manage_farm_user', 'put'): ('agronomist', {'user_id': User}, 2),
+    ('manage_farm_user', 'delete'): ('agronomist', {'user_id': User}, 56),
+    ('reset_user_password', 'post'): ('agronomist', {'user_id': User}, 3),
+    ('create_agronomist', 'post'): ('superuser', {}, 2),
+}
+
+# Write routes without a budget: analyze_plant_disease calls the Gemini API
+UNMEASURED_WRITES = {('analyze_plant_disease', 'post')}
+
+# Writes whose cascades delete in batches of the database's parameter limit, so
+# only the budget at the large fixture is checked
+BATCHED_WRITES = {('manage_farm_user', 'delete')}
+
+CROP_STAGE_CSV = (
+    'crop_name,variety,batch_code,farm_id,transplant_date,current_stage\n'
+    'Tomato,Hybrid,CSV1,{farm},2024-01-01,seedling\n'
+    'Tomato,Hybrid,CSV2,{farm},2024-01-01,vegetative\n'
+)
+
+# Request bodies; a model class stands for the pk of its fixture instance, and a
+# callable is called with the fixture for bodies that cannot be reused (uploads)
+WRITE_PAYLOADS = {
+    ('create_farm', 'post'): {'name': 'New farm', 'location': '-', 'size_in_acres': 5, 'users': [User]},
+    ('farm_detail', 'put'): {'name': 'Renamed farm', 'users': [User]},
+    ('agronomist_notifications', 'post'): {'farm_id': Farm, 'title': 'Budget', 'message': '-', 'is_farm_wide': True},
+    ('farm_daily_tasks', 'post'): {'farm': Farm, 'date': '2024-01-01', 'spraying': True},
+    ('farm_daily_task_detail', 'put'): {'spraying': True},
+    ('farm_crop_stages', 'post'): {
+        'farm': Farm, 'crop_name': 'Tomato', 'variety': 'Hybrid', 'batch_code': 'NEW1',
+        'current_stage': 'seedling', 'transplant_date': '2024-01-01',
+    },
+    ('farm_crop_stage_detail', 'put'): {'health_status': 'moderate'},
+    ('farm_notifications', 'post'): {'title': 'Budget', 'message': '-', 'is_farm_wide': True},
+    ('farm_notifications', 'put'): {'notification_ids': [Notification]},
+    ('farm_sales', 'post'): {
+        'farm': Farm, 'crop_name': 'Tomato', 'batch_code': 'B0', 'buyer_name': '-', 'sale_date': '2024-01-01',
+        'quantity_sold': 5, 'price_per_unit': 10,
+    },
+    ('farm_spray_schedules', 'post'): {
+        'farm': Farm, 'crop_zone': 'Zone A', 'date_time': '2024-01-01T08:00:00Z', 'product_used': '-',
+        'dose_concentration': '-', 'reason': 'pest', 'phi_log': 7, 'worker_name': '-',
+    },
+    ('farm_spray_schedule_detail', 'put'): {'product_used': 'Neem'},
+    ('farm_fertigations', 'post'): {
+        'farm': Farm, 'crop_zone_name': 'Zone A', 'date_time': '2024-01-01T08:00:00Z', 'operator_name': '-',
+        'ec_before': 1, 'ph_before': 6, 'ec_after': 2, 'ph_after': 6, 'water_volume': 100,
+    },
+    ('farm_fertigation_detail', 'put'): {
+        'farm': Farm, 'crop_zone_name': 'Zone A', 'date_time': '2024-01-01T08:00:00Z', 'operator_name': 'Ravi',
+        'ec_before': 1, 'ph_before': 6, 'ec_after': 2, 'ph_after': 6, 'water_volume': 100,
+    },
+    ('farm_workers', 'post'): {'farm': Farm, 'name': 'New worker', 'employment_type': 'permanent', 'wage_per_day': 500},
+    ('farm_worker_detail', 'put'): {'wage_per_day': 600},
+    ('farm_worker_tasks', 'post'): {'worker': Worker, 'task_description': '-', 'assigned_date': '2024-01-01'},
+    ('farm_worker_task_detail', 'put'): {'status': 'completed'},
+    ('farm_issue_reports', 'post'): {'issue_type': 'pest', 'description': '-', 'severity': 'low'},
+    ('farm_issue_report_detail', 'put'): {'severity': 'high'},
+    ('farm_expenditures', 'post'): {
+        'farm': Farm, 'expense_title': '-', 'category': 'labor', 'amount': 100, 'payment_method': 'cash',
+        'expense_date': '2024-01-01',
+    },
+    ('farm_expenditure_detail', 'put'): {
+        'expense_title': '-', 'category': 'labor', 'amount': 150, 'payment_method': 'cash',
+        'expense_date': '2024-01-01',
+    },
+    ('farm_tasks', 'post'): {'farm': Farm, 'title': 'New task'},
+    ('farm_task_detail', 'put'): {'title': 'Renamed task'},
+    ('daily_tasks', 'post'): {'farm': Farm, 'date': '2024-01-01', 'spraying': True},
+    ('daily_task_detail', 'put'): {'spraying': True},
+    ('notifications', 'put'): {'notification_ids': [Notification]},
+    ('notifications', 'delete'): {'notification_ids': [Notification]},
+    ('spray_irrigation_logs', 'post'): {'farm': Farm, 'date': '2024-01-01', 'activity_type': 'spray'},
+    ('crop_stages', 'post'): {
+        'farm': Farm, 'crop_name': 'Tomato', 'variety': 'Hybrid', 'batch_code': 'NEW1',
+        'current_stage': 'seedling', 'transplant_date': '2024-01-01',
+    },
+    ('crop_stage_detail', 'put'): {'health_status': 'moderate'},
+    ('import_crop_stages', 'post'): lambda fixture: {
+        'file': SimpleUploadedFile('stages.csv', CROP_STAGE_CSV.format(farm=fixture[Farm].pk).encode()),
+    },
+    ('fertigations', 'post'): {
+        'farm': Farm, 'crop_zone_name': 'Zone A', 'date_time': '2024-01-01T08:00:00Z', 'operator_name': '-',
+        'ec_before': 1, 'ph_before': 6, 'ec_after': 2, 'ph_after': 6, 'water_volume': 100,
+    },
+    ('fertigation_detail', 'put'): {
+        'farm': Farm, 'crop_zone_name': 'Zone A', 'date_time': '2024-01-01T08:00:00Z', 'operator_name': 'Ravi',
+        'ec_before': 1, 'ph_before': 6, 'ec_after': 2, 'ph_after': 6, 'water_volume': 100,
+    },
+    ('fertigation_schedule', 'post'): {
+        'farm': Farm, 'crop_zone_name': 'Zone A', 'date_time': '2024-01-01T08:00:00Z', 'operator_name': '-',
+        'ec_before': 1, 'ph_before': 6, 'ec_after': 2, 'ph_after': 6, 'water_volume': 100,
+        'scheduled_date': '2024-01-02T08:00:00Z',
+    },
+    ('workers', 'post'): {'farm': Farm, 'name': 'New worker', 'employment_type': 'permanent', 'wage_per_day': 500},
+    ('worker_detail', 'put'): {'wage_per_day': 600},
+    ('worker_tasks', 'post'): {'worker': Worker, 'task_description': '-', 'assigned_date': '2024-01-01'},
+    ('worker_task_detail', 'put'): {'status': 'completed'},
+    ('issue_reports', 'post'): {'farm': Farm, 'issue_type': 'pest', 'description': '-', 'severity': 'low'},
+    ('issue_report_detail', 'put'): {'severity': 'high'},
+    ('spray_schedules', 'post'): {
+        'farm': Farm, 'crop_zone': 'Zone A', 'date_time': '2024-01-01T08:00:00Z', 'product_used': '-',
+        'dose_concentration': '-', 'reason': 'pest', 'phi_log': 7, 'worker_name': '-',
+    },
+    ('spray_schedule_detail', 'put'): {'product_used': 'Neem'},
+    ('expenditures', 'post'): {
+        'farm': Farm, 'expense_title': '-', 'category': 'labor', 'amount': 100, 'payment_method': 'cash',
+        'expense_date': '2024-01-01',
+    },
+    ('expenditure_detail', 'put'): {
+        'expense_title': '-', 'category': 'labor', 'amount': 150, 'payment_method': 'cash',
+        'expense_date': '2024-01-01',
+    },
+    ('sales', 'post'): {
+        'farm': Farm, 'crop_name': 'Tomato', 'batch_code': 'B0', 'buyer_name': '-', 'sale_date': '2024-01-01',
+        'quantity_sold': 5, 'price_per_unit': 10,
+    },
+    ('sale_detail', 'put'): {
+        'crop_name': 'Tomato', 'batch_code': 'B0', 'buyer_name': 'Mandi', 'sale_date': '2024-01-01',
+        'quantity_sold': 5, 'price_per_unit': 12,
+    },
+    ('update_plant_disease_prediction', 'put'): {'user_notes': '-'},
+    ('login', 'post'): {'username': '_budget_farm_user', 'password': PASSWORD},
+    ('user_profile', 'put'): {'first_name': 'Budget'},
+    ('change_password', 'post'): {'current_password': PASSWORD, 'new_password': 'another-password'},
+    ('create_farm_user', 'post'): {'username': '_budget_new_user', 'password': PASSWORD},
+    ('manage_farm_user', 'put'): {'first_name': 'Budget'},
+    ('reset_user_password', 'post'): {'new_password': 'another-password'},
+    ('create_agronomist', 'post'): {'username': '_budget_new_agronomist', 'password': PASSWORD},
+}
+
+
+def checked_routes(resolver=None, prefix=''):
+    """(path pattern, URL name) of every named route under CHECKED_PREFIXES."""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from checked_routes(pattern, route)
+        elif isinstance(pattern, URLPattern) and pattern.name and route.startswith(CHECKED_PREFIXES):
+            yield route, pattern
+
+
+def accepts(pattern, method):
+    view_class = getattr(pattern.callback, 'cls', None)
+    return view_class is not None and hasattr(view_class, method)
+
+
+def get_routes():
+    return [(route, pattern) for route, pattern in checked_routes() if accepts(pattern, 'get')]
+
+
+def write_routes():
+    """(path pattern, URL pattern, method) of every POST/PUT/PATCH/DELETE handler"""
+    return [
+        (route, pattern, method)
+        for route, pattern in checked_routes()
+        for method in WRITE_METHODS
+        if accepts(pattern, method)
+    ]
+
+
+def resolved(value, fixture):
+    """A request body with model classes replaced by the pk of their fixture instance"""
+    if callable(value) and not isinstance(value, type):
+        return value(fixture)
+    if isinstance(value, dict):
+        return {key: resolved(item, fixture) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolved(item, fixture) for item in value]
+    if isinstance(value, type):
+        return fixture[value].pk
+    return value
+
+
+# Measure the uncached path; a warm cache would hide per-row queries
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class QueryBudgetTests(TestCase):
+    """
+    Every endpoint under /api/farms/ and /api/auth/ stays within its query
+    budget against a small and a large fixture, and issues no more queries
+    as rows grow: GET handlers, streamed lists and write handlers.
+    """
+
+    def test_every_get_endpoint_has_a_budget(self):
+        missing = [pattern.name for _, pattern in get_routes() if pattern.name not in QUERY_BUDGETS]
+        self.assertEqual(missing, [], 'GET endpoint(s) without a query budget')
+
+    def test_every_write_endpoint_has_a_budget(self):
+        missing = [
+            (pattern.name, method) for _, pattern, method in write_routes()
+            if (pattern.name, method) not in WRITE_BUDGETS and (pattern.name, method) not in UNMEASURED_WRITES
+        ]
+        self.assertEqual(missing, [], 'write endpoint(s) without a query budget')
+
+    def test_query_budgets(self):
+        small = self.measure(1)
+        large = self.measure(SCALE)
+        for route, pattern in get_routes():
+            budget = QUERY_BUDGETS[pattern.name][2]
+            with self.subTest(endpoint=pattern.name):
+                self.assertEqual(small[pattern.name], large[pattern.name], f'x1 vs x{SCALE} fixture')
+                self.assertLessEqual(large[pattern.name], budget)
+
+    def test_streamed_query_budgets(self):
+        small = self.measure_streamed(1)
+        large = self.measure_streamed(SCALE)
+        for name, budget in STREAMED_BUDGETS.items():
+            with self.subTest(endpoint=name):
+                self.assertEqual(small[name], large[name], f'x1 vs x{SCALE} fixture')
+                self.assertLessEqual(large[name], budget)
+
+    def test_write_query_budgets(self):
+        small = self.measure_writes(1)
+        large = self.measure_writes(SCALE)
+        for key, (_, _, budget) in WRITE_BUDGETS.items():
+            with self.subTest(endpoint=key):
+                if key not in BATCHED_WRITES:
+                    self.assertEqual(small[key], large[key], f'x1 vs x{SCALE} fixture')
+                self.assertLessEqual(large[key], budget)
+
+    def measure(self, scale):
+        counts = {}
+        with transaction.atomic():
+            users, fixture = seed(scale)
+            for route, pattern in get_routes():
+                role, kwargs, _ = QUERY_BUDGETS[pattern.name]
+                path = reverse(pattern.name, kwargs={name: fixture[model].pk for name, model in kwargs.items()})
+                params = {name: fixture[model].pk for name, model in QUERY_PARAMS.get(pattern.name, {}).items()}
+                counts[pattern.name] = self.count_queries(path, users[role], params)
+            transaction.set_rollback(True)
+        return counts
+
+    def measure_streamed(self, scale):
+        counts = {}
+        with transaction.atomic():
+            users, fixture = seed(scale)
+            for name in STREAMED_BUDGETS:
+                role, kwargs, _ = QUERY_BUDGETS[name]
+                path = reverse(name, kwargs={key: fixture[model].pk for key, model in kwargs.items()})
+                counts[name] = self.count_queries(path, users[role], {'stream': 'true'})
+            transaction.set_rollback(True)
+        return counts
+
+    def measure_writes(self, scale):
+        counts = {}
+        with transaction.atomic():
+            users, fixture = seed(scale)
+            users['farm_user'].set_password(PASSWORD)
+            users['farm_user'].save()
+            for (name, method), (role, kwargs, _) in WRITE_BUDGETS.items():
+                path = reverse(name, kwargs={key: fixture[model].pk for key, model in kwargs.items()})
+                data = resolved(WRITE_PAYLOADS.get((name, method)), fixture)
+                # Each write starts from the seeded rows
+                with transaction.atomic():
+                    counts[name, method] = self.count_queries(path, users[role], data, method)
+                    transaction.set_rollback(True)
+            transaction.set_rollback(True)
+        return counts
+
+    def count_queries(self, path, user, data=None, method='get'):
+        """Queries of one request, including its streamed content and on_commit callbacks"""
+        match = resolve(path)
+        factory = APIRequestFactory()
+        if method == 'get':
+            request = factory.get(path, data)
+        elif data is not None and any(isinstance(value, SimpleUploadedFile) for value in data.values()):
+            request = getattr(factory, method)(path, data, format='multipart')
+        else:
+            request = getattr(factory, method)(path, data, format='json')
+        force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            response = match.func(request, *match.args, **match.kwargs)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertLess(response.status_code, 300, f'{method.upper()} {path}: {getattr(response, "data", "")}')
+        return len(queries)
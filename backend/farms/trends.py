@@ -0,0 +1,148 @@
+import numpy as np
+from django.db.models import Avg, F, Max, Min
+from django.db.models.functions import TruncDay, TruncHour
+from .models import DailyTask, Fertigation
+
+# series name -> (model, field)
+WATER_QUALITY_SERIES = {
+    'fertigation_ec_before': (Fertigation, 'ec_before'),
+    'fertigation_ec_after': (Fertigation, 'ec_after'),
+    'fertigation_ph_before': (Fertigation, 'ph_before'),
+    'fertigation_ph_after': (Fertigation, 'ph_after'),
+    'main_tank_ec': (DailyTask, 'main_tank_ec'),
+    'main_tank_ph': (DailyTask, 'main_tank_ph'),
+    'dripper_ec': (DailyTask, 'dripper_ec'),
+    'dripper_ph': (DailyTask, 'dripper_ph'),
+}
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+# Ranges up to this many days are bucketed per hour in SQL, longer ones per day
+HOURLY_BUCKET_MAX_DAYS = 14
+
+
+def _first_per_segment(order_key, segments):
+    """Index of the first element of each segment after sorting by order_key."""
+    order = np.lexsort((order_key, segments))
+    starts = np.r_[0, np.flatnonzero(np.diff(segments[order])) + 1]
+    return order[starts]
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling, vectorised. Classic LTTB
+    anchors each triangle on the point picked in the previous bucket, which
+    forces a Python loop; here the anchor is the previous bucket's mean so
+    every bucket is solved at once. First and last points are always kept.
+    Returns the indexes of the selected points.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Interior points split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    segments = np.repeat(np.arange(threshold - 2), np.diff(edges))
+    interior = np.arange(1, n - 1)
+    counts = np.bincount(segments, minlength=threshold - 2)
+
+    mean_x = np.bincount(segments, weights=x[interior], minlength=threshold - 2) / counts
+    mean_y = np.bincount(segments, weights=y[interior], minlength=threshold - 2) / counts
+    # Previous anchor is the first point for bucket 0, next anchor the last point for the final bucket
+    prev_x = np.r_[x[0], mean_x[:-1]][segments]
+    prev_y = np.r_[y[0], mean_y[:-1]][segments]
+    next_x = np.r_[mean_x[1:], x[-1]][segments]
+    next_y = np.r_[mean_y[1:], y[-1]][segments]
+
+    area = np.abs(
+        (prev_x - next_x) * (y[interior] - prev_y)
+        - (prev_x - x[interior]) * (next_y - prev_y)
+    )
+    picked = interior[_first_per_segment(-area, segments)]
+    return np.r_[0, picked, n - 1]
+
+
+def minmax(low, high, threshold):
+    """
+    Keep the lowest and highest reading of each bucket so spikes survive
+    downsampling. Returns (indexes of minima, indexes of maxima).
+    """
+    n = len(low)
+    buckets = max(1, threshold // 2)
+    segments = np.minimum((np.arange(n) * buckets) // n, buckets - 1)
+    return _first_per_segment(low, segments), _first_per_segment(-high, segments)
+
+
+def water_quality_trend(farm, date_from, date_to, zone=None, points=200, method='lttb'):
+    """
+    EC/pH readings from fertigations and daily tasks for one farm, averaged
+    per hour or day in SQL and downsampled to at most `points` per series.
+    `zone` filters fertigations by crop_zone_name; daily-task readings are
+    farm-wide and always included.
+    """
+    hourly = (date_to - date_from).days <= HOURLY_BUCKET_MAX_DAYS
+    fertigations = Fertigation.objects.filter(
+        farm=farm, status='completed',
+        date_time__date__gte=date_from, date_time__date__lte=date_to,
+    )
+    if zone:
+        fertigations = fertigations.filter(crop_zone_name=zone)
+    daily_tasks = DailyTask.objects.filter(farm=farm, date__gte=date_from, date__lte=date_to)
+
+    sources = (
+        (Fertigation, fertigations, (TruncHour if hourly else TruncDay)('date_time')),
+        (DailyTask, daily_tasks, F('date')),
+    )
+
+    series = {}
+    for model, queryset, bucket in sources:
+        fields = [
+            (name, field) for name, (series_model, field) in WATER_QUALITY_SERIES.items()
+            if series_model is model
+        ]
+        aggregates = {}
+        for name, field in fields:
+            aggregates[f'{name}__avg'] = Avg(field)
+            aggregates[f'{name}__min'] = Min(field)
+            aggregates[f'{name}__max'] = Max(field)
+        rows = list(
+            queryset.order_by().annotate(bucket=bucket).values('bucket').annotate(**aggregates).order_by('bucket')
+        )
+
+        timestamps = [row['bucket'] for row in rows]
+        # Positions on the time axis; only their spacing matters to LTTB
+        x = np.array([stamp.toordinal() for stamp in timestamps], dtype=float)
+        if hourly and model is Fertigation:
+            x += np.array([stamp.hour / 24 for stamp in timestamps])
+
+        for name, _ in fields:
+            # Missing readings come back as None and become NaN
+            values = np.array([row[f'{name}__avg'] for row in rows], dtype=float)
+            present = ~np.isnan(values)
+            series_t = [stamp for stamp, keep in zip(timestamps, present) if keep]
+            values = values[present]
+
+            if len(values) <= points:
+                index, picked = np.arange(len(values)), values
+            elif method == 'minmax':
+                low = np.array([row[f'{name}__min'] for row in rows], dtype=float)[present]
+                high = np.array([row[f'{name}__max'] for row in rows], dtype=float)[present]
+                low_index, high_index = minmax(low, high, points)
+                index = np.r_[low_index, high_index]
+                picked = np.r_[low[low_index], high[high_index]]
+                order = np.argsort(index, kind='stable')
+                index, picked = index[order], picked[order]
+            else:
+                index = lttb(x[present], values, points)
+                picked = values[index]
+            series[name] = {
+                't': [series_t[i].isoformat() for i in index],
+                'v': [round(float(value), 2) for value in picked],
+            }
+
+    return {
+        'bucket': 'hour' if hourly else 'day',
+        'method': method,
+        'points': points,
+        'series': series,
+    }
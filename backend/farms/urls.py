@@ -6,6 +6,7 @@ urlpatterns = [
     path('', views.get_farms, name='get_farms'),
     path('create/', views.create_farm, name='create_farm'),
     path('<int:farm_id>/', views.farm_detail, name='farm_detail'),
+    path('portfolio/', views.farm_portfolio, name='farm_portfolio'),
     
     # Farm User Dashboard
     path('my-farms/', views.my_farms, name='my_farms'),
@@ -30,6 +31,7 @@ urlpatterns = [
     path('<int:farm_id>/spray-schedules/<int:schedule_id>/', views.farm_spray_schedule_detail, name='farm_spray_schedule_detail'),
     path('<int:farm_id>/fertigations/', views.farm_fertigations, name='farm_fertigations'),
     path('<int:farm_id>/fertigations/<int:pk>/', views.farm_fertigation_detail, name='farm_fertigation_detail'),
+    path('<int:farm_id>/water-quality/', views.farm_water_quality_trend, name='farm_water_quality_trend'),
     path('<int:farm_id>/workers/', views.farm_workers, name='farm_workers'),
     path('<int:farm_id>/workers/<int:worker_id>/', views.farm_worker_detail, name='farm_worker_detail'),
     path('<int:farm_id>/worker-tasks/', views.farm_worker_tasks, name='farm_worker_tasks'),
@@ -53,6 +55,8 @@ urlpatterns = [
     path('crop-stages/<int:stage_id>/', views.crop_stage_detail, name='crop_stage_detail'),
     path('crop-stages/import/', views.import_crop_stages, name='import_crop_stages'),
     path('crop-stages/export/', views.export_crop_stages, name='export_crop_stages'),
+    path('crop-stages/yield-analytics/', views.yield_analytics, name='yield_analytics'),
+    path('crop-alerts/', views.crop_alerts, name='crop_alerts'),
     path('fertigations/', views.fertigations, name='fertigations'),
     path('fertigations/<int:pk>/', views.fertigation_detail, name='fertigation_detail'),
     path('fertigations/analytics/', views.fertigation_analytics, name='fertigation_analytics'),
@@ -62,6 +66,7 @@ urlpatterns = [
     path('worker-tasks/', views.worker_tasks, name='worker_tasks'),
     path('worker-tasks/<int:task_id>/', views.worker_task_detail, name='worker_task_detail'),
     path('worker-dashboard/', views.worker_dashboard_summary, name='worker_dashboard_summary'),
+    path('labor-analytics/', views.labor_analytics, name='labor_analytics'),
     path('issue-reports/', views.issue_reports, name='issue_reports'),
     path('issue-reports/<int:issue_id>/', views.issue_report_detail, name='issue_report_detail'),
     path('spray-schedules/', views.spray_schedules, name='spray_schedules'),
@@ -70,9 +75,11 @@ urlpatterns = [
     path('expenditures/', views.expenditures, name='expenditures'),
     path('expenditures/<int:expenditure_id>/', views.expenditure_detail, name='expenditure_detail'),
     path('expenditures/analytics/', views.expenditure_analytics, name='expenditure_analytics'),
+    path('expenditures/series/', views.expenditure_series, name='expenditure_series'),
     path('sales/', views.sales, name='sales'),
     path('sales/<int:sale_id>/', views.sale_detail, name='sale_detail'),
     path('sales/analytics/', views.sale_analytics, name='sale_analytics'),
+    path('profit-loss/', views.profit_and_loss_report, name='profit_and_loss_report'),
 
     # Plant Disease & Pest Analysis URLs
     path('plant-disease/analyze/', views.analyze_plant_disease, name='analyze_plant_disease'),
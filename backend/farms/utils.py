@@ -1,6 +1,7 @@
 from datetime import date, timedelta
 from django.utils import timezone
 from .models import CropStage, Notification
+from .notifications import create_notification
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
@@ -30,14 +31,14 @@ def generate_harvest_notifications():
                 notification_type='harvest_overdue',
                 user=crop.user,
                 farm=crop.farm,
-                title__icontains=crop.batch_code
+                related_object_id=crop.id
             ).exists()
             
             if not existing:
                 notification_data = {
                     'type': 'harvest_overdue',
-                    'title': f'🚨 Harvest Overdue: {crop.crop_name} ({crop.batch_code})',
-                    'message': f'The harvest for {crop.crop_name} ({crop.variety}) - Batch: {crop.batch_code} was due on {harvest_date.strftime("%B %d, %Y")} and is now {abs(days_until_harvest)} day(s) overdue. Please harvest as soon as possible to avoid quality loss.',
+                    'template': 'harvest_overdue_alert',
+                    'params': {'crop': crop.crop_name, 'variety': crop.variety, 'batch': crop.batch_code, 'harvest_date': harvest_date, 'days': abs(days_until_harvest)},
                     'priority': 'high'
                 }
                 
@@ -47,15 +48,15 @@ def generate_harvest_notifications():
                 notification_type='harvest_due',
                 user=crop.user,
                 farm=crop.farm,
-                title__icontains=crop.batch_code,
+                related_object_id=crop.id,
                 created_at__date=today
             ).exists()
             
             if not existing:
                 notification_data = {
                     'type': 'harvest_due',
-                    'title': f'📅 Harvest Due Today: {crop.crop_name} ({crop.batch_code})',
-                    'message': f'Today is the expected harvest date for {crop.crop_name} ({crop.variety}) - Batch: {crop.batch_code}. Current stage: {crop.get_current_stage_display()}. Growth duration: {crop.growth_duration_days} days.',
+                    'template': 'harvest_due_today',
+                    'params': {'crop': crop.crop_name, 'variety': crop.variety, 'batch': crop.batch_code, 'stage': crop.get_current_stage_display(), 'growth_days': crop.growth_duration_days},
                     'priority': 'high'
                 }
                 
@@ -65,28 +66,29 @@ def generate_harvest_notifications():
                 notification_type='harvest_reminder',
                 user=crop.user,
                 farm=crop.farm,
-                title__icontains=crop.batch_code,
+                related_object_id=crop.id,
                 created_at__gte=today - timedelta(days=1)
             ).exists()
             
             if not existing:
                 notification_data = {
                     'type': 'harvest_reminder',
-                    'title': f'⏰ Harvest Reminder: {crop.crop_name} ({crop.batch_code})',
-                    'message': f'Harvest for {crop.crop_name} ({crop.variety}) - Batch: {crop.batch_code} is due in {days_until_harvest} day(s) on {harvest_date.strftime("%B %d, %Y")}. Please prepare for harvesting.',
+                    'template': 'harvest_reminder',
+                    'params': {'crop': crop.crop_name, 'variety': crop.variety, 'batch': crop.batch_code, 'harvest_date': harvest_date, 'days': days_until_harvest},
                     'priority': 'medium'
                 }
         
         # Create the notification if needed
         if notification_data:
             try:
-                notification = Notification.objects.create(
-                    title=notification_data['title'],
-                    message=notification_data['message'],
+                notification = create_notification(
+                    [crop.user],
+                    template=notification_data['template'],
+                    params=notification_data['params'],
                     notification_type=notification_data['type'],
                     farm=crop.farm,
                     user=crop.user,
-                    is_read=False
+                    related_object_id=crop.id
                 )
                 
                 notifications_created += 1
@@ -94,8 +96,8 @@ def generate_harvest_notifications():
                 # Send real-time notification via WebSocket
                 send_realtime_notification(crop.user.id, {
                     'id': notification.id,
-                    'title': notification.title,
-                    'message': notification.message,
+                    'title': notification.rendered_title,
+                    'message': notification.rendered_message,
                     'type': notification.notification_type,
                     'priority': notification_data['priority'],
                     'created_at': notification.created_at.isoformat(),
@@ -172,9 +174,15 @@ def check_and_update_crop_stages():
             
             # Create a notification about stage transition
             try:
-                Notification.objects.create(
-                    title=f"🌱 Growth Stage Updated: {crop.crop_name} ({crop.batch_code})",
-                    message=f"Your {crop.crop_name} ({crop.variety}) has progressed from {current_stage.title()} to {new_stage.title()} stage after {growth_days} days of growth.",
+                create_notification(
+                    [crop.user],
+                    template='growth_stage_updated',
+                    params={
+                        'crop': crop.crop_name, 'variety': crop.variety, 'batch': crop.batch_code,
+                        'from_stage': current_stage.title(),
+                        'to_stage': new_stage.title(),
+                        'growth_days': growth_days
+                    },
                     notification_type='general',
                     farm=crop.farm,
                     user=crop.user
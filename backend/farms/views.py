@@ -3,14 +3,14 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from .models import Farm, DailyTask, Notification, SprayIrrigationLog, SpraySchedule, CropStage, Fertigation, Worker, WorkerTask, IssueReport, AgronomistNotification, Expenditure, Sale, PlantDiseasePrediction
+from .models import Farm, DailyTask, Notification, SprayIrrigationLog, SpraySchedule, CropStage, CropAlert, Fertigation, Worker, WorkerTask, IssueReport, NotificationRecipient, Expenditure, Sale, PlantDiseasePrediction
 from django.contrib.auth import get_user_model
 User = get_user_model()
 from .serializers import (
-    FarmSerializer, CreateFarmSerializer, DailyTaskSerializer, CreateDailyTaskSerializer, 
+    FarmSerializer, FarmListSerializer, CreateFarmSerializer, DailyTaskSerializer, CreateDailyTaskSerializer, 
     NotificationSerializer, SprayIrrigationLogSerializer, CreateSprayIrrigationLogSerializer, 
     SprayScheduleSerializer, CreateSprayScheduleSerializer, UpdateSprayScheduleSerializer,
-    CropStageSerializer, CreateCropStageSerializer, FertigationSerializer, CreateFertigationSerializer,
+    CropStageSerializer, CropAlertSerializer, CreateCropStageSerializer, FertigationSerializer, CreateFertigationSerializer,
     WorkerSerializer, CreateWorkerSerializer, WorkerTaskSerializer, CreateWorkerTaskSerializer, UpdateWorkerTaskSerializer,
     IssueReportSerializer, CreateIssueReportSerializer, UpdateIssueReportSerializer,
     AgronomistNotificationSerializer, ExpenditureSerializer, CreateExpenditureSerializer, UpdateExpenditureSerializer,
@@ -21,25 +21,28 @@ from .serializers import (
 from datetime import date
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from .analytics import (
+    ALLOCATION_BASES, SERIES_BUCKETS, crop_stage_ordering, expenditure_summary, expenditure_timeseries, labor_summary,
+    overdue_crops, profit_and_loss, sale_summary, spray_summary, with_crop_timeline,
+)
+from .facts import PORTFOLIO_METRICS, portfolio
+from .projections import (
+    AGRONOMIST_NOTIFICATION_LIST, CROP_STAGE_LIST, DAILY_TASK_LIST, FERTIGATION_LIST, NOTIFICATION_LIST, SALE_LIST,
+)
+from .fields import selected_fields, selected_keys
+from .kpis import farm_kpi_snapshots, user_kpis
+from .pagination import DEFAULT_PAGE_SIZE, keyset_page, next_page_headers, paginate, requested_page_size, sorted_by
+from .streaming import STREAM_CHUNK_SIZE, serialized_chunks, streaming_json_response, wants_stream
+from .trends import DOWNSAMPLE_METHODS, water_quality_trend
+from .yields import PERCENTILES, YIELD_GROUPS, yield_distribution
+from .notifications import (
+    create_notification, notifications_for, mark_notifications_read,
+    delete_notifications_for, push_agronomist_notification
+)
 
 logger = logging.getLogger(__name__)
 
 
-def create_agronomist_notification(agronomist_user, title, message, notification_type, source_user=None, source_farm=None, related_object_id=None, related_model_name=None):
-    """
-    Helper function to create persistent agronomist notifications
-    """
-    return AgronomistNotification.objects.create(
-        agronomist_user=agronomist_user,
-        title=title,
-        message=message,
-        notification_type=notification_type,
-        source_user=source_user,
-        source_farm=source_farm,
-        related_object_id=related_object_id,
-        related_model_name=related_model_name
-    )
-
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_farm(request):
@@ -52,6 +55,84 @@ def create_farm(request):
         return Response(FarmSerializer(farm).data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+def requested_dates(request):
+    """
+    ?date_from= and ?date_to= as dates, None when not given; ValueError for
+    anything that is not a valid YYYY-MM-DD date
+    """
+    from django.utils.dateparse import parse_date
+    
+    dates = []
+    for name in ('date_from', 'date_to'):
+        value = request.query_params.get(name)
+        try:
+            parsed = parse_date(value) if value else None
+        except ValueError:
+            parsed = None
+        if value and parsed is None:
+            raise ValueError('date_from and date_to must be valid YYYY-MM-DD dates')
+        dates.append(parsed)
+    return tuple(dates)
+
+def list_response(request, queryset, serializer_class, projection=None, sort=None,
+                  default_page_size=DEFAULT_PAGE_SIZE):
+    """
+    Serialized list honouring ?fields=, ?omit= and ?expand=: only the selected
+    fields are computed and only the columns they read are loaded. With a
+    `sort` key the list is paged by ?cursor= / ?page_size= (at most
+    MAX_PAGE_SIZE rows) and the next page is linked from the Link and
+    X-Next-Cursor headers. ?stream=true returns the whole list as a JSON
+    array streamed in chunks instead
+    """
+    stream = wants_stream(request)
+    try:
+        selected = selected_fields(request, serializer_class)
+        cursor = None
+        if stream and sort is not None:
+            queryset = sorted_by(queryset, sort)
+        elif sort is not None:
+            queryset, cursor = paginate(request, queryset, sort, default_page_size)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if stream:
+        if projection is not None:
+            chunks = projection.chunks(queryset, selected, STREAM_CHUNK_SIZE)
+        else:
+            chunks = serialized_chunks(serializer_class.eager_queryset(queryset, selected), serializer_class, selected)
+        return streaming_json_response(request, chunks)
+    headers = next_page_headers(request, cursor)
+    if projection is not None:
+        return Response(projection.rows(queryset, selected), headers=headers)
+    queryset = serializer_class.eager_queryset(queryset, selected)
+    return Response(serializer_class(queryset, many=True, selected_fields=selected).data, headers=headers)
+
+def crop_stage_list_response(request, crop_stages):
+    """
+    Crop stage list with the timeline fields computed in SQL from one
+    request-scoped today; ?overdue=true|false filters and ?ordering= sorts on it
+    """
+    from django.utils import timezone
+    
+    today = timezone.localdate()
+    crop_stages = with_crop_timeline(crop_stages, today)
+    
+    overdue = request.query_params.get('overdue')
+    if overdue is not None:
+        if overdue.lower() == 'true':
+            crop_stages = crop_stages.filter(overdue_crops(today))
+        else:
+            crop_stages = crop_stages.exclude(overdue_crops(today))
+    
+    sort = '-created_at'
+    ordering = request.query_params.get('ordering')
+    if ordering:
+        try:
+            sort = crop_stage_ordering(ordering)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return list_response(request, crop_stages, CropStageSerializer, CROP_STAGE_LIST, sort=sort)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_farms(request):
@@ -64,8 +145,63 @@ def get_farms(request):
         # Farm users access farms through the assigned_farms relationship
         farms = request.user.assigned_farms.filter(is_active=True)
     
-    serializer = FarmSerializer(farms, many=True)
-    return Response(serializer.data)
+    return list_response(request, farms, FarmListSerializer)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def farm_portfolio(request):
+    """
+    Agronomist's farms ranked by a monthly fact (?metric=, ?order=asc|desc)
+    over ?date_from=/?date_to= (YYYY-MM or YYYY-MM-DD), filtered with
+    ?min_<metric>= / ?max_<metric>=
+    """
+    if request.user.is_superuser:
+        farms = Farm.objects.filter(is_active=True)
+    elif request.user.user_type == 'agronomist':
+        farms = Farm.objects.filter(created_by=request.user, is_active=True)
+    else:
+        return Response({'error': 'Only agronomists can view the farm portfolio'}, status=status.HTTP_403_FORBIDDEN)
+    
+    from decimal import Decimal, InvalidOperation
+    from django.utils.dateparse import parse_date
+    
+    def parse_month(value):
+        return parse_date(value) or parse_date(f'{value}-01') if value else None
+    
+    metric = request.GET.get('metric', 'sales_amount')
+    if metric not in PORTFOLIO_METRICS:
+        return Response({'error': f"metric must be one of: {', '.join(PORTFOLIO_METRICS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        date_from = parse_month(request.GET.get('date_from'))
+        date_to = parse_month(request.GET.get('date_to'))
+        bounds = {}
+        for name in PORTFOLIO_METRICS:
+            low, high = request.GET.get(f'min_{name}'), request.GET.get(f'max_{name}')
+            if low is not None or high is not None:
+                bounds[name] = (
+                    Decimal(low) if low is not None else None,
+                    Decimal(high) if high is not None else None,
+                )
+        limit = min(max(int(request.GET.get('limit', 50)), 1), 500)
+        offset = max(int(request.GET.get('offset', 0)), 0)
+    except (ValueError, InvalidOperation):
+        return Response({'error': 'Invalid date, bound or paging parameter'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    results = portfolio(
+        farms, date_from, date_to,
+        metric=metric,
+        descending=request.GET.get('order', 'desc') != 'asc',
+        bounds=bounds,
+        limit=limit,
+        offset=offset
+    )
+    return Response({
+        'metric': metric,
+        'date_from': date_from,
+        'date_to': date_to,
+        'results': results,
+    })
 
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
@@ -130,8 +266,7 @@ def daily_tasks(request):
         else:
             tasks = DailyTask.objects.filter(user=request.user, date=today)
         
-        serializer = DailyTaskSerializer(tasks, many=True)
-        return Response(serializer.data)
+        return list_response(request, tasks, DailyTaskSerializer, DAILY_TASK_LIST, sort='-created_at')
     
     elif request.method == 'POST':
         # Always create a new task entry with current timestamp
@@ -173,56 +308,21 @@ def daily_tasks(request):
         
         # Only create notification if agronomist exists
         if agronomist_user and agronomist_user.user_type in ['agronomist', 'superuser']:
-            title = "Daily Task Submitted"
-            message = f"{user_name} submitted daily tasks for {farm.name} at {task.created_at.strftime('%H:%M:%S')}"
-            
-            # Create both regular notification (for user) and persistent agronomist notification
-            notification = Notification.objects.create(
-                title=title,
-                message=message,
+            # One notification body, delivered to the agronomist
+            notification = create_notification(
+                [agronomist_user],
+                template='daily_task_submitted',
+                params={'user': user_name, 'recorded_at': task.created_at},
                 notification_type='daily_task',
                 farm=farm,
-                user=agronomist_user
-            )
-            
-            # Create persistent agronomist notification
-            agronomist_notification = create_agronomist_notification(
-                agronomist_user=agronomist_user,
-                title=title,
-                message=message,
-                notification_type='daily_task',
-                source_user=request.user,
-                source_farm=farm,
+                user=agronomist_user,
+                created_by=request.user,
                 related_object_id=task.id,
                 related_model_name='DailyTask'
             )
             
             # Send real-time WebSocket notification to the specific agronomist
-            channel_layer = get_channel_layer()
-            if channel_layer:
-                try:
-                    notification_data = {
-                        'type': 'notification_message',
-                        'title': title,
-                        'message': message,
-                        'notification_type': 'daily_task',
-                        'notification_id': agronomist_notification.id,
-                        'farm_id': farm.id,
-                        'farm_name': farm.name,
-                        'user_id': request.user.id,
-                        'user_name': user_name,
-                        'timestamp': agronomist_notification.created_at.isoformat()
-                    }
-                    
-                    # Send to specific agronomist who created this farm user
-                    specific_agronomist_group = f'agronomist_{agronomist_user.id}_notifications'
-                    async_to_sync(channel_layer.group_send)(specific_agronomist_group, notification_data)
-                    
-                    # Also send to general agronomist notifications group (fallback)
-                    async_to_sync(channel_layer.group_send)('agronomist_notifications', notification_data)
-                    
-                except Exception as e:
-                    pass
+            push_agronomist_notification(notification, agronomist_user, source_user=request.user)
             
         return Response(DailyTaskSerializer(task).data, status=status.HTTP_201_CREATED)
 
@@ -291,50 +391,31 @@ def daily_task_detail(request, task_id):
                 if task.dripper_ec or task.dripper_ph:
                     measurements.append("Dripper")
 
-                title = "Daily Tasks Updated"
-                message = f"{user_name} updated daily tasks for {task.farm.name}. "
-                message += f"Tasks: {', '.join(completed_tasks) if completed_tasks else 'None'}. "
-                if measurements:
-                    message += f"Water measurements updated for: {', '.join(measurements)}. "
-                message += f"Updated at {task.updated_at.strftime('%H:%M:%S')}"
-
-                # Create persistent agronomist notification
-                agronomist_notification = create_agronomist_notification(
-                    agronomist_user=agronomist_user,
-                    title=title,
-                    message=message,
+                # One notification body, delivered to the agronomist
+                agronomist_notification = create_notification(
+                    [agronomist_user],
+                    template='daily_task_updated',
+                    params={
+                        'user': user_name,
+                        'tasks': ', '.join(completed_tasks),
+                        'measurements': ', '.join(measurements),
+                        'recorded_at': task.updated_at
+                    },
                     notification_type='daily_task',
-                    source_user=task.user,
-                    source_farm=task.farm,
+                    farm=task.farm,
+                    user=agronomist_user,
+                    created_by=task.user,
                     related_object_id=task.id,
                     related_model_name='DailyTask'
                 )
 
                 # Send WebSocket notification
-                channel_layer = get_channel_layer()
-                if channel_layer:
-                    try:
-                        notification_data = {
-                            'type': 'notification_message',
-                            'title': title,
-                            'message': message,
-                            'notification_type': 'daily_task',
-                            'notification_id': agronomist_notification.id,
-                            'farm_id': task.farm.id,
-                            'farm_name': task.farm.name,
-                            'user_id': task.user.id,
-                            'user_name': user_name,
-                            'completed_tasks': completed_tasks,
-                            'measurements': measurements,
-                            'timestamp': agronomist_notification.created_at.isoformat(),
-                            'action': 'updated'
-                        }
-
-                        specific_agronomist_group = f'agronomist_{agronomist_user.id}_notifications'
-                        async_to_sync(channel_layer.group_send)(specific_agronomist_group, notification_data)
-                        async_to_sync(channel_layer.group_send)('agronomist_notifications', notification_data)
-                    except Exception as e:
-                        logger.error(f"Failed to send WebSocket notification: {e}")
+                push_agronomist_notification(
+                    agronomist_notification, agronomist_user, source_user=task.user,
+                    completed_tasks=completed_tasks,
+                    measurements=measurements,
+                    action='updated'
+                )
 
         return Response({
             'success': True,
@@ -352,70 +433,53 @@ def notifications(request):
     from django.utils import timezone
     
     if request.method == 'GET':
-        # Filter notifications based on user type
-        if request.user.user_type in ['agronomist', 'superuser']:
-            # Agronomists see their persistent agronomist notifications
-            notifications = AgronomistNotification.objects.filter(agronomist_user=request.user).order_by('-created_at')
-            serializer = AgronomistNotificationSerializer(notifications, many=True)
-        else:
-            # Farm users see only their own notifications
-            notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
-            serializer = NotificationSerializer(notifications, many=True)
+        # Both agronomists and farm users read their own delivered notifications
+        notifications = notifications_for(request.user).order_by('-created_at')
         
         # Optional filtering
         notification_type = request.query_params.get('type')
         if notification_type:
             notifications = notifications.filter(notification_type=notification_type)
         
-        # Optional pagination
+        # ?limit= sets the page size when ?page_size= is not given
+        page_size = DEFAULT_PAGE_SIZE
         limit = request.query_params.get('limit')
         if limit:
             try:
-                limit = int(limit)
-                notifications = notifications[:limit]
+                page_size = max(int(limit), 1)
             except ValueError:
                 pass
         
-        # Re-serialize after filtering
+        # Ids follow creation order and page along the recipient index
         if request.user.user_type in ['agronomist', 'superuser']:
-            serializer = AgronomistNotificationSerializer(notifications, many=True)
-        else:
-            serializer = NotificationSerializer(notifications, many=True)
-        
-        return Response(serializer.data)
+            return list_response(
+                request, notifications, AgronomistNotificationSerializer, AGRONOMIST_NOTIFICATION_LIST,
+                sort='-id', default_page_size=page_size
+            )
+        return list_response(
+            request, notifications, NotificationSerializer, NOTIFICATION_LIST, sort='-id', default_page_size=page_size
+        )
     
     elif request.method == 'PUT':
         # Mark notifications as read
         notification_ids = request.data.get('notification_ids', [])
         if notification_ids:
-            if request.user.user_type in ['agronomist', 'superuser']:
-                updated_count = AgronomistNotification.objects.filter(id__in=notification_ids, agronomist_user=request.user).update(is_read=True)
-            else:
-                updated_count = Notification.objects.filter(id__in=notification_ids, user=request.user).update(is_read=True)
+            updated_count = mark_notifications_read(request.user, notification_ids)
             return Response({'message': f'{updated_count} notifications marked as read'})
         else:
             # Mark all as read
-            if request.user.user_type in ['agronomist', 'superuser']:
-                AgronomistNotification.objects.filter(agronomist_user=request.user).update(is_read=True)
-            else:
-                Notification.objects.filter(user=request.user).update(is_read=True)
+            mark_notifications_read(request.user)
             return Response({'message': 'All notifications marked as read'})
     
     elif request.method == 'DELETE':
         # Delete notifications
         notification_ids = request.data.get('notification_ids', [])
         if notification_ids:
-            if request.user.user_type in ['agronomist', 'superuser']:
-                deleted_count, _ = AgronomistNotification.objects.filter(id__in=notification_ids, agronomist_user=request.user).delete()
-            else:
-                deleted_count, _ = Notification.objects.filter(id__in=notification_ids, user=request.user).delete()
+            deleted_count = delete_notifications_for(request.user, notification_ids)
             return Response({'message': f'{deleted_count} notifications deleted'})
         else:
             # Delete all notifications for current user
-            if request.user.user_type in ['agronomist', 'superuser']:
-                deleted_count, _ = AgronomistNotification.objects.filter(agronomist_user=request.user).delete()
-            else:
-                deleted_count, _ = Notification.objects.filter(user=request.user).delete()
+            deleted_count = delete_notifications_for(request.user)
             return Response({'message': f'All {deleted_count} notifications deleted'})
 
 @api_view(['GET', 'POST'])
@@ -436,8 +500,7 @@ def spray_irrigation_logs(request):
         else:
             logs = SprayIrrigationLog.objects.filter(user=request.user, date=today)
         
-        serializer = SprayIrrigationLogSerializer(logs, many=True)
-        return Response(serializer.data)
+        return list_response(request, logs, SprayIrrigationLogSerializer, sort='-created_at')
     
     elif request.method == 'POST':
         # Create new spray/irrigation log
@@ -476,8 +539,7 @@ def crop_stages(request):
         else:
             stages = CropStage.objects.filter(user=request.user).order_by('-created_at')
         
-        serializer = CropStageSerializer(stages, many=True)
-        return Response(serializer.data)
+        return crop_stage_list_response(request, stages)
     
     elif request.method == 'POST':
         # Create new crop stage
@@ -510,7 +572,7 @@ def crop_stages(request):
 def crop_stage_detail(request, stage_id):
     
     try:
-        stage = CropStage.objects.get(id=stage_id, user=request.user)
+        stage = CropStage.objects.select_related('alert').get(id=stage_id, user=request.user)
     except CropStage.DoesNotExist:
         return Response({'error': 'Crop stage not found'}, status=status.HTTP_404_NOT_FOUND)
     
@@ -529,6 +591,43 @@ def crop_stage_detail(request, stage_id):
         stage.delete()
         return Response({'message': 'Crop stage deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def crop_alerts(request):
+    """
+    Crops with active alerts across the user's farms, read from the
+    materialized CropAlert index; ?farm_id=, ?timeline_status= and
+    ?health_alert=true narrow it down. Each row carries the day it was
+    computed for and is_stale until the nightly refresh has run
+    """
+    # Alerts carry the farm and user of their crop stage, so they are scoped without a join
+    if request.user.is_superuser:
+        scope = {'farm__is_active': True}
+    elif request.user.user_type == 'agronomist':
+        scope = {'farm__created_by': request.user, 'farm__is_active': True}
+    else:
+        scope = {'user': request.user}
+    
+    farm_id = request.query_params.get('farm_id')
+    if farm_id:
+        try:
+            scope['farm_id'] = int(farm_id)
+        except ValueError:
+            return Response({'error': 'farm_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # The latest stored summaries; rows from an earlier day are flagged rather than recomputed here
+    alerts = CropAlert.objects.filter(alert_count__gt=0, **scope)
+    
+    timeline_status = request.query_params.get('timeline_status')
+    if timeline_status:
+        alerts = alerts.filter(timeline_status=timeline_status)
+    
+    health_alert = request.query_params.get('health_alert')
+    if health_alert is not None:
+        alerts = alerts.filter(health_alert=health_alert.lower() == 'true')
+    
+    return list_response(request, alerts, CropAlertSerializer)
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def import_crop_stages(request):
@@ -648,7 +747,7 @@ def export_crop_stages(request):
     from django.http import HttpResponse
     
     # Get user's crop stages
-    crop_stages = CropStage.objects.filter(user=request.user).order_by('-created_at')
+    crop_stages = CropStage.objects.filter(user=request.user).select_related('farm').order_by('-created_at')
     
     # Create CSV response
     response = HttpResponse(content_type='text/csv')
@@ -720,8 +819,7 @@ def fertigations(request):
         
         fertigations = fertigations.order_by('-date_time')
         
-        serializer = FertigationSerializer(fertigations, many=True)
-        return Response(serializer.data)
+        return list_response(request, fertigations, FertigationSerializer, FERTIGATION_LIST, sort='-date_time')
     
     elif request.method == 'POST':
         # Create new fertigation
@@ -745,12 +843,14 @@ def fertigations(request):
             
             # Create notification for completed fertigation
             if fertigation.status == 'completed':
-                title = f"Fertigation Completed: {fertigation.crop_zone_name}"
-                message = f"Fertigation activity completed for {fertigation.crop_zone_name} at {farm.name}. EC change: {fertigation.ec_change:.2f}, pH change: {fertigation.ph_change:.2f}"
-                
-                Notification.objects.create(
-                    title=title,
-                    message=message,
+                create_notification(
+                    [request.user],
+                    template='fertigation_completed',
+                    params={
+                        'zone': fertigation.crop_zone_name,
+                        'ec_change': float(fertigation.ec_change),
+                        'ph_change': float(fertigation.ph_change)
+                    },
                     notification_type='general',
                     farm=farm,
                     user=request.user
@@ -802,7 +902,7 @@ def fertigation_analytics(request):
     """
     Get analytics data for fertigation activities
     """
-    from django.db.models import Avg, Count, Sum
+    from django.db.models import Avg, Count, F, Sum
     from datetime import datetime, timedelta
     
     # Get date range (default: last 30 days)
@@ -816,13 +916,20 @@ def fertigation_analytics(request):
         status='completed'
     )
     
+    totals = fertigations.aggregate(
+        total=Count('id'),
+        avg_ec_change=Avg(F('ec_after') - F('ec_before')),
+        avg_ph_change=Avg(F('ph_after') - F('ph_before')),
+        total_water_used=Sum('water_volume'),
+    )
+    
     analytics = {
-        'total_fertigations': fertigations.count(),
-        'avg_ec_change': fertigations.aggregate(Avg('ec_after'))['ec_after__avg'] or 0,
-        'avg_ph_change': fertigations.aggregate(Avg('ph_after'))['ph_after__avg'] or 0,
-        'total_water_used': fertigations.aggregate(Sum('water_volume'))['water_volume__sum'] or 0,
+        'total_fertigations': totals['total'],
+        'avg_ec_change': round(totals['avg_ec_change'] or 0, 2),
+        'avg_ph_change': round(totals['avg_ph_change'] or 0, 2),
+        'total_water_used': totals['total_water_used'] or 0,
         'fertigations_by_status': fertigations.values('status').annotate(count=Count('id')),
-        'recent_fertigations': FertigationSerializer(fertigations.order_by('-date_time')[:5], many=True).data,
+        'recent_fertigations': FertigationSerializer(FertigationSerializer.setup_eager_loading(fertigations).order_by('-date_time')[:5], many=True).data,
         'ec_ph_trends': []
     }
     
@@ -854,8 +961,9 @@ def fertigation_schedule(request):
             scheduled_date__gte=timezone.now()
         ).order_by('scheduled_date')
         
-        serializer = FertigationSerializer(scheduled_fertigations, many=True)
-        return Response(serializer.data)
+        return list_response(
+            request, scheduled_fertigations, FertigationSerializer, FERTIGATION_LIST, sort='scheduled_date'
+        )
     
     elif request.method == 'POST':
         # Create scheduled fertigation
@@ -878,12 +986,10 @@ def fertigation_schedule(request):
             fertigation = serializer.save(user=request.user)
             
             # Create notification for scheduled fertigation
-            title = f"Fertigation Scheduled: {fertigation.crop_zone_name}"
-            message = f"Fertigation scheduled for {fertigation.crop_zone_name} at {farm.name} on {fertigation.scheduled_date.strftime('%Y-%m-%d %H:%M')}"
-            
-            Notification.objects.create(
-                title=title,
-                message=message,
+            create_notification(
+                [request.user],
+                template='fertigation_scheduled',
+                params={'zone': fertigation.crop_zone_name, 'scheduled_at': fertigation.scheduled_date},
                 notification_type='general',
                 farm=farm,
                 user=request.user
@@ -917,8 +1023,7 @@ def workers(request):
         if farm_id:
             workers = workers.filter(farm_id=farm_id)
         
-        serializer = WorkerSerializer(workers, many=True)
-        return Response(serializer.data)
+        return list_response(request, workers, WorkerSerializer, sort='name')
     
     elif request.method == 'POST':
         # Create new worker
@@ -951,7 +1056,7 @@ def worker_detail(request, worker_id):
         return Response(serializer.data)
     
     elif request.method == 'PUT':
-        serializer = UpdateWorkerSerializer(worker, data=request.data, partial=True)
+        serializer = CreateWorkerSerializer(worker, data=request.data, partial=True)
         if serializer.is_valid():
             # Verify farm access if farm is being updated
             if 'farm' in serializer.validated_data:
@@ -997,8 +1102,7 @@ def worker_tasks(request):
         if date_to:
             tasks = tasks.filter(assigned_date__lte=date_to)
         
-        serializer = WorkerTaskSerializer(tasks, many=True)
-        return Response(serializer.data)
+        return list_response(request, tasks, WorkerTaskSerializer, sort='-assigned_date')
     
     elif request.method == 'POST':
         # Create new worker task
@@ -1051,41 +1155,73 @@ def worker_dashboard_summary(request):
     if request.user.user_type != 'farm_user':
         return Response({'error': 'Only farm users can view worker dashboard'}, status=status.HTTP_403_FORBIDDEN)
     
-    from datetime import date
-    
-    # Get today's statistics
-    today = date.today()
-    
     # Tasks managed by this farm user
     all_tasks = WorkerTask.objects.filter(user=request.user)
     
-    # Today's tasks
-    today_tasks = all_tasks.filter(assigned_date=today)
-    
-    # Get unique workers
-    user_farms = Farm.objects.filter(users=request.user)
-    workers = Worker.objects.filter(farm__in=user_farms, user=request.user)
+    # Counters come from the cached per-farm snapshots; None covers tasks without a farm
+    farm_ids = list(Farm.objects.filter(users=request.user).values_list('id', flat=True))
+    kpis = user_kpis(request.user, farm_ids + [None])
+    task_kpis = kpis['worker_tasks']
     
     summary = {
-        'total_workers': workers.count(),
-        'total_tasks': all_tasks.count(),
-        'today_tasks_assigned': today_tasks.count(),
-        'today_tasks_completed': today_tasks.filter(status='completed').count(),
-        'pending_tasks': all_tasks.filter(status='pending').count(),
-        'completed_tasks': all_tasks.filter(status='completed').count(),
-        'tasks_with_issues': all_tasks.filter(status='issue').count(),
+        'total_workers': kpis['workers']['total'],
+        'total_tasks': task_kpis['total'],
+        'today_tasks_assigned': task_kpis['today_assigned'],
+        'today_tasks_completed': task_kpis['today_completed'],
+        'pending_tasks': task_kpis['pending'],
+        'completed_tasks': task_kpis['completed'],
+        'tasks_with_issues': task_kpis['issue'],
         'recent_completed_tasks': WorkerTaskSerializer(
-            all_tasks.filter(status='completed').order_by('-updated_at')[:5],
+            WorkerTaskSerializer.setup_eager_loading(all_tasks).filter(status='completed').order_by('-updated_at')[:5],
             many=True
         ).data,
         'pending_issues': WorkerTaskSerializer(
-            all_tasks.filter(status='issue').order_by('-assigned_date')[:5],
+            WorkerTaskSerializer.setup_eager_loading(all_tasks).filter(status='issue').order_by('-assigned_date')[:5],
             many=True
         ).data,
     }
     
     return Response(summary)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def labor_analytics(request):
+    """
+    Worker-days, labor cost, completion and issue rates per worker, farm and
+    month, reconciled against expenditures in the labor category
+    """
+    if request.user.user_type != 'farm_user':
+        return Response({'error': 'Only farm users can view labor analytics'}, status=status.HTTP_403_FORBIDDEN)
+    
+    user_farms = Farm.objects.filter(users=request.user)
+    worker_tasks = WorkerTask.objects.filter(user=request.user, worker__farm__in=user_farms)
+    expenditures = Expenditure.objects.filter(farm__in=user_farms, user=request.user)
+    
+    farm_id = request.GET.get('farm_id')
+    if farm_id:
+        worker_tasks = worker_tasks.filter(worker__farm_id=farm_id)
+        expenditures = expenditures.filter(farm_id=farm_id)
+    employment_type = request.GET.get('employment_type')
+    if employment_type:
+        worker_tasks = worker_tasks.filter(worker__employment_type=employment_type)
+    try:
+        date_from, date_to = requested_dates(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if date_from:
+        worker_tasks = worker_tasks.filter(assigned_date__gte=date_from)
+        expenditures = expenditures.filter(expense_date__gte=date_from)
+    if date_to:
+        worker_tasks = worker_tasks.filter(assigned_date__lte=date_to)
+        expenditures = expenditures.filter(expense_date__lte=date_to)
+    
+    try:
+        limit = min(max(int(request.GET.get('limit', 100)), 1), 1000)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(labor_summary(worker_tasks, expenditures, worker_limit=limit))
+
 # Issue Report Management
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
@@ -1112,8 +1248,7 @@ def issue_reports(request):
         if severity_filter:
             issues = issues.filter(severity=severity_filter)
         
-        serializer = IssueReportSerializer(issues, many=True)
-        return Response(serializer.data)
+        return list_response(request, issues, IssueReportSerializer, sort='-created_at')
     
     elif request.method == 'POST':
         serializer = CreateIssueReportSerializer(data=request.data)
@@ -1136,71 +1271,42 @@ def issue_reports(request):
                 farm=user_farm
             )
             
-            # Create notifications for both farm user and agronomist
-            farm_user_notification = Notification.objects.create(
-                user=request.user,
-                title=f"Issue Report Submitted",
-                message=f"Your issue report has been submitted successfully. Issue Type: {issue_report.get_issue_type_display()}, Severity: {issue_report.get_severity_display()}",
+            # Confirmation for the farm user
+            create_notification(
+                [request.user],
+                template='issue_report_submitted',
+                params={
+                    'issue_type': issue_report.get_issue_type_display(),
+                    'severity': issue_report.get_severity_display()
+                },
                 notification_type='issue_report_submitted',
                 farm=issue_report.farm,
-                related_object_id=issue_report.id
+                user=request.user,
+                related_object_id=issue_report.id,
+                related_model_name='IssueReport'
             )
             
             if agronomist_user:
-                title = f"New Issue Report from {request.user.username}"
-                message = f"Farm: {issue_report.farm.name if issue_report.farm else 'N/A'}, Issue Type: {issue_report.get_issue_type_display()}, Severity: {issue_report.get_severity_display()}, Description: {issue_report.description[:100]}{'...' if len(issue_report.description) > 100 else ''}"
-                
-                # Create regular notification for agronomist
-                agronomist_notification = Notification.objects.create(
-                    user=agronomist_user,
-                    title=title,
-                    message=message,
+                # One notification body, delivered to the agronomist
+                agronomist_notification = create_notification(
+                    [agronomist_user],
+                    template='issue_report_received',
+                    params={
+                        'user': request.user.username,
+                        'issue_type': issue_report.get_issue_type_display(),
+                        'severity': issue_report.get_severity_display(),
+                        'description': f"{issue_report.description[:100]}{'...' if len(issue_report.description) > 100 else ''}"
+                    },
                     notification_type='issue_report',
                     farm=issue_report.farm,
-                    related_object_id=issue_report.id
-                )
-                
-                # Create persistent agronomist notification
-                persistent_agronomist_notification = create_agronomist_notification(
-                    agronomist_user=agronomist_user,
-                    title=title,
-                    message=message,
-                    notification_type='issue_report',
-                    source_user=request.user,
-                    source_farm=issue_report.farm,
+                    user=agronomist_user,
+                    created_by=request.user,
                     related_object_id=issue_report.id,
                     related_model_name='IssueReport'
                 )
                 
                 # Send real-time notification via channels to specific agronomist
-                try:
-                    from channels.layers import get_channel_layer
-                    channel_layer = get_channel_layer()
-                    
-                    if channel_layer:
-                        notification_data = {
-                            'type': 'notification_message',
-                            'title': persistent_agronomist_notification.title,
-                            'message': persistent_agronomist_notification.message,
-                            'notification_type': persistent_agronomist_notification.notification_type,
-                            'notification_id': persistent_agronomist_notification.id,
-                            'farm_id': issue_report.farm.id if issue_report.farm else None,
-                            'farm_name': issue_report.farm.name if issue_report.farm else None,
-                            'user_id': request.user.id,
-                            'user_name': request.user.username,
-                            'timestamp': persistent_agronomist_notification.created_at.isoformat()
-                        }
-                        
-                        # Send to specific agronomist who created this farm user
-                        specific_agronomist_group = f'agronomist_{agronomist_user.id}_notifications'
-                        async_to_sync(channel_layer.group_send)(specific_agronomist_group, notification_data)
-                        
-                        # Also send to general agronomist notifications group (fallback)
-                        async_to_sync(channel_layer.group_send)('agronomist_notifications', notification_data)
-                        
-                        
-                except Exception as e:
-                    pass
+                push_agronomist_notification(agronomist_notification, agronomist_user, source_user=request.user)
             
             response_serializer = IssueReportSerializer(issue_report)
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
@@ -1281,8 +1387,7 @@ def spray_schedules(request):
         # Order by date_time (newest first)
         spray_schedules = spray_schedules.order_by('-date_time')
         
-        serializer = SprayScheduleSerializer(spray_schedules, many=True)
-        return Response(serializer.data)
+        return list_response(request, spray_schedules, SprayScheduleSerializer, sort='-date_time')
     
     elif request.method == 'POST':
         serializer = CreateSprayScheduleSerializer(data=request.data)
@@ -1290,10 +1395,16 @@ def spray_schedules(request):
             spray_schedule = serializer.save(user=request.user)
             
             # Create notification for spray schedule creation
-            Notification.objects.create(
+            create_notification(
+                [request.user],
                 user=request.user,
-                title="Spray Schedule Created",
-                message=f"Spray schedule {spray_schedule.spray_id} for {spray_schedule.crop_zone} has been created. Product: {spray_schedule.product_used}, Date: {spray_schedule.date_time.strftime('%Y-%m-%d %H:%M')}",
+                template='spray_scheduled',
+                params={
+                    'spray_id': spray_schedule.spray_id,
+                    'zone': spray_schedule.crop_zone,
+                    'product': spray_schedule.product_used,
+                    'scheduled_at': spray_schedule.date_time
+                },
                 notification_type='spray_scheduled',
                 farm=spray_schedule.farm,
                 related_object_id=spray_schedule.id
@@ -1301,10 +1412,11 @@ def spray_schedules(request):
             
             # If there's a next spray reminder, create notification for that too
             if spray_schedule.next_spray_reminder:
-                Notification.objects.create(
+                create_notification(
+                    [request.user],
                     user=request.user,
-                    title="Spray Reminder Set",
-                    message=f"Reminder set for next spray on {spray_schedule.crop_zone}. Reminder date: {spray_schedule.next_spray_reminder.strftime('%Y-%m-%d %H:%M')}",
+                    template='spray_reminder',
+                    params={'zone': spray_schedule.crop_zone, 'reminder_at': spray_schedule.next_spray_reminder},
                     notification_type='spray_reminder',
                     farm=spray_schedule.farm,
                     due_date=spray_schedule.next_spray_reminder,
@@ -1350,10 +1462,16 @@ def spray_schedule_detail(request, schedule_id):
             
             # If marked as completed, create completion notification
             if updated_schedule.is_completed and 'is_completed' in request.data:
-                Notification.objects.create(
+                create_notification(
+                    [request.user],
                     user=request.user,
-                    title="Spray Application Completed",
-                    message=f"Spray {updated_schedule.spray_id} for {updated_schedule.crop_zone} has been completed. Product: {updated_schedule.product_used}. PHI: {updated_schedule.phi_log} days.",
+                    template='spray_completed',
+                    params={
+                        'spray_id': updated_schedule.spray_id,
+                        'zone': updated_schedule.crop_zone,
+                        'product': updated_schedule.product_used,
+                        'phi': updated_schedule.phi_log
+                    },
                     notification_type='spray_completed',
                     farm=updated_schedule.farm,
                     related_object_id=updated_schedule.id
@@ -1408,28 +1526,13 @@ def spray_schedule_analytics(request):
     else:
         start_date = timezone.now() - timedelta(days=30)
     
-    period_schedules = spray_schedules.filter(date_time__gte=start_date)
-    
-    analytics_data = {
-        'total_schedules': period_schedules.count(),
-        'completed_schedules': period_schedules.filter(is_completed=True).count(),
-        'pending_schedules': period_schedules.filter(is_completed=False).count(),
-        'overdue_reminders': spray_schedules.filter(
-            next_spray_reminder__lt=timezone.now(),
-            next_spray_reminder__isnull=False,
-            is_completed=False
-        ).count(),
-        'phi_violations': period_schedules.filter(
-            is_completed=True,
-            completion_date__isnull=False
-        ).count(),  # This would need more complex logic for actual PHI violations
-        'reason_breakdown': {
-            'pest': period_schedules.filter(reason='pest').count(),
-            'disease': period_schedules.filter(reason='disease').count(),
-            'nutrient': period_schedules.filter(reason='nutrient').count(),
-        },
-        'monthly_trend': []  # Could add monthly breakdown here
-    }
+    # Trend covers the last 12 months, starting on the first of a month
+    now = timezone.now()
+    trend_start = timezone.localtime(now).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(11):
+        trend_start = (trend_start - timedelta(days=1)).replace(day=1)
+    
+    analytics_data = spray_summary(spray_schedules, start_date, now, trend_start)
     
     return Response(analytics_data)
 
@@ -1471,8 +1574,7 @@ def expenditures(request):
         if farm_id:
             expenditures = expenditures.filter(farm_id=farm_id)
         
-        serializer = ExpenditureSerializer(expenditures, many=True)
-        return Response(serializer.data)
+        return list_response(request, expenditures, ExpenditureSerializer, sort='-expense_date')
     
     elif request.method == 'POST':
         # Create new expenditure
@@ -1539,39 +1641,42 @@ def expenditure_analytics(request):
     if date_to:
         expenditures = expenditures.filter(expense_date__lte=date_to)
     
-    # Calculate analytics
-    from django.db.models import Sum
-    from decimal import Decimal
+    # Totals and breakdowns come from one grouped query
+    analytics_data = expenditure_summary(expenditures)
+    analytics_data['recent_expenditures'] = ExpenditureSerializer(expenditures.select_related('farm', 'user')[:5], many=True).data
     
-    total_amount = expenditures.aggregate(total=Sum('amount'))['total'] or Decimal('0')
+    return Response(analytics_data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def expenditure_series(request):
+    """
+    Expenditure per day/week/month/quarter with category and payment method
+    matrices and period-over-period deltas, in a columnar shape for charts
+    """
+    if request.user.user_type != 'farm_user':
+        return Response({'error': 'Only farm users can view expenditure analytics'}, status=status.HTTP_403_FORBIDDEN)
     
-    # Category wise breakdown
-    category_breakdown = {}
-    for category_code, category_name in Expenditure.CATEGORY_CHOICES:
-        category_total = expenditures.filter(category=category_code).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        if category_total > 0:
-            category_breakdown[category_name] = {
-                'amount': category_total,
-                'percentage': round((category_total / total_amount * 100) if total_amount > 0 else 0, 2)
-            }
+    bucket = request.GET.get('bucket', 'month')
+    if bucket not in SERIES_BUCKETS:
+        return Response({'error': f"bucket must be one of: {', '.join(SERIES_BUCKETS)}"}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Payment method breakdown
-    payment_breakdown = {}
-    for payment_code, payment_name in Expenditure.PAYMENT_METHOD_CHOICES:
-        payment_total = expenditures.filter(payment_method=payment_code).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        if payment_total > 0:
-            payment_breakdown[payment_name] = payment_total
-    
-    analytics_data = {
-        'total_expenditure': total_amount,
-        'total_transactions': expenditures.count(),
-        'average_transaction': round(total_amount / expenditures.count() if expenditures.count() > 0 else 0, 2),
-        'category_breakdown': category_breakdown,
-        'payment_method_breakdown': payment_breakdown,
-        'recent_expenditures': ExpenditureSerializer(expenditures[:5], many=True).data
-    }
+    user_farms = Farm.objects.filter(users=request.user)
+    expenditures = Expenditure.objects.filter(farm__in=user_farms, user=request.user)
     
-    return Response(analytics_data)
+    farm_id = request.GET.get('farm_id')
+    if farm_id:
+        expenditures = expenditures.filter(farm_id=farm_id)
+    try:
+        date_from, date_to = requested_dates(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if date_from:
+        expenditures = expenditures.filter(expense_date__gte=date_from)
+    if date_to:
+        expenditures = expenditures.filter(expense_date__lte=date_to)
+    
+    return Response(expenditure_timeseries(expenditures, bucket))
 
 # Sale Management Views
 @api_view(['GET', 'POST'])
@@ -1616,8 +1721,7 @@ def sales(request):
         if farm_id:
             sales = sales.filter(farm_id=farm_id)
         
-        serializer = SaleSerializer(sales, many=True)
-        return Response(serializer.data)
+        return list_response(request, sales, SaleSerializer, SALE_LIST, sort='-sale_date')
     
     elif request.method == 'POST':
         # Create new sale
@@ -1683,74 +1787,96 @@ def sale_analytics(request):
     if date_to:
         sales = sales.filter(sale_date__lte=date_to)
     
-    # Calculate analytics
-    total_sales_amount = sum([sale.total_amount for sale in sales])
-    total_amount_received = sum([sale.amount_received for sale in sales])
-    total_pending_amount = sum([sale.remaining_amount for sale in sales])
-    total_net_amount = sum([sale.net_amount for sale in sales])
-    
-    # Payment status breakdown
-    payment_status_breakdown = []
-    for status_choice in Sale.PAYMENT_STATUS_CHOICES:
-        status_sales = sales.filter(payment_status=status_choice[0])
-        status_amount = sum([sale.total_amount for sale in status_sales])
-        payment_status_breakdown.append({
-            'status': status_choice[0],
-            'status_display': status_choice[1],
-            'count': status_sales.count(),
-            'total_amount': status_amount,
-        })
+    # Totals and breakdowns are grouped aggregates computed in the database
+    analytics_data = sale_summary(sales)
+    analytics_data['recent_sales'] = SaleSerializer(sales.select_related('farm', 'user')[:5], many=True).data
     
-    # Crop breakdown
-    crop_breakdown = {}
-    for sale in sales:
-        crop = sale.crop_name
-        if crop in crop_breakdown:
-            crop_breakdown[crop]['count'] += 1
-            crop_breakdown[crop]['total_amount'] += sale.total_amount
-            crop_breakdown[crop]['total_quantity'] += sale.quantity_sold
-        else:
-            crop_breakdown[crop] = {
-                'crop_name': crop,
-                'count': 1,
-                'total_amount': sale.total_amount,
-                'total_quantity': sale.quantity_sold,
-                'unit': sale.get_unit_display()
-            }
+    return Response(analytics_data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def profit_and_loss_report(request):
+    """
+    Net margin per farm, crop and batch over a date range, with farm-level
+    costs allocated to batches by crop area or plant count (?basis=)
+    """
+    if request.user.user_type != 'farm_user':
+        return Response({'error': 'Only farm users can view profit and loss'}, status=status.HTTP_403_FORBIDDEN)
     
-    crop_breakdown_list = list(crop_breakdown.values())
+    from django.db.models import Q
     
-    # Top buyers
-    buyer_breakdown = {}
-    for sale in sales:
-        buyer = sale.buyer_name
-        if buyer in buyer_breakdown:
-            buyer_breakdown[buyer]['count'] += 1
-            buyer_breakdown[buyer]['total_amount'] += sale.total_amount
-        else:
-            buyer_breakdown[buyer] = {
-                'buyer_name': buyer,
-                'count': 1,
-                'total_amount': sale.total_amount,
-            }
+    basis = request.GET.get('basis', 'area')
+    if basis not in ALLOCATION_BASES:
+        return Response({'error': f"basis must be one of: {', '.join(ALLOCATION_BASES)}"}, status=status.HTTP_400_BAD_REQUEST)
     
-    top_buyers = sorted(buyer_breakdown.values(), key=lambda x: x['total_amount'], reverse=True)[:5]
-    
-    analytics_data = {
-        'total_sales_amount': total_sales_amount,
-        'total_amount_received': total_amount_received,
-        'total_pending_amount': total_pending_amount,
-        'total_net_amount': total_net_amount,
-        'total_transactions': sales.count(),
-        'average_sale_amount': round(total_sales_amount / sales.count() if sales.count() > 0 else 0, 2),
-        'payment_completion_rate': round((total_amount_received / total_sales_amount * 100) if total_sales_amount > 0 else 0, 2),
-        'payment_status_breakdown': payment_status_breakdown,
-        'crop_breakdown': crop_breakdown_list,
-        'top_buyers': top_buyers,
-        'recent_sales': SaleSerializer(sales[:5], many=True).data
-    }
+    try:
+        date_from, date_to = requested_dates(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if date_from and date_to and date_from > date_to:
+        return Response({'error': 'date_from must be before date_to'}, status=status.HTTP_400_BAD_REQUEST)
     
-    return Response(analytics_data)
+    user_farms = Farm.objects.filter(users=request.user)
+    farm_id = request.GET.get('farm_id')
+    if farm_id:
+        user_farms = user_farms.filter(id=farm_id)
+    
+    sales = Sale.objects.filter(farm__in=user_farms, user=request.user)
+    expenditures = Expenditure.objects.filter(farm__in=user_farms, user=request.user)
+    # Batches share overhead only if they were in the ground during the range
+    crop_stages = CropStage.objects.filter(farm__in=user_farms, user=request.user)
+    if date_from:
+        sales = sales.filter(sale_date__gte=date_from)
+        expenditures = expenditures.filter(expense_date__gte=date_from)
+        crop_stages = crop_stages.filter(Q(actual_harvest_date__isnull=True) | Q(actual_harvest_date__gte=date_from))
+    if date_to:
+        sales = sales.filter(sale_date__lte=date_to)
+        expenditures = expenditures.filter(expense_date__lte=date_to)
+        crop_stages = crop_stages.filter(transplant_date__lte=date_to)
+    
+    report = profit_and_loss(sales, expenditures, crop_stages, basis)
+    report.update({'date_from': date_from, 'date_to': date_to})
+    return Response(report)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def yield_analytics(request):
+    """
+    Yield per acre/plant, efficiency and loss-rate percentiles (p10/p50/p90)
+    of harvested batches, grouped by ?group_by=crop,variety,farm,season
+    """
+    if request.user.is_superuser:
+        crop_stages = CropStage.objects.filter(farm__is_active=True)
+    elif request.user.user_type == 'agronomist':
+        crop_stages = CropStage.objects.filter(farm__created_by=request.user, farm__is_active=True)
+    else:
+        crop_stages = CropStage.objects.filter(farm__in=request.user.assigned_farms.all(), user=request.user)
+    
+    group_by = [name.strip() for name in request.GET.get('group_by', 'crop,variety').split(',') if name.strip()]
+    unknown = [name for name in group_by if name not in YIELD_GROUPS]
+    if unknown or not group_by:
+        return Response({'error': f"group_by must be a comma-separated list of: {', '.join(YIELD_GROUPS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    farm_id = request.GET.get('farm_id')
+    if farm_id:
+        crop_stages = crop_stages.filter(farm_id=farm_id)
+    crop_name = request.GET.get('crop_name')
+    if crop_name:
+        crop_stages = crop_stages.filter(crop_name__iexact=crop_name)
+    try:
+        date_from, date_to = requested_dates(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if date_from:
+        crop_stages = crop_stages.filter(actual_harvest_date__gte=date_from)
+    if date_to:
+        crop_stages = crop_stages.filter(actual_harvest_date__lte=date_to)
+    
+    return Response({
+        'group_by': list(dict.fromkeys(group_by)),
+        'percentiles': list(PERCENTILES),
+        'groups': yield_distribution(crop_stages, list(dict.fromkeys(group_by))),
+    })
 
 # ============================================================================
 # NEW FARM-CENTRIC VIEWS FOR FARM USERS
@@ -1760,7 +1886,7 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from .models import Farm, DailyTask, Notification, SprayIrrigationLog, SpraySchedule, CropStage, Fertigation, Worker, WorkerTask, IssueReport, AgronomistNotification, Expenditure, Sale, PlantDiseasePrediction
+from .models import Farm, DailyTask, Notification, SprayIrrigationLog, SpraySchedule, CropStage, Fertigation, Worker, WorkerTask, IssueReport, NotificationRecipient, Expenditure, Sale, PlantDiseasePrediction
 from django.contrib.auth import get_user_model
 User = get_user_model()
 from .serializers import (
@@ -1779,21 +1905,6 @@ from datetime import date
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
-def create_agronomist_notification(agronomist_user, title, message, notification_type, source_user=None, source_farm=None, related_object_id=None, related_model_name=None):
-    """
-    Helper function to create persistent agronomist notifications
-    """
-    return AgronomistNotification.objects.create(
-        agronomist_user=agronomist_user,
-        title=title,
-        message=message,
-        notification_type=notification_type,
-        source_user=source_user,
-        source_farm=source_farm,
-        related_object_id=related_object_id,
-        related_model_name=related_model_name
-    )
-
 def get_farm_access(user, farm_id):
     """Helper function to get farm with proper access control"""
     try:
@@ -1818,27 +1929,9 @@ def my_farms(request):
             print(f"DEBUG: User type mismatch - Expected: farm_user, Got: {request.user.user_type}")
             return Response({'error': 'This endpoint is only for farm users'}, status=status.HTTP_403_FORBIDDEN)
         
-        # Debug: Check all assigned farms (including inactive)
-        all_assigned_farms = request.user.assigned_farms.all()
-        print(f"DEBUG: Total assigned farms (all): {all_assigned_farms.count()}")
-        for farm in all_assigned_farms:
-            print(f"DEBUG: All farms - ID: {farm.id}, Name: {farm.name}, Active: {farm.is_active}")
-        
-        # Debug: Check assigned active farms only
         farms = request.user.assigned_farms.filter(is_active=True)
-        print(f"DEBUG: Found {farms.count()} active assigned farms for user {request.user.username}")
-        
-        # Debug: Print active farm details
-        for farm in farms:
-            print(f"DEBUG: Active Farm - ID: {farm.id}, Name: {farm.name}, Active: {farm.is_active}")
-        
-        # Debug: Check all farms in the system
-        from farms.models import Farm
-        all_farms_count = Farm.objects.filter(is_active=True).count()
-        print(f"DEBUG: Total active farms in system: {all_farms_count}")
         
-        serializer = FarmSerializer(farms, many=True)
-        return Response(serializer.data)
+        return list_response(request, farms, FarmListSerializer)
         
     except Exception as e:
         print(f"ERROR in my_farms endpoint: {str(e)}")
@@ -1868,7 +1961,7 @@ def debug_farm_assignments(request):
         }
         
         # Get all farms
-        all_farms = Farm.objects.all()
+        all_farms = Farm.objects.select_related('created_by').prefetch_related('users')
         for farm in all_farms:
             farm_data = {
                 'id': farm.id,
@@ -1881,7 +1974,9 @@ def debug_farm_assignments(request):
             debug_info['all_farms'].append(farm_data)
         
         # Get all farm users
-        farm_users = CustomUser.objects.filter(user_type='farm_user')
+        farm_users = CustomUser.objects.filter(user_type='farm_user').select_related(
+            'created_by'
+        ).prefetch_related('assigned_farms')
         for user in farm_users:
             user_data = {
                 'id': user.id,
@@ -1906,29 +2001,36 @@ def farm_user_dashboard(request):
     if request.user.user_type != 'farm_user':
         return Response({'error': 'This endpoint is only for farm users'}, status=status.HTTP_403_FORBIDDEN)
     
-    farms = request.user.assigned_farms.filter(is_active=True)
+    from django.db.models import Count
+    
+    farms = list(request.user.assigned_farms.filter(is_active=True))
+    farm_ids = [farm.id for farm in farms]
+    
+    # Counters for every farm at once: the KPI snapshots are computed with one
+    # GROUP BY farm query per source, unread notifications with one more
+    snapshots = farm_kpi_snapshots(farm_ids)
+    unread_by_farm = dict(
+        NotificationRecipient.objects.filter(
+            recipient=request.user, notification__farm_id__in=farm_ids, is_read=False
+        ).order_by().values('notification__farm_id').annotate(count=Count('id')).values_list('notification__farm_id', 'count')
+    )
     
     dashboard_data = {
-        'total_farms': farms.count(),
+        'total_farms': len(farms),
         'farms': []
     }
     
     for farm in farms:
-        # Get basic stats for each farm
-        today_tasks = DailyTask.objects.filter(user=request.user, farm=farm, date=date.today()).count()
-        total_crop_stages = CropStage.objects.filter(user=request.user, farm=farm).count()
-        pending_tasks = WorkerTask.objects.filter(user=request.user, farm=farm, status='pending').count()
-        recent_notifications = Notification.objects.filter(user=request.user, farm=farm, is_read=False).count()
-        
+        snapshot = snapshots[farm.id]
         farm_data = {
             'id': farm.id,
             'name': farm.name,
             'location': farm.location,
             'size_in_acres': farm.size_in_acres,
-            'today_tasks_completed': today_tasks,
-            'total_crop_stages': total_crop_stages,
-            'pending_tasks': pending_tasks,
-            'unread_notifications': recent_notifications
+            'today_tasks_completed': snapshot['daily_tasks'].get(request.user.id, {}).get('today', 0),
+            'total_crop_stages': snapshot['crop_stages'].get(request.user.id, {}).get('total', 0),
+            'pending_tasks': snapshot['worker_tasks'].get(request.user.id, {}).get('pending', 0),
+            'unread_notifications': unread_by_farm.get(farm.id, 0)
         }
         dashboard_data['farms'].append(farm_data)
     
@@ -1945,27 +2047,8 @@ def farm_specific_dashboard(request, farm_id):
     if not farm:
         return Response({'error': 'Farm not found or access denied'}, status=status.HTTP_404_NOT_FOUND)
     
-    # Get comprehensive stats for this specific farm
-    today = date.today()
-    
-    # Daily tasks stats
-    today_tasks = DailyTask.objects.filter(user=request.user, farm=farm, date=today).count()
-    total_tasks_this_month = DailyTask.objects.filter(
-        user=request.user, 
-        farm=farm, 
-        date__month=today.month,
-        date__year=today.year
-    ).count()
-    
-    # Crop stages stats
-    crop_stages = CropStage.objects.filter(user=request.user, farm=farm)
-    total_crop_stages = crop_stages.count()
-    healthy_crops = crop_stages.filter(health_status='healthy').count()
-    crops_needing_attention = crop_stages.filter(health_status='needs_attention').count()
-    
-    # Worker tasks stats
-    pending_worker_tasks = WorkerTask.objects.filter(user=request.user, farm=farm, status='pending').count()
-    completed_worker_tasks = WorkerTask.objects.filter(user=request.user, farm=farm, status='completed').count()
+    # Counters for this farm and user from the cached KPI snapshot
+    kpis = user_kpis(request.user, [farm.id])
     
     # Recent activities
     recent_spray_logs = SprayIrrigationLog.objects.filter(
@@ -1977,25 +2060,25 @@ def farm_specific_dashboard(request, farm_id):
     ).order_by('-created_at')[:5]
     
     # Notifications for this farm
-    unread_notifications = Notification.objects.filter(
-        user=request.user, farm=farm, is_read=False
+    unread_notifications = NotificationRecipient.objects.filter(
+        recipient=request.user, notification__farm=farm, is_read=False
     ).count()
     
     dashboard_data = {
         'farm': FarmSerializer(farm).data,
         'stats': {
-            'today_tasks_completed': today_tasks,
-            'total_tasks_this_month': total_tasks_this_month,
-            'total_crop_stages': total_crop_stages,
-            'healthy_crops': healthy_crops,
-            'crops_needing_attention': crops_needing_attention,
-            'pending_worker_tasks': pending_worker_tasks,
-            'completed_worker_tasks': completed_worker_tasks,
+            'today_tasks_completed': kpis['daily_tasks']['today'],
+            'total_tasks_this_month': kpis['daily_tasks']['this_month'],
+            'total_crop_stages': kpis['crop_stages']['total'],
+            'healthy_crops': kpis['crop_stages']['healthy'],
+            'crops_needing_attention': kpis['crop_stages']['needs_attention'],
+            'pending_worker_tasks': kpis['worker_tasks']['pending'],
+            'completed_worker_tasks': kpis['worker_tasks']['completed'],
             'unread_notifications': unread_notifications
         },
         'recent_activities': {
-            'spray_logs': SprayIrrigationLogSerializer(recent_spray_logs, many=True).data,
-            'fertigations': FertigationSerializer(recent_fertigations, many=True).data
+            'spray_logs': SprayIrrigationLogSerializer(SprayIrrigationLogSerializer.setup_eager_loading(recent_spray_logs), many=True).data,
+            'fertigations': FertigationSerializer(FertigationSerializer.setup_eager_loading(recent_fertigations), many=True).data
         }
     }
     
@@ -2008,7 +2091,7 @@ def farm_user_notifications(request):
     if request.user.user_type != 'farm_user':
         return Response({'error': 'This endpoint is only for farm users'}, status=status.HTTP_403_FORBIDDEN)
     
-    notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
+    notifications = notifications_for(request.user).order_by('-created_at')
     
     # Optional filtering
     farm_id = request.query_params.get('farm_id')
@@ -2019,16 +2102,15 @@ def farm_user_notifications(request):
     if notification_type:
         notifications = notifications.filter(notification_type=notification_type)
     
-    # Pagination
-    limit = request.query_params.get('limit', 20)
+    # Pagination: ?limit= sets the page size when ?page_size= is not given
     try:
-        limit = int(limit)
-        notifications = notifications[:limit]
+        page_size = max(int(request.query_params.get('limit', 20)), 1)
     except ValueError:
-        notifications = notifications[:20]
+        page_size = 20
     
-    serializer = NotificationSerializer(notifications, many=True)
-    return Response(serializer.data)
+    return list_response(
+        request, notifications, NotificationSerializer, NOTIFICATION_LIST, sort='-id', default_page_size=page_size
+    )
 
 # ============================================================================
 # FARM-SPECIFIC FEATURE VIEWS (No Farm Dropdown Needed)
@@ -2055,8 +2137,7 @@ def farm_daily_tasks(request, farm_id):
         else:
             tasks = DailyTask.objects.filter(user=request.user, farm=farm, date=today)
         
-        serializer = DailyTaskSerializer(tasks, many=True)
-        return Response(serializer.data)
+        return list_response(request, tasks, DailyTaskSerializer, DAILY_TASK_LIST, sort='-created_at')
     
     elif request.method == 'POST':
         today = date.today()
@@ -2124,49 +2205,30 @@ def farm_daily_tasks(request, farm_id):
             if task.dripper_ec or task.dripper_ph:
                 measurements.append("Dripper")
 
-            title = "Daily Tasks Completed"
-            message = f"{user_name} completed daily tasks for {farm.name}. "
-            message += f"Tasks: {', '.join(completed_tasks) if completed_tasks else 'None'}. "
-            if measurements:
-                message += f"Water measurements recorded for: {', '.join(measurements)}. "
-            message += f"Submitted at {task.created_at.strftime('%H:%M:%S')}"
-
-            # Create persistent agronomist notification
-            agronomist_notification = create_agronomist_notification(
-                agronomist_user=agronomist_user,
-                title=title,
-                message=message,
+            # One notification body, delivered to the agronomist
+            agronomist_notification = create_notification(
+                [agronomist_user],
+                template='daily_task_completed',
+                params={
+                    'user': user_name,
+                    'tasks': ', '.join(completed_tasks),
+                    'measurements': ', '.join(measurements),
+                    'recorded_at': task.created_at
+                },
                 notification_type='daily_task',
-                source_user=request.user,
-                source_farm=farm,
+                farm=farm,
+                user=agronomist_user,
+                created_by=request.user,
                 related_object_id=task.id,
                 related_model_name='DailyTask'
             )
 
             # Send WebSocket notification
-            channel_layer = get_channel_layer()
-            if channel_layer:
-                try:
-                    notification_data = {
-                        'type': 'notification_message',
-                        'title': title,
-                        'message': message,
-                        'notification_type': 'daily_task',
-                        'notification_id': agronomist_notification.id,
-                        'farm_id': farm.id,
-                        'farm_name': farm.name,
-                        'user_id': request.user.id,
-                        'user_name': user_name,
-                        'completed_tasks': completed_tasks,
-                        'measurements': measurements,
-                        'timestamp': agronomist_notification.created_at.isoformat()
-                    }
-
-                    specific_agronomist_group = f'agronomist_{agronomist_user.id}_notifications'
-                    async_to_sync(channel_layer.group_send)(specific_agronomist_group, notification_data)
-                    async_to_sync(channel_layer.group_send)('agronomist_notifications', notification_data)
-                except Exception as e:
-                    logger.error(f"Failed to send WebSocket notification: {e}")
+            push_agronomist_notification(
+                agronomist_notification, agronomist_user, source_user=request.user,
+                completed_tasks=completed_tasks,
+                measurements=measurements
+            )
 
         return Response({
             'success': True,
@@ -2240,50 +2302,31 @@ def farm_daily_task_detail(request, farm_id, task_id):
             if task.dripper_ec or task.dripper_ph:
                 measurements.append("Dripper")
 
-            title = "Daily Tasks Updated"
-            message = f"{user_name} updated daily tasks for {farm.name}. "
-            message += f"Tasks: {', '.join(completed_tasks) if completed_tasks else 'None'}. "
-            if measurements:
-                message += f"Water measurements updated for: {', '.join(measurements)}. "
-            message += f"Updated at {task.updated_at.strftime('%H:%M:%S')}"
-
-            # Create persistent agronomist notification
-            agronomist_notification = create_agronomist_notification(
-                agronomist_user=agronomist_user,
-                title=title,
-                message=message,
+            # One notification body, delivered to the agronomist
+            agronomist_notification = create_notification(
+                [agronomist_user],
+                template='daily_task_updated',
+                params={
+                    'user': user_name,
+                    'tasks': ', '.join(completed_tasks),
+                    'measurements': ', '.join(measurements),
+                    'recorded_at': task.updated_at
+                },
                 notification_type='daily_task',
-                source_user=request.user,
-                source_farm=farm,
+                farm=farm,
+                user=agronomist_user,
+                created_by=request.user,
                 related_object_id=task.id,
                 related_model_name='DailyTask'
             )
 
             # Send WebSocket notification
-            channel_layer = get_channel_layer()
-            if channel_layer:
-                try:
-                    notification_data = {
-                        'type': 'notification_message',
-                        'title': title,
-                        'message': message,
-                        'notification_type': 'daily_task',
-                        'notification_id': agronomist_notification.id,
-                        'farm_id': farm.id,
-                        'farm_name': farm.name,
-                        'user_id': request.user.id,
-                        'user_name': user_name,
-                        'completed_tasks': completed_tasks,
-                        'measurements': measurements,
-                        'timestamp': agronomist_notification.created_at.isoformat(),
-                        'action': 'updated'
-                    }
-
-                    specific_agronomist_group = f'agronomist_{agronomist_user.id}_notifications'
-                    async_to_sync(channel_layer.group_send)(specific_agronomist_group, notification_data)
-                    async_to_sync(channel_layer.group_send)('agronomist_notifications', notification_data)
-                except Exception as e:
-                    logger.error(f"Failed to send WebSocket notification: {e}")
+            push_agronomist_notification(
+                agronomist_notification, agronomist_user, source_user=request.user,
+                completed_tasks=completed_tasks,
+                measurements=measurements,
+                action='updated'
+            )
 
         return Response({
             'success': True,
@@ -2316,8 +2359,7 @@ def farm_crop_stages(request, farm_id):
         if health_status:
             crop_stages = crop_stages.filter(health_status=health_status)
         
-        serializer = CropStageSerializer(crop_stages, many=True)
-        return Response(serializer.data)
+        return crop_stage_list_response(request, crop_stages)
     
     elif request.method == 'POST':
         serializer = CreateCropStageSerializer(data=request.data)
@@ -2335,7 +2377,7 @@ def farm_crop_stage_detail(request, farm_id, stage_id):
         return Response({'error': 'Farm not found or access denied'}, status=status.HTTP_404_NOT_FOUND)
     
     try:
-        crop_stage = CropStage.objects.get(id=stage_id, user=request.user, farm=farm)
+        crop_stage = CropStage.objects.select_related('alert').get(id=stage_id, user=request.user, farm=farm)
     except CropStage.DoesNotExist:
         return Response({'error': 'Crop stage not found'}, status=status.HTTP_404_NOT_FOUND)
     
@@ -2354,6 +2396,11 @@ def farm_crop_stage_detail(request, farm_id, stage_id):
         crop_stage.delete()
         return Response({'message': 'Crop stage deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
 
+FARM_NOTIFICATION_KEYS = (
+    'id', 'title', 'message', 'notification_type', 'priority', 'is_read', 'is_farm_wide',
+    'created_by', 'created_at', 'due_date',
+)
+
 @api_view(['GET', 'POST', 'PUT'])
 @permission_classes([IsAuthenticated])
 def farm_notifications(request, farm_id):
@@ -2363,26 +2410,33 @@ def farm_notifications(request, farm_id):
         return Response({'error': 'Farm not found or access denied'}, status=status.HTTP_404_NOT_FOUND)
     
     if request.method == 'GET':
-        # Get notifications ONLY for this specific farm - complete isolation
-        notifications = Notification.objects.filter(farm=farm).order_by('-priority', '-created_at')
+        from django.db.models import Count, Exists, OuterRef, Q
         
-        # For farm users, show their personal notifications + farm-wide announcements
+        # Get notifications ONLY for this specific farm - complete isolation
         if request.user.user_type == 'farm_user':
-            from django.db import models
-            notifications = notifications.filter(
-                models.Q(user=request.user, is_farm_wide=False) |  # Personal notifications
-                models.Q(is_farm_wide=True, user__isnull=True)     # Farm-wide announcements
+            # Farm users see what was delivered to them: personal notifications + farm-wide announcements
+            notifications = notifications_for(request.user).filter(farm=farm)
+        else:
+            # Agronomists see every notification of the farm; read once all recipients have read it
+            notifications = Notification.objects.filter(farm=farm).annotate(
+                is_read=~Exists(NotificationRecipient.objects.filter(notification=OuterRef('pk'), is_read=False))
             )
+        # Counts cover every page
+        counts = notifications.aggregate(total_count=Count('pk'), unread_count=Count('pk', filter=Q(is_read=False)))
         
-        # Include unread count
-        unread_count = notifications.filter(is_read=False).count()
+        # Newest first within each priority; ids follow creation order
+        try:
+            keys = selected_keys(request, FARM_NOTIFICATION_KEYS)
+            page, cursor = paginate(request, notifications.select_related('created_by', 'farm'), '-priority')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         notifications_data = []
-        for notif in notifications:
-            notifications_data.append({
+        for notif in page:
+            notification_data = {
                 'id': notif.id,
-                'title': notif.title,
-                'message': notif.message,
+                'title': notif.rendered_title,
+                'message': notif.rendered_message,
                 'notification_type': notif.notification_type,
                 'priority': notif.priority,
                 'is_read': notif.is_read,
@@ -2390,13 +2444,15 @@ def farm_notifications(request, farm_id):
                 'created_by': notif.created_by.username if notif.created_by else 'System',
                 'created_at': notif.created_at,
                 'due_date': notif.due_date,
-            })
+            }
+            notifications_data.append({key: notification_data[key] for key in keys})
         
         return Response({
             'notifications': notifications_data,
-            'unread_count': unread_count,
-            'total_count': len(notifications_data)
-        })
+            'unread_count': counts['unread_count'],
+            'total_count': counts['total_count'],
+            'next_cursor': cursor,
+        }, headers=next_page_headers(request, cursor))
     
     elif request.method == 'POST':
         # Only agronomists can create notifications
@@ -2419,8 +2475,12 @@ def farm_notifications(request, farm_id):
         else:
             target_user = None
         
+        # Farm-wide announcements are delivered to every user assigned to the farm
+        recipients = list(farm.users.values_list('id', flat=True)) if is_farm_wide else [target_user]
+        
         # Create notification specifically for this farm
-        notification = Notification.objects.create(
+        notification = create_notification(
+            recipients,
             title=request.data.get('title', ''),
             message=request.data.get('message', ''),
             notification_type=request.data.get('notification_type', 'agronomist_message'),
@@ -2429,7 +2489,7 @@ def farm_notifications(request, farm_id):
             user=target_user,  # Specific user or None for farm-wide
             is_farm_wide=is_farm_wide,
             created_by=request.user,  # Track which agronomist created it
-            due_date=request.data.get('due_date') if request.data.get('due_date') else None,
+            due_date=request.data.get('due_date') if request.data.get('due_date') else None
         )
         
         return Response({
@@ -2446,44 +2506,21 @@ def farm_notifications(request, farm_id):
         # Mark notifications as read
         notification_ids = request.data.get('notification_ids', [])
         if notification_ids:
-            from django.db import models
-            
-            # Debug: Log the request details
             logger.info(f"User {request.user} attempting to mark notifications as read: {notification_ids} for farm {farm.id}")
             
-            # First, let's check what notifications exist
-            all_notifications = Notification.objects.filter(
-                id__in=notification_ids,
-                farm=farm
+            receipts = NotificationRecipient.objects.filter(
+                notification_id__in=notification_ids,
+                notification__farm=farm
             )
             
-            logger.info(f"Found notifications in farm {farm.id}: {[(n.id, n.user_id, n.is_farm_wide, n.is_read) for n in all_notifications]}")
-            
-            # Update ALL notifications that the user can see (matching GET request logic)
-            # This ensures any notification shown in the UI can be marked as read
+            # Farm users mark their own copy as read (personal and farm-wide notifications);
+            # agronomists/superusers can mark any notification in their farm as read for everyone
             if request.user.user_type == 'farm_user':
-                # Farm users can mark read:
-                # 1. Their personal notifications 
-                # 2. ANY farm-wide notification (regardless of user field)
-                notifications_to_update = Notification.objects.filter(
-                    id__in=notification_ids,
-                    farm=farm
-                ).filter(
-                    models.Q(user=request.user) |                       # Personal notifications
-                    models.Q(is_farm_wide=True)                        # All farm-wide notifications
-                )
-            else:
-                # Agronomist/superuser can mark any notification in their farm as read
-                notifications_to_update = Notification.objects.filter(
-                    id__in=notification_ids,
-                    farm=farm
-                )
+                receipts = receipts.filter(recipient=request.user)
             
-            logger.info(f"Notifications matching access criteria: {[(n.id, n.user_id, n.is_farm_wide, n.is_read) for n in notifications_to_update]}")
+            updated = receipts.update(is_read=True)
             
-            updated = notifications_to_update.update(is_read=True)
-            
-            logger.info(f"Updated {updated} notifications to read status")
+            logger.info(f"Updated {updated} notification receipts to read status")
             
             if updated > 0:
                 return Response({'updated': updated, 'message': f'{updated} notifications marked as read'})
@@ -2500,33 +2537,41 @@ def agronomist_notifications(request):
         return Response({'error': 'Only agronomists can access this endpoint'}, status=status.HTTP_403_FORBIDDEN)
     
     if request.method == 'GET':
+        from django.db.models import F, Prefetch, Window
+        from django.db.models.functions import RowNumber
+        
         # Get all farms managed by this agronomist
         if request.user.is_superuser:
             managed_farms = Farm.objects.filter(is_active=True)
         else:
             managed_farms = Farm.objects.filter(created_by=request.user, is_active=True)
         
+        # Farm users and the 5 latest notifications sent to each farm, in one query each
+        recent_notifications = Notification.objects.filter(created_by=request.user).annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=[F('farm_id')],
+                order_by=[F('created_at').desc(), F('id').desc()],
+            )
+        ).filter(row_number__lte=5).select_related('user').order_by('-created_at', '-id')
+        managed_farms = managed_farms.prefetch_related(
+            Prefetch('users', queryset=User.objects.filter(user_type='farm_user'), to_attr='farm_users'),
+            Prefetch('notification_set', queryset=recent_notifications, to_attr='recent_notifications'),
+        )
+        
         farms_data = []
         for farm in managed_farms:
-            # Get farm users
-            farm_users = farm.users.filter(user_type='farm_user')
-            users_data = [{'id': user.id, 'username': user.username, 'full_name': f"{user.first_name} {user.last_name}".strip()} for user in farm_users]
-            
-            # Get recent notifications sent to this farm
-            recent_notifications = Notification.objects.filter(
-                farm=farm, 
-                created_by=request.user
-            ).order_by('-created_at')[:5]
+            users_data = [{'id': user.id, 'username': user.username, 'full_name': f"{user.first_name} {user.last_name}".strip()} for user in farm.farm_users]
             
             notifications_data = []
-            for notif in recent_notifications:
+            for notif in farm.recent_notifications:
                 notifications_data.append({
                     'id': notif.id,
-                    'title': notif.title,
+                    'title': notif.rendered_title,
                     'notification_type': notif.notification_type,
                     'priority': notif.priority,
                     'is_farm_wide': notif.is_farm_wide,
-                    'target_user': notif.user.username if notif.user else 'All Users',
+                    'target_user': notif.user.username if notif.user else ('All Users' if notif.is_farm_wide else 'Multiple Users'),
                     'created_at': notif.created_at,
                 })
             
@@ -2561,8 +2606,9 @@ def agronomist_notifications(request):
         notifications_created = []
         
         if is_farm_wide:
-            # Create farm-wide notification
-            notification = Notification.objects.create(
+            # Create farm-wide notification, delivered to every farm user
+            notification = create_notification(
+                farm.users.values_list('id', flat=True),
                 title=request.data.get('title', ''),
                 message=request.data.get('message', ''),
                 notification_type=request.data.get('notification_type', 'farm_announcement'),
@@ -2571,38 +2617,45 @@ def agronomist_notifications(request):
                 user=None,
                 is_farm_wide=True,
                 created_by=request.user,
-                due_date=request.data.get('due_date') if request.data.get('due_date') else None,
+                due_date=request.data.get('due_date') if request.data.get('due_date') else None
             )
             notifications_created.append(notification.id)
+            recipients_count = notification.recipients.count()
         else:
-            # Create notifications for specific users
+            # Create one notification for the specific users
             if not target_user_ids:
                 return Response({'error': 'User IDs are required for user-specific notifications'}, status=status.HTTP_400_BAD_REQUEST)
             
-            for user_id in target_user_ids:
-                try:
-                    target_user = farm.users.get(id=user_id)
-                    notification = Notification.objects.create(
-                        title=request.data.get('title', ''),
-                        message=request.data.get('message', ''),
-                        notification_type=request.data.get('notification_type', 'agronomist_message'),
-                        priority=request.data.get('priority', 'medium'),
-                        farm=farm,
-                        user=target_user,
-                        is_farm_wide=False,
-                        created_by=request.user,
-                        due_date=request.data.get('due_date') if request.data.get('due_date') else None,
-                    )
-                    notifications_created.append(notification.id)
-                except:
-                    continue  # Skip invalid user IDs
+            # Skip invalid user IDs
+            target_users = list(farm.users.filter(id__in=target_user_ids))
+            recipients_count = len(target_users)
+            if target_users:
+                notification = create_notification(
+                    target_users,
+                    title=request.data.get('title', ''),
+                    message=request.data.get('message', ''),
+                    notification_type=request.data.get('notification_type', 'agronomist_message'),
+                    priority=request.data.get('priority', 'medium'),
+                    farm=farm,
+                    user=target_users[0] if len(target_users) == 1 else None,
+                    is_farm_wide=False,
+                    created_by=request.user,
+                    due_date=request.data.get('due_date') if request.data.get('due_date') else None
+                )
+                notifications_created.append(notification.id)
         
         return Response({
-            'message': f'{len(notifications_created)} notification(s) sent successfully',
+            'message': f'{recipients_count} notification(s) sent successfully',
             'notifications_created': notifications_created,
             'farm_id': farm.id,
         }, status=status.HTTP_201_CREATED)
 
+FARM_SALE_KEYS = (
+    'id', 'crop_name', 'batch_code', 'quantity_sold', 'unit', 'price_per_unit', 'total_amount',
+    'buyer_name', 'buyer_contact', 'sale_date', 'payment_status', 'amount_received',
+    'quality_grade', 'notes', 'created_at',
+)
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def farm_sales(request, farm_id):
@@ -2635,26 +2688,20 @@ def farm_sales(request, farm_id):
         if date_to:
             sales = sales.filter(sale_date__lte=date_to)
         
-        # Serialize sales data
-        sales_data = []
-        for sale in sales:
-            sales_data.append({
-                'id': sale.id,
-                'crop_name': sale.crop_name,
-                'batch_code': sale.batch_code,
-                'quantity_sold': float(sale.quantity_sold) if sale.quantity_sold else 0,
-                'unit': sale.unit,
-                'price_per_unit': float(sale.price_per_unit) if sale.price_per_unit else 0,
-                'total_amount': float(sale.total_amount),
-                'buyer_name': sale.buyer_name,
-                'buyer_contact': sale.buyer_contact,
-                'sale_date': sale.sale_date,
-                'payment_status': sale.payment_status,
-                'amount_received': float(sale.amount_received),
-                'quality_grade': sale.quality_grade,
-                'notes': sale.notes,
-                'created_at': sale.created_at,
-            })
+        try:
+            keys = selected_keys(request, FARM_SALE_KEYS)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Serialize sales data straight from a values() projection of the selected columns
+        sales_data = list(sales.values(*keys))
+        optional = [key for key in ('quantity_sold', 'price_per_unit') if key in keys]
+        amounts = [key for key in ('total_amount', 'amount_received') if key in keys]
+        for sale in sales_data:
+            for key in optional:
+                sale[key] = float(sale[key]) if sale[key] else 0
+            for key in amounts:
+                sale[key] = float(sale[key])
         
         return Response(sales_data)
     
@@ -2716,8 +2763,7 @@ def farm_spray_schedules(request, farm_id):
         elif status_filter == 'pending':
             spray_schedules = spray_schedules.filter(is_completed=False)
 
-        serializer = SprayScheduleSerializer(spray_schedules, many=True)
-        return Response(serializer.data)
+        return list_response(request, spray_schedules, SprayScheduleSerializer, sort='-date_time')
 
     elif request.method == 'POST':
         # Add farm to request data for validation
@@ -2770,8 +2816,7 @@ def farm_fertigations(request, farm_id):
 
     if request.method == 'GET':
         fertigations = Fertigation.objects.filter(farm=farm, user=request.user).order_by('-date_time')
-        serializer = FertigationSerializer(fertigations, many=True)
-        return Response(serializer.data)
+        return list_response(request, fertigations, FertigationSerializer, FERTIGATION_LIST, sort='-date_time')
 
     elif request.method == 'POST':
         # Add farm to request data for validation
@@ -2811,6 +2856,52 @@ def farm_fertigation_detail(request, farm_id, pk):
         fertigation.delete()
         return Response({'message': 'Fertigation deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def farm_water_quality_trend(request, farm_id):
+    """
+    EC/pH trend for a farm merging fertigation and daily task readings,
+    downsampled to ?points= per series (lttb or minmax via ?method=)
+    """
+    farm = get_farm_access(request.user, farm_id)
+    if not farm:
+        return Response({'error': 'Farm not found or access denied'}, status=status.HTTP_404_NOT_FOUND)
+    
+    from datetime import timedelta
+    from django.utils import timezone
+    from django.utils.dateparse import parse_date
+    
+    try:
+        date_to = parse_date(request.query_params.get('date_to', '')) or timezone.localdate()
+        date_from = parse_date(request.query_params.get('date_from', '')) or date_to - timedelta(days=90)
+    except ValueError:
+        return Response({'error': 'date_from and date_to must be valid YYYY-MM-DD dates'}, status=status.HTTP_400_BAD_REQUEST)
+    if date_from > date_to:
+        return Response({'error': 'date_from must be before date_to'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    method = request.query_params.get('method', 'lttb')
+    if method not in DOWNSAMPLE_METHODS:
+        return Response({'error': f"method must be one of: {', '.join(DOWNSAMPLE_METHODS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        points = min(max(int(request.query_params.get('points', 200)), 3), 5000)
+    except ValueError:
+        return Response({'error': 'points must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    trend = water_quality_trend(
+        farm, date_from, date_to,
+        zone=request.query_params.get('zone'),
+        points=points,
+        method=method
+    )
+    trend.update({
+        'farm_id': farm.id,
+        'zone': request.query_params.get('zone'),
+        'date_from': date_from,
+        'date_to': date_to,
+    })
+    return Response(trend)
+
 # Farm-specific Workers
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
@@ -2822,8 +2913,7 @@ def farm_workers(request, farm_id):
 
     if request.method == 'GET':
         workers = Worker.objects.filter(farm=farm, user=request.user).order_by('-created_at')
-        serializer = WorkerSerializer(workers, many=True)
-        return Response(serializer.data)
+        return list_response(request, workers, WorkerSerializer, sort='-created_at')
 
     elif request.method == 'POST':
         # Add farm to request data for validation
@@ -2874,8 +2964,7 @@ def farm_worker_tasks(request, farm_id):
 
     if request.method == 'GET':
         worker_tasks = WorkerTask.objects.filter(farm=farm, user=request.user).order_by('-created_at')
-        serializer = WorkerTaskSerializer(worker_tasks, many=True)
-        return Response(serializer.data)
+        return list_response(request, worker_tasks, WorkerTaskSerializer, sort='-created_at')
 
     elif request.method == 'POST':
         # Add farm to request data for validation
@@ -2926,8 +3015,7 @@ def farm_issue_reports(request, farm_id):
 
     if request.method == 'GET':
         issue_reports = IssueReport.objects.filter(farm=farm, farm_user=request.user).order_by('-created_at')
-        serializer = IssueReportSerializer(issue_reports, many=True)
-        return Response(serializer.data)
+        return list_response(request, issue_reports, IssueReportSerializer, sort='-created_at')
 
     elif request.method == 'POST':
         # Add farm to request data for validation
@@ -2980,8 +3068,7 @@ def farm_expenditures(request, farm_id):
 
     if request.method == 'GET':
         expenditures = Expenditure.objects.filter(farm=farm, user=request.user).order_by('-expense_date')
-        serializer = ExpenditureSerializer(expenditures, many=True)
-        return Response(serializer.data)
+        return list_response(request, expenditures, ExpenditureSerializer, sort='-expense_date')
 
     elif request.method == 'POST':
         # Add farm to request data for validation
@@ -3311,12 +3398,14 @@ def analyze_plant_disease(request):
         # Create notification for farm-wide visibility
         if prediction.disease_status == 'diseased':
             disease_names = [d.get('name', 'Unknown') for d in prediction.diseases_detected]
-            title = f"Plant Disease & Pest Detected: {', '.join(disease_names[:2])}"
-            message = f"Disease detected in {farm.name}. Location: {prediction.location_in_farm or 'Not specified'}. Confidence: {prediction.confidence_level}"
-
-            Notification.objects.create(
-                title=title,
-                message=message,
+            create_notification(
+                farm.users.values_list('id', flat=True),
+                template='disease_detected',
+                params={
+                    'diseases': ', '.join(disease_names[:2]),
+                    'location': prediction.location_in_farm or 'Not specified',
+                    'confidence': prediction.confidence_level
+                },
                 notification_type='general',
                 farm=farm,
                 user=None,  # Farm-wide notification
@@ -3344,6 +3433,11 @@ def get_plant_disease_predictions(request):
     if not farm_id:
         return Response({'error': 'farm_id parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
 
+    try:
+        fields = selected_fields(request, PlantDiseasePredictionListSerializer)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     try:
         farm = Farm.objects.get(id=farm_id)
 
@@ -3368,24 +3462,24 @@ def get_plant_disease_predictions(request):
         if resolved_filter is not None:
             predictions = predictions.filter(is_resolved=resolved_filter.lower() == 'true')
 
-        # Pagination
-        page_size = min(int(request.GET.get('page_size', 20)), 100)
-        page = int(request.GET.get('page', 1))
-        start = (page - 1) * page_size
-        end = start + page_size
-
-        total_count = predictions.count()
-        predictions = predictions[start:end]
+        # Cursor pagination, newest first
+        try:
+            page_size = requested_page_size(request, 20)
+            predictions, cursor = keyset_page(
+                predictions, '-analysis_timestamp', request.GET.get('cursor'), page_size
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = PlantDiseasePredictionListSerializer(predictions, many=True)
+        serializer = PlantDiseasePredictionListSerializer(
+            PlantDiseasePredictionListSerializer.eager_queryset(predictions, fields), many=True, selected_fields=fields
+        )
 
         return Response({
             'results': serializer.data,
-            'count': total_count,
-            'page': page,
             'page_size': page_size,
-            'total_pages': (total_count + page_size - 1) // page_size
-        })
+            'next_cursor': cursor,
+        }, headers=next_page_headers(request, cursor))
 
     except Farm.DoesNotExist:
         return Response({'error': 'Farm not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -3436,9 +3530,10 @@ def update_plant_disease_prediction(request, prediction_id):
 
             # If marked as resolved, create notification
             if serializer.validated_data.get('is_resolved') and not prediction.is_resolved:
-                Notification.objects.create(
-                    title="Plant Disease & Pest Issue Resolved",
-                    message=f"Disease issue in {prediction.farm.name} has been marked as resolved by {request.user.username}",
+                create_notification(
+                    prediction.farm.users.values_list('id', flat=True),
+                    template='disease_resolved',
+                    params={'user': request.user.username},
                     notification_type='general',
                     farm=prediction.farm,
                     user=None,
@@ -3506,8 +3601,7 @@ def farm_tasks(request, farm_id):
         # Order by: pending/in_progress first, then by due date, then by priority
         tasks = tasks.order_by('status', 'due_date', '-priority', '-created_at')
         
-        serializer = FarmTaskSerializer(tasks, many=True)
-        return Response(serializer.data)
+        return list_response(request, tasks, FarmTaskSerializer)
     
     elif request.method == 'POST':
         # Create new task for this farm
@@ -3587,54 +3681,23 @@ def farm_tasks_summary(request, farm_id):
     
     Data isolation: Only tasks for current user in this farm
     """
-    from .models import FarmTask
-    from django.db.models import Count, Q
-    from datetime import date
-    
     # Get farm with access control
     farm = get_farm_access(request.user, farm_id)
     if not farm:
         return Response({'error': 'Farm not found or access denied'}, status=status.HTTP_404_NOT_FOUND)
     
-    # Complete data isolation: Only THIS farm AND THIS user
-    tasks = FarmTask.objects.filter(farm=farm, user=request.user)
-    
-    # Calculate statistics
-    total_tasks = tasks.count()
-    pending_tasks = tasks.filter(status='pending').count()
-    in_progress_tasks = tasks.filter(status='in_progress').count()
-    completed_tasks = tasks.filter(status='completed').count()
-    
-    # Overdue tasks (pending or in_progress with due_date in past)
-    today = date.today()
-    overdue_tasks = tasks.filter(
-        Q(status='pending') | Q(status='in_progress'),
-        due_date__lt=today
-    ).count()
-    
-    # Tasks by priority
-    high_priority = tasks.filter(priority='high', status__in=['pending', 'in_progress']).count()
-    medium_priority = tasks.filter(priority='medium', status__in=['pending', 'in_progress']).count()
-    low_priority = tasks.filter(priority='low', status__in=['pending', 'in_progress']).count()
-    
-    # Due this week
-    from datetime import timedelta
-    week_end = today + timedelta(days=7)
-    due_this_week = tasks.filter(
-        status__in=['pending', 'in_progress'],
-        due_date__gte=today,
-        due_date__lte=week_end
-    ).count()
+    # Complete data isolation: counters for THIS farm AND THIS user from the cached KPI snapshot
+    tasks = user_kpis(request.user, [farm.id])['farm_tasks']
     
     return Response({
-        'total_tasks': total_tasks,
-        'pending_tasks': pending_tasks,
-        'in_progress_tasks': in_progress_tasks,
-        'completed_tasks': completed_tasks,
-        'overdue_tasks': overdue_tasks,
-        'high_priority_active': high_priority,
-        'medium_priority_active': medium_priority,
-        'low_priority_active': low_priority,
-        'due_this_week': due_this_week,
+        'total_tasks': tasks['total'],
+        'pending_tasks': tasks['pending'],
+        'in_progress_tasks': tasks['in_progress'],
+        'completed_tasks': tasks['completed'],
+        'overdue_tasks': tasks['overdue'],
+        'high_priority_active': tasks['high_priority_active'],
+        'medium_priority_active': tasks['medium_priority_active'],
+        'low_priority_active': tasks['low_priority_active'],
+        'due_this_week': tasks['due_this_week'],
     })
 
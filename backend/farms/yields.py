@@ -0,0 +1,145 @@
+import numpy as np
+from django.db.models import Case, CharField, Count, FloatField, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, ExtractMonth, NullIf
+
+# Indian cropping seasons by month of sowing (transplanting when sowing is unknown)
+SEASONS = (
+    ('kharif', (6, 7, 8, 9, 10)),
+    ('rabi', (11, 12, 1, 2, 3)),
+    ('zaid', (4, 5)),
+)
+
+# ?group_by= name -> CropStage values() fields
+YIELD_GROUPS = {
+    'crop': ('crop_name',),
+    'variety': ('variety',),
+    'farm': ('farm_id', 'farm__name'),
+    'season': ('season',),
+}
+
+YIELD_METRICS = ('yield_per_acre', 'yield_per_plant', 'efficiency', 'loss_rate')
+
+PERCENTILES = (10, 50, 90)
+
+
+def _as_float(field):
+    return Cast(field, FloatField())
+
+
+def with_yield_metrics(crop_stages):
+    """Annotate season and the per-batch ratios; undefined ratios are NULL."""
+    actual = _as_float('actual_yield')
+    losses = Coalesce(_as_float('losses'), Value(0.0))
+    return crop_stages.annotate(
+        season_month=ExtractMonth(Coalesce('sowing_date', 'transplant_date')),
+    ).annotate(
+        season=Case(
+            *[
+                When(season_month__in=months, then=Value(name))
+                for name, months in SEASONS
+            ],
+            output_field=CharField(),
+        ),
+    ).annotate(
+        yield_per_acre=actual / NullIf(_as_float('area'), Value(0.0)),
+        yield_per_plant=actual / NullIf(_as_float('number_of_plants'), Value(0.0)),
+        efficiency=actual * 100 / NullIf(_as_float('expected_yield'), Value(0.0)),
+        loss_rate=losses * 100 / NullIf(actual + losses, Value(0.0)),
+    )
+
+
+def grouped_percentiles(groups, values, group_count, percentiles=PERCENTILES):
+    """
+    Percentiles (linear interpolation, like np.percentile) of `values` per
+    group in one pass: NaNs are dropped, values sorted within groups by a
+    single lexsort and each percentile read off at its interpolated rank.
+    Returns {percentile: array of group_count} with NaN for empty groups,
+    plus the per-group means.
+    """
+    valid = ~np.isnan(values)
+    groups, values = groups[valid], values[valid]
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.cumsum(counts) - counts
+    empty = counts == 0
+    last = np.maximum(counts - 1, 0)
+
+    result = {}
+    for percentile in percentiles:
+        rank = starts + last * (percentile / 100)
+        low = np.floor(rank).astype(int)
+        high = np.ceil(rank).astype(int)
+        if len(ordered):
+            low, high = np.minimum(low, len(ordered) - 1), np.minimum(high, len(ordered) - 1)
+            picked = ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+        else:
+            picked = np.zeros(group_count)
+        result[percentile] = np.where(empty, np.nan, picked)
+
+    sums = np.bincount(groups, weights=values, minlength=group_count)
+    means = np.divide(sums, counts, out=np.full(group_count, np.nan), where=~empty)
+    return result, means
+
+
+def _summary(percentiles, means, index):
+    def clean(value):
+        return None if np.isnan(value) else round(float(value), 3)
+    summary = {f'p{percentile}': clean(values[index]) for percentile, values in percentiles.items()}
+    summary['mean'] = clean(means[index])
+    return summary
+
+
+def yield_distribution(crop_stages, group_by=('crop', 'variety')):
+    """
+    Yield per acre and per plant, efficiency (actual/expected) and loss
+    rate (losses / (actual + losses)) of harvested batches, grouped by any
+    of crop, variety, farm and season.
+
+    Totals are one GROUP BY in SQL. The distributions come from a second
+    query that returns only the group key and four ratios per batch as
+    tuples; NumPy turns those into compact arrays and computes p10/p50/p90
+    for every group at once.
+    """
+    key_fields = [field for name in group_by for field in YIELD_GROUPS[name]]
+    harvested = with_yield_metrics(crop_stages.filter(actual_yield__isnull=False)).order_by()
+
+    totals = list(
+        harvested.values(*key_fields).annotate(
+            batches=Count('id'),
+            total_yield=Sum('actual_yield'),
+            total_expected=Sum('expected_yield'),
+            total_losses=Sum('losses'),
+            total_area=Sum('area'),
+            total_plants=Sum('number_of_plants'),
+        ).order_by(*key_fields)
+    )
+    group_index = {tuple(row[field] for field in key_fields): index for index, row in enumerate(totals)}
+
+    rows = list(harvested.values_list(*key_fields, *YIELD_METRICS))
+    width = len(key_fields)
+    groups = np.fromiter((group_index[row[:width]] for row in rows), dtype=np.intp, count=len(rows))
+    metrics = np.array([row[width:] for row in rows], dtype=float).reshape(len(rows), len(YIELD_METRICS))
+
+    distributions = {
+        name: grouped_percentiles(groups, metrics[:, column], len(totals))
+        for column, name in enumerate(YIELD_METRICS)
+    }
+
+    return [
+        {
+            **{field.replace('__', '_'): row[field] for field in key_fields},
+            'batches': row['batches'],
+            'total_yield': row['total_yield'],
+            'total_expected': row['total_expected'],
+            'total_losses': row['total_losses'],
+            'total_area': row['total_area'],
+            'total_plants': row['total_plants'],
+            **{
+                name: _summary(percentiles, means, index)
+                for name, (percentiles, means) in distributions.items()
+            },
+        }
+        for index, row in enumerate(totals)
+    ]
@@ -1,14 +1,20 @@
 import { useEffect, useRef, useState, useCallback } from 'react';
 import { useAuth } from '../context/AuthContext';
 import toast from 'react-hot-toast';
+import { MSGPACK_SUBPROTOCOL, decodeMsgpack, expandFrame } from '../utils/wireFormat';
 
-const useWebSocket = (onMessage = null) => {
+// Keep-alive interval; the server closes sockets idle for WS_IDLE_TIMEOUT (120s)
+const PING_INTERVAL = 30000;
+
+const useWebSocket = (onMessage = null, onRefresh = null) => {
   const { user, isAgronomist, isSuperuser } = useAuth();
   const [connectionStatus, setConnectionStatus] = useState('disconnected');
   const [isConnecting, setIsConnecting] = useState(false);
   const ws = useRef(null);
   const reconnectTimeoutRef = useRef(null);
   const reconnectAttemptsRef = useRef(0);
+  const pingIntervalRef = useRef(null);
+  const internedStringsRef = useRef([]);
   const maxReconnectAttempts = 5;
 
   const connect = useCallback(() => {
@@ -34,12 +40,22 @@ const useWebSocket = (onMessage = null) => {
     const wsUrl = `wss://kffms.aicraftalchemy.com/ws/notifications/?token=${token}`;
 
     try {
-      ws.current = new WebSocket(wsUrl);
+      // Offer the compact binary format; the server falls back to JSON
+      ws.current = new WebSocket(wsUrl, [MSGPACK_SUBPROTOCOL]);
+      ws.current.binaryType = 'arraybuffer';
+      internedStringsRef.current = [];
 
       ws.current.onopen = () => {
         setConnectionStatus('connected');
         setIsConnecting(false);
         reconnectAttemptsRef.current = 0;
+
+        clearInterval(pingIntervalRef.current);
+        pingIntervalRef.current = setInterval(() => {
+          if (ws.current && ws.current.readyState === WebSocket.OPEN) {
+            ws.current.send(JSON.stringify({ type: 'ping' }));
+          }
+        }, PING_INTERVAL);
         
         // Clear any pending reconnect timeout
         if (reconnectTimeoutRef.current) {
@@ -50,7 +66,9 @@ const useWebSocket = (onMessage = null) => {
 
       ws.current.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data);
+          const data = typeof event.data === 'string'
+            ? JSON.parse(event.data)
+            : expandFrame(decodeMsgpack(event.data), internedStringsRef.current);
 
           if (data.type === 'connection_established') {
             if (data.user_type === 'agronomist' || data.user_type === 'superuser') {
@@ -63,42 +81,60 @@ const useWebSocket = (onMessage = null) => {
             return;
           }
 
-          if (data.type === 'notification' || data.type === 'notification_message') {
-            
-            // Call the provided callback with the notification data
-            if (onMessage && typeof onMessage === 'function') {
-              const notification = {
-                id: data.notification_id,
-                title: data.title || 'New Notification',
-                message: data.message,
-                timestamp: data.timestamp ? new Date(data.timestamp) : new Date(),
-                read: false,
-                type: data.notification_type || 'general',
-                farm_name: data.farm_name,
-                user_name: data.user_name,
-                isStored: true
-              };
-              
-              onMessage(notification);
-              
-              // Show toast notification
-              toast.success(data.title || 'New notification received!', {
-                duration: 4000,
-                icon: '🔔',
-              });
+          if (data.type === 'pong') {
+            return;
+          }
+
+          // Server dropped queued events for this socket; refetch instead
+          if (data.type === 'refresh') {
+            if (onRefresh && typeof onRefresh === 'function') {
+              onRefresh(data);
             }
+            return;
           }
+
+          // Several events flushed together arrive as one frame
+          const events = data.type === 'notification_batch' ? data.notifications : [data];
+
+          events.forEach((data) => {
+            if (data.type === 'notification' || data.type === 'notification_message') {
+              
+              // Call the provided callback with the notification data
+              if (onMessage && typeof onMessage === 'function') {
+                const notification = {
+                  id: data.notification_id,
+                  title: data.title || 'New Notification',
+                  message: data.message,
+                  timestamp: data.timestamp ? new Date(data.timestamp) : new Date(),
+                  read: false,
+                  type: data.notification_type || 'general',
+                  farm_name: data.farm_name,
+                  user_name: data.user_name,
+                  isStored: true
+                };
+                
+                onMessage(notification);
+                
+                // Show toast notification
+                toast.success(data.title || 'New notification received!', {
+                  duration: 4000,
+                  icon: '🔔',
+                });
+              }
+            }
+          });
         } catch (error) {
           console.error('WebSocket: Error parsing message:', error);
         }
       };
 
       ws.current.onclose = (event) => {
+        clearInterval(pingIntervalRef.current);
         setConnectionStatus('disconnected');
         setIsConnecting(false);
 
         // Only attempt reconnection for unexpected closures and if user is still admin
-        const shouldReconnect = event.code !== 1000 && event.code < 4000 && 
+        const shouldReconnect = event.code !== 1000 && (event.code < 4000 || event.code === 4008) && 
                                 reconnectAttemptsRef.current < maxReconnectAttempts &&
                                 (isAgronomist || isSuperuser);
         
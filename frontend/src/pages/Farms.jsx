@@ -568,10 +568,10 @@ const Farms = () => {
                             })}
                           </p>
                         </div>
-                        {selectedFarm.created_by_details && (
+                        {selectedFarm.created_by_username && (
                           <div>
                             <label className="block text-xs font-semibold text-slate-500 uppercase tracking-wide mb-2">Created By</label>
-                            <p className="text-sm font-medium text-slate-900 bg-white rounded-lg px-3 py-2">{selectedFarm.created_by_details.username}</p>
+                            <p className="text-sm font-medium text-slate-900 bg-white rounded-lg px-3 py-2">{selectedFarm.created_by_username}</p>
                           </div>
                         )}
                       </div>
@@ -59,8 +59,9 @@ const Notifications = () => {
     });
   }, []);
 
-  // WebSocket connection for real-time notifications
-  useWebSocket(handleWebSocketMessage);
+  // WebSocket connection for real-time notifications; reload the list when
+  // the server reports it had to drop queued events
+  useWebSocket(handleWebSocketMessage, () => fetchStoredNotifications(false, false, true));
 
   // Fetch stored notifications from database
   const fetchStoredNotifications = async (showToast = true, preserveLocalState = false, silentRefresh = false) => {
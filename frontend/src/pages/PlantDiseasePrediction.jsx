@@ -1,7 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import Layout from '../components/Layout';
-import api from '../services/api';
+import api, { farmAPI } from '../services/api';
 
 const PlantDiseasePrediction = () => {
   const { farmId } = useParams();
@@ -60,7 +60,7 @@ const PlantDiseasePrediction = () => {
   // Fetch crop stages for the farm
   const fetchCropStages = useCallback(async () => {
     try {
-      const response = await api.get(`/farms/${farmId}/crop-stages/`);
+      const response = await farmAPI.getFarmCropStages(farmId);
       setCropStages(response.data || []);
     } catch (error) {
       console.error('Error fetching crop stages:', error);
@@ -49,6 +49,24 @@ api.interceptors.response.use(
   }
 );
 
+// History lists are paged on the server; this follows X-Next-Cursor until the list is complete.
+// `key` names the array in responses that wrap it in an object (e.g. farm notifications).
+const LIST_PAGE_SIZE = 500;
+
+const getAllPages = async (url, params = {}, key = null) => {
+  const rows = [];
+  let cursor = null;
+  let response;
+  do {
+    response = await api.get(url, {
+      params: { page_size: LIST_PAGE_SIZE, ...params, ...(cursor ? { cursor } : {}) },
+    });
+    rows.push(...(key ? response.data[key] : response.data));
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return { ...response, data: key ? { ...response.data, [key]: rows, next_cursor: null } : rows };
+};
+
 export const authAPI = {
   login: (credentials) => api.post('/auth/login/', credentials),
   getProfile: () => api.get('/auth/profile/'),
@@ -84,12 +102,12 @@ export const farmAPI = {
   getFarmDashboard: (farmId) => api.get(`/farms/${farmId}/dashboard/`),
   
   // Farm-specific Daily Tasks
-  getFarmDailyTasks: (farmId, params) => api.get(`/farms/${farmId}/daily-tasks/`, { params }),
+  getFarmDailyTasks: (farmId, params) => getAllPages(`/farms/${farmId}/daily-tasks/`, params),
   submitFarmDailyTask: (farmId, taskData) => api.post(`/farms/${farmId}/daily-tasks/`, taskData),
   updateFarmDailyTask: (farmId, taskId, taskData) => api.put(`/farms/${farmId}/daily-tasks/${taskId}/`, taskData),
   
   // Farm-specific Notifications (complete database isolation)
-  getFarmNotifications: (farmId, params) => api.get(`/farms/${farmId}/notifications/`, { params }),
+  getFarmNotifications: (farmId, params) => getAllPages(`/farms/${farmId}/notifications/`, params, 'notifications'),
   createFarmNotification: (farmId, notificationData) => api.post(`/farms/${farmId}/notifications/`, notificationData),
   markFarmNotificationsAsRead: (farmId, notificationIds) => api.put(`/farms/${farmId}/notifications/`, { notification_ids: notificationIds }),
   
@@ -102,46 +120,46 @@ export const farmAPI = {
   sendAdminNotification: (notificationData) => api.post('/farms/agronomist/notifications/', notificationData),
   
   // Farm-specific Crop Stages
-  getFarmCropStages: (farmId, params) => api.get(`/farms/${farmId}/crop-stages/`, { params }),
+  getFarmCropStages: (farmId, params) => getAllPages(`/farms/${farmId}/crop-stages/`, params),
   createFarmCropStage: (farmId, stageData) => api.post(`/farms/${farmId}/crop-stages/`, stageData),
   getFarmCropStage: (farmId, stageId) => api.get(`/farms/${farmId}/crop-stages/${stageId}/`),
   updateFarmCropStage: (farmId, stageId, stageData) => api.put(`/farms/${farmId}/crop-stages/${stageId}/`, stageData),
   deleteFarmCropStage: (farmId, stageId) => api.delete(`/farms/${farmId}/crop-stages/${stageId}/`),
   
   // Farm-specific Spray/Irrigation Logs
-  getFarmSprayIrrigationLogs: (farmId, params) => api.get(`/farms/${farmId}/spray-irrigation-logs/`, { params }),
+  getFarmSprayIrrigationLogs: (farmId, params) => getAllPages(`/farms/${farmId}/spray-irrigation-logs/`, params),
   createFarmSprayIrrigationLog: (farmId, data) => api.post(`/farms/${farmId}/spray-irrigation-logs/`, data),
   
   // Farm-specific Fertigations
-  getFarmFertigations: (farmId, params) => api.get(`/farms/${farmId}/fertigations/`, { params }),
+  getFarmFertigations: (farmId, params) => getAllPages(`/farms/${farmId}/fertigations/`, params),
   createFarmFertigation: (farmId, data) => api.post(`/farms/${farmId}/fertigations/`, data),
   getFarmFertigation: (farmId, fertigationId) => api.get(`/farms/${farmId}/fertigations/${fertigationId}/`),
   updateFarmFertigation: (farmId, fertigationId, data) => api.put(`/farms/${farmId}/fertigations/${fertigationId}/`, data),
   deleteFarmFertigation: (farmId, fertigationId) => api.delete(`/farms/${farmId}/fertigations/${fertigationId}/`),
   
   // Farm-specific Spray Schedules
-  getFarmSpraySchedules: (farmId, params) => api.get(`/farms/${farmId}/spray-schedules/`, { params }),
+  getFarmSpraySchedules: (farmId, params) => getAllPages(`/farms/${farmId}/spray-schedules/`, params),
   createFarmSpraySchedule: (farmId, data) => api.post(`/farms/${farmId}/spray-schedules/`, data),
   getFarmSpraySchedule: (farmId, scheduleId) => api.get(`/farms/${farmId}/spray-schedules/${scheduleId}/`),
   updateFarmSpraySchedule: (farmId, scheduleId, data) => api.put(`/farms/${farmId}/spray-schedules/${scheduleId}/`, data),
   deleteFarmSpraySchedule: (farmId, scheduleId) => api.delete(`/farms/${farmId}/spray-schedules/${scheduleId}/`),
   
   // Farm-specific Workers
-  getFarmWorkers: (farmId, params) => api.get(`/farms/${farmId}/workers/`, { params }),
+  getFarmWorkers: (farmId, params) => getAllPages(`/farms/${farmId}/workers/`, params),
   createFarmWorker: (farmId, data) => api.post(`/farms/${farmId}/workers/`, data),
   getFarmWorker: (farmId, workerId) => api.get(`/farms/${farmId}/workers/${workerId}/`),
   updateFarmWorker: (farmId, workerId, data) => api.put(`/farms/${farmId}/workers/${workerId}/`, data),
   deleteFarmWorker: (farmId, workerId) => api.delete(`/farms/${farmId}/workers/${workerId}/`),
   
   // Farm-specific Worker Tasks
-  getFarmWorkerTasks: (farmId, params) => api.get(`/farms/${farmId}/worker-tasks/`, { params }),
+  getFarmWorkerTasks: (farmId, params) => getAllPages(`/farms/${farmId}/worker-tasks/`, params),
   createFarmWorkerTask: (farmId, data) => api.post(`/farms/${farmId}/worker-tasks/`, data),
   getFarmWorkerTask: (farmId, taskId) => api.get(`/farms/${farmId}/worker-tasks/${taskId}/`),
   updateFarmWorkerTask: (farmId, taskId, data) => api.put(`/farms/${farmId}/worker-tasks/${taskId}/`, data),
   deleteFarmWorkerTask: (farmId, taskId) => api.delete(`/farms/${farmId}/worker-tasks/${taskId}/`),
   
   // Farm-specific Issue Reports
-  getFarmIssueReports: (farmId, params) => api.get(`/farms/${farmId}/issue-reports/`, { params }),
+  getFarmIssueReports: (farmId, params) => getAllPages(`/farms/${farmId}/issue-reports/`, params),
   createFarmIssueReport: (farmId, data) => api.post(`/farms/${farmId}/issue-reports/`, data, {
     headers: { 'Content-Type': 'multipart/form-data' }
   }),
@@ -150,7 +168,7 @@ export const farmAPI = {
   deleteFarmIssueReport: (farmId, issueId) => api.delete(`/farms/${farmId}/issue-reports/${issueId}/`),
   
   // Farm-specific Expenditures
-  getFarmExpenditures: (farmId, params) => api.get(`/farms/${farmId}/expenditures/`, { params }),
+  getFarmExpenditures: (farmId, params) => getAllPages(`/farms/${farmId}/expenditures/`, params),
   createFarmExpenditure: (farmId, data) => api.post(`/farms/${farmId}/expenditures/`, data),
   getFarmExpenditure: (farmId, expenditureId) => api.get(`/farms/${farmId}/expenditures/${expenditureId}/`),
   updateFarmExpenditure: (farmId, expenditureId, data) => api.put(`/farms/${farmId}/expenditures/${expenditureId}/`, data),
@@ -172,15 +190,15 @@ export const farmAPI = {
   getFarmTasksSummary: (farmId) => api.get(`/farms/${farmId}/farm-tasks-summary/`),
   
   // Legacy APIs (for agronomist/superuser backward compatibility)
-  getDailyTasks: (params) => api.get('/farms/daily-tasks/', { params }),
+  getDailyTasks: (params) => getAllPages('/farms/daily-tasks/', params),
   submitDailyTask: (taskData) => api.post('/farms/daily-tasks/', taskData),
   updateDailyTask: (taskId, taskData) => api.put(`/farms/daily-tasks/${taskId}/`, taskData),
-  getNotifications: (params) => api.get('/farms/notifications/', { params }),
+  getNotifications: (params) => getAllPages('/farms/notifications/', params),
   markNotificationsAsRead: (data) => api.put('/farms/notifications/', data),
   deleteNotifications: (data) => api.delete('/farms/notifications/', { data }),
-  getSprayIrrigationLogs: (params) => api.get('/farms/spray-irrigation-logs/', { params }),
+  getSprayIrrigationLogs: (params) => getAllPages('/farms/spray-irrigation-logs/', params),
   createSprayIrrigationLog: (data) => api.post('/farms/spray-irrigation-logs/', data),
-  getCropStages: (params) => api.get('/farms/crop-stages/', { params }),
+  getCropStages: (params) => getAllPages('/farms/crop-stages/', params),
   createCropStage: (stageData) => api.post('/farms/crop-stages/', stageData),
   updateCropStage: (stageId, stageData) => api.put(`/farms/crop-stages/${stageId}/`, stageData),
   deleteCropStage: (stageId) => api.delete(`/farms/crop-stages/${stageId}/`),
@@ -190,23 +208,23 @@ export const farmAPI = {
   exportCropStages: () => api.get('/farms/crop-stages/export/', { responseType: 'blob' }),
   
   // Fertigation APIs
-  getFertigations: (params) => api.get('/farms/fertigations/', { params }),
+  getFertigations: (params) => getAllPages('/farms/fertigations/', params),
   createFertigation: (data) => api.post('/farms/fertigations/', data),
   updateFertigation: (id, data) => api.put(`/farms/fertigations/${id}/`, data),
   deleteFertigation: (id) => api.delete(`/farms/fertigations/${id}/`),
   getFertigationAnalytics: (params) => api.get('/farms/fertigations/analytics/', { params }),
-  getFertigationSchedule: (params) => api.get('/farms/fertigations/schedule/', { params }),
+  getFertigationSchedule: (params) => getAllPages('/farms/fertigations/schedule/', params),
   createFertigationSchedule: (data) => api.post('/farms/fertigations/schedule/', data),
   
   // Worker Management APIs
-  getWorkers: (params) => api.get('/farms/workers/', { params }),
+  getWorkers: (params) => getAllPages('/farms/workers/', params),
   createWorker: (data) => api.post('/farms/workers/', data),
   getWorker: (id) => api.get(`/farms/workers/${id}/`),
   updateWorker: (id, data) => api.put(`/farms/workers/${id}/`, data),
   deleteWorker: (id) => api.delete(`/farms/workers/${id}/`),
   
   // Worker Task Management APIs
-  getWorkerTasks: (params) => api.get('/farms/worker-tasks/', { params }),
+  getWorkerTasks: (params) => getAllPages('/farms/worker-tasks/', params),
   createWorkerTask: (data) => api.post('/farms/worker-tasks/', data),
   getWorkerTask: (id) => api.get(`/farms/worker-tasks/${id}/`),
   updateWorkerTask: (id, data) => api.put(`/farms/worker-tasks/${id}/`, data),
@@ -217,7 +235,7 @@ export const farmAPI = {
   getWorkerDashboardSummary: () => api.get('/farms/worker-dashboard/'),
   
   // Issue Report Management APIs
-  getIssueReports: (params) => api.get('/farms/issue-reports/', { params }),
+  getIssueReports: (params) => getAllPages('/farms/issue-reports/', params),
   createIssueReport: (data) => api.post('/farms/issue-reports/', data, {
     headers: { 'Content-Type': 'multipart/form-data' }
   }),
@@ -226,7 +244,7 @@ export const farmAPI = {
   deleteIssueReport: (id) => api.delete(`/farms/issue-reports/${id}/`),
   
   // Spray Schedule Management APIs
-  getSpraySchedules: (params) => api.get('/farms/spray-schedules/', { params }),
+  getSpraySchedules: (params) => getAllPages('/farms/spray-schedules/', params),
   createSpraySchedule: (data) => api.post('/farms/spray-schedules/', data),
   getSpraySchedule: (id) => api.get(`/farms/spray-schedules/${id}/`),
   updateSpraySchedule: (id, data) => api.put(`/farms/spray-schedules/${id}/`, data),
@@ -234,7 +252,7 @@ export const farmAPI = {
   getSprayScheduleAnalytics: (params) => api.get('/farms/spray-schedules/analytics/', { params }),
   
   // Expenditure Management APIs
-  getExpenditures: (params) => api.get('/farms/expenditures/', { params }),
+  getExpenditures: (params) => getAllPages('/farms/expenditures/', params),
   createExpenditure: (data) => api.post('/farms/expenditures/', data),
   getExpenditure: (id) => api.get(`/farms/expenditures/${id}/`),
   updateExpenditure: (id, data) => api.put(`/farms/expenditures/${id}/`, data),
@@ -242,7 +260,7 @@ export const farmAPI = {
   getExpenditureAnalytics: (params) => api.get('/farms/expenditures/analytics/', { params }),
   
   // Sale Management APIs
-  getSales: (params) => api.get('/farms/sales/', { params }),
+  getSales: (params) => getAllPages('/farms/sales/', params),
   createSale: (data) => api.post('/farms/sales/', data),
   getSale: (id) => api.get(`/farms/sales/${id}/`),
   updateSale: (id, data) => api.put(`/farms/sales/${id}/`, data),
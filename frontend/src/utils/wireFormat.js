@@ -0,0 +1,120 @@
+// Compact WebSocket frames (farm.msgpack.v1), see backend farm_management/wire_formats.py
+
+export const MSGPACK_SUBPROTOCOL = 'farm.msgpack.v1';
+
+// Short code -> field name, mirrors FIELD_CODES on the server
+const FIELD_NAMES = {
+  t: 'type',
+  h: 'title',
+  m: 'message',
+  k: 'notification_type',
+  i: 'notification_id',
+  f: 'farm_id',
+  F: 'farm_name',
+  u: 'user_id',
+  U: 'user_name',
+  ts: 'timestamp',
+  p: 'priority',
+  n: 'notifications',
+};
+
+const INTERNED_FIELDS = new Set(['type', 'notification_type', 'farm_name', 'user_name', 'priority']);
+
+const textDecoder = new TextDecoder();
+
+// Minimal MessagePack decoder covering the types the server emits
+export const decodeMsgpack = (buffer) => {
+  const view = new DataView(buffer);
+  const bytes = new Uint8Array(buffer);
+  let offset = 0;
+
+  const readString = (length) => {
+    const value = textDecoder.decode(bytes.subarray(offset, offset + length));
+    offset += length;
+    return value;
+  };
+  const readArray = (length) => {
+    const items = new Array(length);
+    for (let index = 0; index < length; index++) items[index] = read();
+    return items;
+  };
+  const readMap = (length) => {
+    const map = {};
+    for (let index = 0; index < length; index++) {
+      const key = read();
+      map[key] = read();
+    }
+    return map;
+  };
+  const readBytes = (length) => {
+    const value = bytes.slice(offset, offset + length);
+    offset += length;
+    return value;
+  };
+
+  const read = () => {
+    const type = view.getUint8(offset++);
+    let value;
+
+    if (type <= 0x7f) return type;
+    if (type >= 0xe0) return type - 0x100;
+    if ((type & 0xe0) === 0xa0) return readString(type & 0x1f);
+    if ((type & 0xf0) === 0x90) return readArray(type & 0x0f);
+    if ((type & 0xf0) === 0x80) return readMap(type & 0x0f);
+
+    switch (type) {
+      case 0xc0: return null;
+      case 0xc2: return false;
+      case 0xc3: return true;
+      case 0xc4: value = view.getUint8(offset); offset += 1; return readBytes(value);
+      case 0xc5: value = view.getUint16(offset); offset += 2; return readBytes(value);
+      case 0xc6: value = view.getUint32(offset); offset += 4; return readBytes(value);
+      case 0xca: value = view.getFloat32(offset); offset += 4; return value;
+      case 0xcb: value = view.getFloat64(offset); offset += 8; return value;
+      case 0xcc: value = view.getUint8(offset); offset += 1; return value;
+      case 0xcd: value = view.getUint16(offset); offset += 2; return value;
+      case 0xce: value = view.getUint32(offset); offset += 4; return value;
+      case 0xcf: value = Number(view.getBigUint64(offset)); offset += 8; return value;
+      case 0xd0: value = view.getInt8(offset); offset += 1; return value;
+      case 0xd1: value = view.getInt16(offset); offset += 2; return value;
+      case 0xd2: value = view.getInt32(offset); offset += 4; return value;
+      case 0xd3: value = Number(view.getBigInt64(offset)); offset += 8; return value;
+      case 0xd9: value = view.getUint8(offset); offset += 1; return readString(value);
+      case 0xda: value = view.getUint16(offset); offset += 2; return readString(value);
+      case 0xdb: value = view.getUint32(offset); offset += 4; return readString(value);
+      case 0xdc: value = view.getUint16(offset); offset += 2; return readArray(value);
+      case 0xdd: value = view.getUint32(offset); offset += 4; return readArray(value);
+      case 0xde: value = view.getUint16(offset); offset += 2; return readMap(value);
+      case 0xdf: value = view.getUint32(offset); offset += 4; return readMap(value);
+      default:
+        throw new Error(`Unsupported msgpack type 0x${type.toString(16)}`);
+    }
+  };
+
+  return read();
+};
+
+// Expand short codes and interned string indexes back into a regular frame.
+// `strings` is the per-connection table and is extended in place.
+export const expandFrame = (compact, strings) => {
+  if (compact.S) {
+    strings.push(...compact.S);
+  }
+
+  const expand = (item) => {
+    const frame = {};
+    Object.entries(item).forEach(([code, value]) => {
+      if (code === 'S') return;
+      const key = FIELD_NAMES[code] || code;
+      if (INTERNED_FIELDS.has(key) && typeof value === 'number') {
+        value = strings[value];
+      } else if (key === 'notifications' && Array.isArray(value)) {
+        value = value.map(expand);
+      }
+      frame[key] = value;
+    });
+    return frame;
+  };
+
+  return expand(compact);
+};